@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# benchmarks/bench_bridge.py
+"""Count Objective-C bridge calls made by Contact.tojson(), before and after the Python-side field mirror.
+Needs macOS with PyObjC. Run from the repository root with `python -m benchmarks.bench_bridge`.
+
+Usage:
+    bench_bridge [options]
+
+Options:
+    --repeat=N      tojson() calls per contact [default: 10].
+    --websites=N    Websites per contact [default: 3].
+"""
+import timeit
+from docopt import docopt
+from jodie.contact import Contact
+from jodie.contact.contact import website_value
+
+
+class BridgeCounter:
+    """Wraps an Objective-C object and counts every method called on it, and on objects it returns."""
+
+    def __init__(self, obj, counts):
+        self._obj = obj
+        self._counts = counts
+
+    def __getattr__(self, name):
+        method = getattr(self._obj, name)
+
+        def call(*args):
+            self._counts[0] += 1
+            return wrap(method(*args), self._counts)
+        return call
+
+
+def wrap(value, counts):
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)) or type(value).__name__.endswith('Array'):
+        return [wrap(item, counts) for item in value]
+    return BridgeCounter(value, counts)
+
+
+def legacy_tojson(cn_contact, counts):
+    """What Contact.tojson() did before the mirror: every property read went back to the CNMutableContact."""
+    def text(value):
+        return value.strip() if value and value.strip() else None
+
+    def websites():
+        # The old `websites` property built fresh WebsiteLabeledValue objects on every read
+        sites = cn_contact.urlAddresses()
+        if not sites:
+            return None
+        values = []
+        for site in sites:
+            counts[0] += 2  # alloc + initWithLabel_value_
+            values.append(wrap(website_value(site.label(), site.value()), counts))
+        return values
+
+    emails = cn_contact.emailAddresses()
+    phones = cn_contact.phoneNumbers()
+    sites = websites()
+    return {
+        'first_name': text(cn_contact.givenName()),
+        'last_name': text(cn_contact.familyName()),
+        'email': emails[0].value() if emails else None,
+        'phone': phones[0].value().stringValue() if phones else None,
+        'job_title': text(cn_contact.jobTitle()),
+        'company': text(cn_contact.organizationName()),
+        'websites': [{"label": site.label(), "url": site.value()} for site in sites] if sites else None,
+        'note': cn_contact.note(),
+    }
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+    urls = ["https://acme.com", "https://linkedin.com/in/jdoe", "https://github.com/jdoe",
+            "https://calendly.com/jdoe", "https://jdoe.blog"][:int(args['--websites'])]
+    contact = Contact("Jane", "Doe", "jane@acme.com", "+1 555 123 4567", "CEO", "Acme Inc", urls)
+    cn_contact = contact.contact
+
+    before = [0]
+    counted = BridgeCounter(cn_contact, before)
+    for _ in range(repeat):
+        legacy_tojson(counted, before)
+
+    after = [0]
+    mirrored = Contact.from_cn_contact(BridgeCounter(cn_contact, after))
+    loaded = after[0]
+    for _ in range(repeat):
+        mirrored.tojson()
+
+    print(f"{repeat} x tojson() with {len(urls)} websites")
+    print(f"{'before (reads through the bridge)':<40} {before[0]:>6} bridge calls")
+    print(f"{'after (Python-side mirror)':<40} {after[0]:>6} bridge calls "
+          f"({loaded} to load the mirror, {after[0] - loaded} in tojson)")
+
+    seconds_before = timeit.timeit(lambda: legacy_tojson(cn_contact, [0]), number=1000)
+    seconds_after = timeit.timeit(contact.tojson, number=1000)
+    print(f"{'before':<40} {1000 / seconds_before:>12,.0f} tojson/sec")
+    print(f"{'after':<40} {1000 / seconds_after:>12,.0f} tojson/sec")
+
+
+if __name__ == "__main__":
+    main()
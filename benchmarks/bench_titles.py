@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# benchmarks/bench_titles.py
+"""Compare TitleParser's Aho-Corasick matcher with the previous nested-loop search.
+Run from the repository root with `python -m benchmarks.bench_titles`.
+
+Usage:
+    bench_titles [options]
+
+Options:
+    --titles=N      Size of the synthetic title dictionary [default: 20000].
+    --words=N       Words per signature line in the long-line case [default: 60].
+    --repeat=N      Calls timed per case [default: 2000].
+"""
+import random
+import string
+import timeit
+from docopt import docopt
+from jodie.parsers import TitleParser
+from jodie.parsers.titles import TitleMatcher
+
+
+def legacy_parse(text, titles, prefixes):
+    """The sub-phrase search TitleParser used before the automaton."""
+    cleaned_text = text.strip().lower()
+    if cleaned_text in titles:
+        return text
+    words = cleaned_text.split()
+    if len(words) >= 2:
+        for i in range(len(words)):
+            prefix = " ".join(words[:i+1])
+            if prefix in prefixes:
+                remaining = " ".join(words[i+1:])
+                if remaining in titles:
+                    return text
+        for i in range(len(words)):
+            for j in range(i + 1, len(words) + 1):
+                phrase = " ".join(words[i:j])
+                if phrase in titles:
+                    return text
+    return None
+
+
+def synthetic_titles(count, rng):
+    """Make `count` multi-word titles out of random lowercase words."""
+    def word():
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+    return {" ".join(word() for _ in range(rng.randint(1, 4))) for _ in range(count)}
+
+
+def time_case(label, func, text, repeat):
+    seconds = timeit.timeit(lambda: func(text), number=repeat)
+    print(f"{label:<44} {repeat / seconds:>12,.0f} ops/sec")
+
+
+def main():
+    args = docopt(__doc__)
+    repeat = int(args['--repeat'])
+    rng = random.Random(42)
+
+    titles = set(TitleParser.COMMON_TITLES) | synthetic_titles(int(args['--titles']), rng)
+    prefixes = set(TitleParser.PREFIXES)
+    matcher = TitleMatcher(titles, prefixes)
+
+    filler = ["jane", "doe", "acme", "inc", "phone", "office", "street", "regards"]
+    cases = {
+        "short title": "Senior Software Engineer",
+        "short non-title": "Acme Technologies Inc",
+        "long line, title at end": " ".join(rng.choice(filler) for _ in range(int(args['--words']))) + " vice president",
+        "long line, no title": " ".join(rng.choice(filler) for _ in range(int(args['--words']))),
+    }
+
+    print(f"Dictionary: {len(titles):,} titles")
+    for name, text in cases.items():
+        words = text.lower().split()
+        assert (legacy_parse(text, titles, prefixes) is not None) == (matcher.longest(words) is not None)
+        time_case(f"{name} / nested loops", lambda t: legacy_parse(t, titles, prefixes), text, repeat)
+        time_case(f"{name} / aho-corasick", lambda t: matcher.longest(t.lower().split()), text, repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# benchmarks/corpus.py
+"""Seeded synthetic inputs for the benchmarks: signature blocks, mailbox strings and URL lists.
+The same seed always produces the same corpus, so results are comparable across commits.
+"""
+import random
+from typing import Dict, Iterator, List
+
+from jodie.parsers import TitleParser
+
+# Corpus sizes accepted by --scale
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William",
+    "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+    "Charles", "Karen", "Wei", "Priya", "Mohammed", "Sofia", "Hiroshi", "Olga", "Kwame", "Ana",
+    "Jon", "Jonathan", "Liz", "Bob", "Chris", "Alex", "Sam", "Pat", "Dana", "Jamie",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+    "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore",
+    "Jackson", "Martin", "Lee", "Nguyen", "Patel", "Kim", "Chen", "Okafor", "Ivanova", "Tanaka",
+    "O'Neil", "McDonald", "van der Berg", "Smyth", "Doe",
+)
+COMPANY_WORDS = (
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent",
+    "Cyberdyne", "Tyrell", "Wonka", "Aperture", "Black Mesa", "Massive", "Dynamic", "Blue Sky",
+    "Northwind", "Contoso", "Fabrikam", "Pied Piper", "Gringotts", "Oscorp", "Duff",
+)
+COMPANY_SUFFIXES = ("Inc", "LLC", "Labs", "Technologies", "Group", "Corp", "Ltd", "Co", "Systems", "")
+WEBMAIL = ("gmail.com", "yahoo.com", "hotmail.com", "icloud.com", "protonmail.com")
+TLDS = ("com", "io", "co", "net", "org", "ai")
+SEPARATORS = (" | ", ", ", " - ", " · ")
+TITLE_WORDS = tuple(sorted(TitleParser.COMMON_TITLES))
+PREFIX_WORDS = tuple(sorted(TitleParser.PREFIXES))
+SIGN_OFFS = ("Best,", "Thanks,", "Regards,", "Cheers,", "--", "Sent from my iPhone")
+
+
+class Corpus:
+    """
+    Generates realistic-looking contact inputs from a seeded random number generator.
+
+    Each person has a name, company, title, email, phone and websites, and can be rendered
+    as an email signature block, a mailbox string ("Jane Doe <jane@acme.com>") or a list of URLs.
+    """
+
+    def __init__(self, seed: int = 42) -> None:
+        self.rng = random.Random(seed)
+
+    def person(self) -> Dict[str, object]:
+        """Make up one person, as keyword arguments for `jodie.contact.Contact`."""
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}".strip()
+        slug = company.split()[0].lower() + rng.choice(("", "hq", "labs", str(rng.randint(1, 99))))
+        domain = f"{slug}.{rng.choice(TLDS)}"
+        user = "".join(ch for ch in last.lower() if ch.isalpha())
+        local = rng.choice((f"{first.lower()}", f"{first.lower()}.{user}", f"{first[0].lower()}{user}",
+                            f"{first.lower()}{rng.randint(1, 999)}"))
+        email_domain = rng.choice(WEBMAIL) if rng.random() < 0.3 else domain
+        title = rng.choice(TITLE_WORDS)
+        if rng.random() < 0.3:
+            title = f"{rng.choice(PREFIX_WORDS)} {title}"
+        websites = [f"https://www.{domain}/"]
+        if rng.random() < 0.6:
+            websites.append(f"https://www.linkedin.com/in/{first.lower()}{user}{rng.randint(1, 9999)}/")
+        if rng.random() < 0.2:
+            websites.append(f"https://github.com/{first[0].lower()}{user}")
+        if rng.random() < 0.15:
+            websites.append(f"https://calendly.com/{first.lower()}-{user}/30min")
+        return {
+            "first_name": first,
+            "last_name": last,
+            "email": f"{local}@{email_domain}",
+            "phone": self.phone(),
+            "job_title": title.title() if title.lower() not in ("ceo", "cto", "cfo", "coo", "vp") else title.upper(),
+            "company": company,
+            "websites": websites,
+        }
+
+    def phone(self) -> str:
+        rng = self.rng
+        area, exchange, line = rng.randint(201, 989), rng.randint(200, 999), rng.randint(0, 9999)
+        return rng.choice((
+            f"({area}) {exchange}-{line:04d}",
+            f"+1 {area} {exchange} {line:04d}",
+            f"{area}.{exchange}.{line:04d}",
+            f"+44 20 {exchange} {line:04d}",
+        ))
+
+    def signature(self) -> str:
+        """An email signature block, fields in a plausible but varying order."""
+        rng = self.rng
+        person = self.person()
+        name = f"{person['first_name']} {person['last_name']}"
+        separator = rng.choice(SEPARATORS)
+        lines = [rng.choice(SIGN_OFFS), name, f"{person['job_title']}{separator}{person['company']}"]
+        contact_lines = [person['email'], person['phone'], person['websites'][0]]
+        rng.shuffle(contact_lines)
+        if rng.random() < 0.5:
+            lines.append(separator.join(contact_lines))
+        else:
+            lines.extend(contact_lines)
+        return "\n".join(lines)
+
+    def mailbox(self) -> str:
+        """A From:/To: style address, e.g. '"Doe, Jane" <jane@acme.com>'."""
+        rng = self.rng
+        person = self.person()
+        first, last, email = person['first_name'], person['last_name'], person['email']
+        return rng.choice((
+            f"{first} {last} <{email}>",
+            f'"{last}, {first}" <{email}>',
+            f"<{email}>",
+            email,
+        ))
+
+    def urls(self) -> List[str]:
+        """The websites of one person, as `get_label_for_website` would see them."""
+        return self.person()['websites']
+
+    def generate(self, kind: str, count: int) -> Iterator[object]:
+        """
+        Yield `count` inputs of one kind.
+
+        :param kind: "signature", "mailbox", "urls" or "person".
+        :param count: Number of inputs.
+        """
+        make = getattr(self, kind)
+        for _ in range(count):
+            yield make()
+
+
+def corpus(kind: str, count: int, seed: int = 42) -> List[object]:
+    """Build `count` inputs of one kind from a fresh generator, so each kind is independent of the others."""
+    return list(Corpus(seed).generate(kind, count))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# benchmarks/results.py
+"""Save benchmark results as JSON and compare them with a baseline from another commit."""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Peak memory differences smaller than this are noise, whatever the percentage
+MEMORY_NOISE_KIB = 64
+
+
+def git_commit() -> Optional[str]:
+    """The current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_results(benchmarks: Dict[str, dict], scale: str, seed: int) -> dict:
+    """Wrap per-benchmark numbers with what is needed to compare them later."""
+    return {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "scale": scale,
+        "seed": seed,
+        "benchmarks": benchmarks,
+    }
+
+
+def save_results(results: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, max_regression: float = 0.1) -> List[str]:
+    """
+    Find benchmarks that got slower or use more memory than the baseline allows.
+
+    Args:
+        baseline (dict): Results from `make_results`, usually from the main branch.
+        current (dict): Results from this run.
+        max_regression (float): Largest allowed fractional drop in ops/sec or growth in peak memory.
+
+    Returns:
+        list: One message per regression. Empty if there are none.
+    """
+    if (baseline.get("scale"), baseline.get("seed")) != (current.get("scale"), current.get("seed")):
+        return [f"Baseline was run with scale {baseline.get('scale')} / seed {baseline.get('seed')}, "
+                f"not {current.get('scale')} / {current.get('seed')}."]
+
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before or before.get("skipped") or result.get("skipped"):
+            continue
+        if result["ops_per_sec"] < before["ops_per_sec"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:,.0f} ops/sec, down from {before['ops_per_sec']:,.0f}")
+        growth = result["peak_kib"] - before["peak_kib"]
+        if growth > MEMORY_NOISE_KIB and result["peak_kib"] > before["peak_kib"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: peak memory {result['peak_kib']:,.0f} KiB, up from {before['peak_kib']:,.0f}")
+    return regressions
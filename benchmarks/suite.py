@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# benchmarks/suite.py
+"""Time jodie's parsers, auto-detection, website labels and Contact / ContactRecord construction on a synthetic corpus.
+Run from the repository root with `python -m benchmarks.suite`.
+
+Usage:
+    suite [options] [BENCHMARK...]
+
+Arguments:
+    BENCHMARK                 Only run benchmarks whose name starts with one of these.
+
+Options:
+    --scale=SCALE             Corpus size: 1k, 100k or 1m [default: 1k].
+    --seed=N                  Corpus random seed [default: 42].
+    --repeat=N                Timed passes over the corpus; the fastest counts [default: 3].
+    --memory-sample=N         Inputs processed while tracing peak memory [default: 10000].
+    --output=FILE             Save results as JSON.
+    --baseline=FILE           Compare with results saved by an earlier run.
+    --max-regression=RATIO    Fail if ops/sec drops, or peak memory grows, by more than this [default: 0.1].
+    -l --list                 List the benchmarks and exit.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from docopt import docopt
+
+from benchmarks.corpus import SCALES, corpus
+from benchmarks.results import compare, load_results, make_results, save_results
+
+
+def bench_parse_auto():
+    from jodie.parsers import parse_text
+    return parse_text
+
+
+def bench_parse_auto_mailbox():
+    from jodie.parsers import parse_auto
+    return lambda mailbox: parse_auto([mailbox])
+
+
+def bench_email_parser():
+    from jodie.parsers import EmailParser
+    return EmailParser.parse
+
+
+def bench_name_parser():
+    from jodie.parsers import NameParser
+    return NameParser.parse
+
+
+def bench_title_parser():
+    from jodie.parsers import TitleParser
+
+    def parse_lines(signature):
+        for line in signature.splitlines():
+            TitleParser.parse(line)
+    return parse_lines
+
+
+def bench_website_labels():
+    from jodie.contact import get_label_for_website
+
+    def label_all(urls):
+        for url in urls:
+            get_label_for_website(url, "jane@acme.com", "Acme Inc")
+    return label_all
+
+
+def bench_contact():
+    from jodie.contact import Contact
+    return lambda person: Contact(**person)
+
+
+def bench_contact_record():
+    from jodie.contact import ContactRecord
+    return lambda person: ContactRecord(**person)
+
+
+# name -> (corpus kind, factory returning the function to call once per input)
+BENCHMARKS: Dict[str, Tuple[str, Callable[[], Callable]]] = {
+    "parse_auto/signature": ("signature", bench_parse_auto),
+    "parse_auto/mailbox": ("mailbox", bench_parse_auto_mailbox),
+    "EmailParser.parse/mailbox": ("mailbox", bench_email_parser),
+    "NameParser.parse/mailbox": ("mailbox", bench_name_parser),
+    "TitleParser.parse/signature-lines": ("signature", bench_title_parser),
+    "get_label_for_website/urls": ("urls", bench_website_labels),
+    "Contact/person": ("person", bench_contact),
+    "ContactRecord/person": ("person", bench_contact_record),
+}
+
+
+def clear_caches() -> None:
+    """Empty jodie's memoization caches so every pass over the corpus starts cold."""
+    import jodie.contact
+    import jodie.parsers
+
+    jodie.parsers.SCANNER.scan.cache_clear()
+    jodie.contact.EMAIL_DOMAINS.lookup.cache_clear()
+    jodie.contact.WEBSITE_DOMAINS.lookup.cache_clear()
+    jodie.parsers.clear_name_cache()
+    index = jodie.parsers.company_index()
+    if index is not None:
+        index.lookup.cache_clear()
+    gc.collect()
+
+
+def time_pass(func: Callable, inputs: List[object]) -> float:
+    clear_caches()
+    started = time.perf_counter()
+    for item in inputs:
+        func(item)
+    return time.perf_counter() - started
+
+
+def peak_memory(func: Callable, inputs: List[object]) -> float:
+    """Peak traced memory in KiB while calling `func` on every input."""
+    clear_caches()
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            func(item)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run(name: str, inputs: List[object], repeat: int, memory_sample: int) -> dict:
+    kind, factory = BENCHMARKS[name]
+    try:
+        func = factory()
+    except ImportError as e:
+        return {"skipped": str(e)}
+    peak_kib = peak_memory(func, inputs[:memory_sample])
+    seconds = min(time_pass(func, inputs) for _ in range(repeat))
+    return {
+        "items": len(inputs),
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(len(inputs) / seconds, 1),
+        "peak_kib": round(peak_kib, 1),
+    }
+
+
+def main():
+    args = docopt(__doc__)
+    if args['--list']:
+        print("\n".join(BENCHMARKS))
+        return 0
+    if args['--scale'] not in SCALES:
+        sys.stderr.write(f"Unknown scale {args['--scale']!r}. Choose one of: {', '.join(SCALES)}.\n")
+        return 1
+
+    count, seed = SCALES[args['--scale']], int(args['--seed'])
+    names = [name for name in BENCHMARKS
+             if not args['BENCHMARK'] or any(name.startswith(prefix) for prefix in args['BENCHMARK'])]
+    inputs: Dict[str, List[object]] = {}
+    results = {}
+
+    print(f"{'benchmark':<36} {'ops/sec':>14} {'peak KiB':>12}")
+    for name in names:
+        kind = BENCHMARKS[name][0]
+        if kind not in inputs:
+            inputs[kind] = corpus(kind, count, seed)
+        results[name] = result = run(name, inputs[kind], int(args['--repeat']), int(args['--memory-sample']))
+        if result.get("skipped"):
+            print(f"{name:<36} {'skipped':>14}  ({result['skipped']})")
+        else:
+            print(f"{name:<36} {result['ops_per_sec']:>14,.0f} {result['peak_kib']:>12,.1f}")
+
+    current = make_results(results, args['--scale'], seed)
+    if args['--output']:
+        save_results(current, args['--output'])
+
+    if args['--baseline']:
+        regressions = compare(load_results(args['--baseline']), current, float(args['--max-regression']))
+        for message in regressions:
+            sys.stderr.write(f"REGRESSION {message}\n")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
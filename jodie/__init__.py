@@ -1,5 +1,18 @@
 #!/usr/bin/env python3
 # jodie/__init__.py
-
-from jodie import contact, parsers
+import importlib
 from jodie.cli.__doc__ import __version__, __description__, __url__, __doc__
+
+# Subpackages are imported on first attribute access (PEP 562) so that
+# `jodie parse` and `--help` don't pay for PyObjC, nameparser or sqlite3.
+SUBPACKAGES = ('cli', 'contact', 'harvest', 'io', 'metrics', 'parsers', 'pipeline', 'search', 'server', 'trace')
+
+
+def __getattr__(name):
+    if name in SUBPACKAGES:
+        return importlib.import_module(f"jodie.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBPACKAGES))
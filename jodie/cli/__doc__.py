@@ -3,10 +3,19 @@
 """jodie - Manage macOS Contacts.app from command line!
 
 Usage: 
-    jodie new [EMAIL NAME COMPANY TITLE NOTE...]
+    jodie new [options] [EMAIL NAME COMPANY TITLE NOTE...]
     jodie new [options]
-    jodie new --auto TEXT...
+    jodie new [options] --auto TEXT...
     jodie parse [options] TEXT
+    jodie parse [options] --input=FILE
+    jodie import [options] FILE
+    jodie export [options] FILE
+    jodie harvest [options] PATH
+    jodie index build [options] FILE
+    jodie find [options] QUERY...
+    jodie search [options] QUERY...
+    jodie serve [options]
+    jodie dedupe [options]
 
 Arguments:
     EMAIL                               Email address for the contact you want to create.
@@ -15,6 +24,11 @@ Arguments:
     TITLE                               Job title.
     NOTE                                Any text you want to save in the `Note` field in Contacts.app.
     TEXT                                Text for jodie to try her best to parse semi-intelligently if she can.
+    FILE                                CSV, NDJSON or vCard file of contacts to import or export, or "-" for stdin / stdout.
+                                        For `index build`, a CSV of domains and company names.
+    PATH                                mbox file or Maildir directory to harvest contacts from.
+    QUERY                               find: name, email or company prefixes, e.g. "jan acme", "company:acme" or "jane@acme".
+                                        search: words of notes, job titles and companies, with "quoted phrases" and OR, e.g. pycon OR "machine learning".
 
 Options:
     -A --auto                           Automatically guess fields from provided text.
@@ -28,6 +42,26 @@ Options:
     -T TITLE --title=TITLE              Job title.
     -X TEXT  --text=TEXT                Text for jodie to try her best to parse semi-intelligently if she can.    
     -W WEBSITES --websites=WEBSITES     Comma-separated list of websites/URLs (e.g. "https://linkedin.com/in/johndoe,https://github.com/johndoe").
+    --format=FORMAT                     import: input format, csv, ndjson or vcf. export: output format, csv, ndjson, parquet or vcf. Guessed from the file extension if omitted. parse / find / search: output format, json or ndjson (default: ndjson).
+    --batch-size=N                      Number of contacts saved per commit [default: 500].
+    --store=STORE                       Where to save contacts: contacts, memory, sqlite or sqlite:PATH (default: $JODIE_STORE or contacts).
+    --on-duplicate=POLICY               What to do with a contact that matches a saved one by email, phone or name: skip, merge or create [default: create].
+    --socket=PATH                       Unix socket for `jodie serve` to listen on (default: ~/.jodie/jodie.sock).
+    --connect=SOCKET                    Send `new` / `parse` to the `jodie serve` process listening on SOCKET.
+    --threshold=SCORE                   Similarity from 0 to 1 above which `jodie dedupe` proposes a merge [default: 0.85].
+    --jobs=N                            Number of worker processes (default: one per CPU for dedupe and harvest, 1 for parse).
+    --input=FILE                        Parse every line of FILE, or "-" for stdin.
+    --output=FILE                       Write results to FILE instead of stdout. index build: where to write the index (default: $JODIE_COMPANY_INDEX or ~/.jodie/companies.idx).
+    --checkpoint=FILE                   harvest / import: remember processed messages and rows in FILE and skip them on later runs.
+    --save                              Save harvested contacts to the store instead of writing them as NDJSON.
+    --limit=N                           Most contacts `jodie find` and `jodie search` return [default: 20].
+    --reindex                           Rebuild the `jodie find` or `jodie search` index from the store before searching.
+    --vcard-version=VERSION             vCard version written by `jodie export`, 3.0 or 4.0 [default: 3.0].
+    --profile                           Print how often each parser and save step ran and how long it took to stderr.
+    --pstats=FILE                       Profile the run with cProfile as well and save its stats to FILE (implies --profile).
+    --chrome-trace=FILE                 Save a timeline of the run to FILE for chrome://tracing or Perfetto (implies --profile).
+    --metrics=FILE                      Write counters and histograms to FILE while running and on exit: a JSON snapshot if FILE ends in .json, otherwise a Prometheus textfile.
+    --metrics-interval=SECONDS          Seconds between --metrics writes [default: 10].
     -H --help                           Show this screen.
     -V --version                        Show version.
 
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 # jodie/cli/__main__.py
+import json
+import os
 import sys
+import time
 from docopt import docopt
-from nameparser import HumanName
 import jodie
 from jodie.cli.__doc__ import __version__, __description__, __url__, __doc__
+from jodie.parsers.auto import parse_auto
 
-COMMANDS = ('new', 'parse',)
+COMMANDS = ('new', 'parse', 'import', 'export', 'harvest', 'index', 'find', 'search', 'serve', 'dedupe',)
 NOT_ARGS = ('--help', '--version', '--auto')
+# Options that configure how jodie runs rather than a contact field
+RUN_OPTIONS = ('--format', '--batch-size', '--store', '--on-duplicate', '--socket', '--connect',
+               '--threshold', '--jobs', '--output', '--input', '--vcard-version', '--save',
+               '--checkpoint', '--profile', '--pstats', '--chrome-trace', '--metrics', '--metrics-interval',
+               '--limit', '--reindex')
 
 def detect_argument_mode(args):
     """
@@ -23,116 +31,429 @@ def detect_argument_mode(args):
     
     named_options = {}
     for key in args.keys():
-        if key.startswith('--') and key not in NOT_ARGS:
+        if key.startswith('--') and key not in NOT_ARGS and key not in RUN_OPTIONS:
             named_options[key] = args[key]
 
     if any(named_options.values()):
         return "named" 
     return "positional"
 
-def parse_auto(arguments):
-    detected_fields = {
-        "first_name": None,
-        "last_name": None,
-        "email": None,
-        "phone": None,
-        "job_title": None,
-        "company": None,
-        "websites": [],
-        "note": None
-    }
-
-    # First pass: identify all fields that can be unambiguously determined
-    for arg in arguments:
-        # 1. Email Address - Strong, unambiguous signal
-        if not detected_fields["email"]:
-            email = jodie.parsers.EmailParser.parse(arg)
-            if email:
-                detected_fields["email"] = email
-                # Infer name from mailbox format if name is not already set
-                if not detected_fields["first_name"]:
-                    first_name, last_name = jodie.parsers.NameParser.parse(arg)
-                    if first_name or last_name:
-                        detected_fields["first_name"] = first_name
-                        detected_fields["last_name"] = last_name
-                continue
+def start_profile(args, started):
+    """
+    Start profiling if --profile, --pstats or --chrome-trace was given. The report is printed
+    and the files are written when jodie exits.
 
-        # 2. Website URL - High-confidence markers
-        website = jodie.parsers.WebsiteParser.parse(arg)
-        if website:
-            if not detected_fields["websites"]:
-                detected_fields["websites"] = []
-            detected_fields["websites"].append(website)
-            continue
+    :param args: Parsed docopt arguments.
+    :param started: `time.perf_counter_ns()` before the arguments were parsed.
+    :return: The running jodie.trace.Profile, or None.
+    """
+    if not (args['--profile'] or args['--pstats'] or args['--chrome-trace']):
+        return None
+    import atexit
+    profile = jodie.trace.Profile(pstats=args['--pstats'], chrome_trace=args['--chrome-trace'])
+    profile.tracer.add("docopt", started, time.perf_counter_ns())
+    atexit.register(profile.finish)
+    return profile
 
-        # 3. Job Title - Common patterns, after ruling out email/URL
-        if not detected_fields["job_title"]:
-            title = jodie.parsers.TitleParser.parse(arg)
-            if title:
-                detected_fields["job_title"] = title
-                continue
 
-        # 4. Person Name - Often ambiguous without context
-        if not detected_fields["first_name"]:
-            first_name, last_name = jodie.parsers.NameParser.parse(arg)
-            if first_name or last_name:
-                detected_fields["first_name"] = first_name
-                detected_fields["last_name"] = last_name
+def start_metrics(args):
+    """
+    Start writing metrics to the --metrics file every --metrics-interval seconds, and once more on exit.
+
+    :param args: Parsed docopt arguments.
+    :return: The running jodie.metrics.MetricsWriter, or None.
+    """
+    if not args['--metrics']:
+        return None
+    import atexit
+    writer = jodie.metrics.MetricsWriter(args['--metrics'], float(args['--metrics-interval'])).start()
+    atexit.register(writer.stop)
+    return writer
+
+
+def open_store(args):
+    """
+    Open the store named by --store, checking saves for duplicates unless --on-duplicate is "create".
+
+    :param args: Parsed docopt arguments.
+    :return: A ContactStore.
+    """
+    store = jodie.contact.get_store(args['--store'])
+    if args['--on-duplicate'] != 'create':
+        store = jodie.contact.DedupStore(store, on_duplicate=args['--on-duplicate'])
+    return store
+
+
+def import_contacts(args):
+    """
+    Stream contacts from a CSV / NDJSON / vCard file and save them in batches through one store.
+    Rows missing required fields are reported and skipped.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import sqlite3
+
+    try:
+        batch_size = int(args['--batch-size'])
+        store = open_store(args)
+        if args['--checkpoint']:
+            checkpoint = jodie.io.Checkpoint(args['--checkpoint'])
+            rows = jodie.io.iter_new_rows(args['FILE'], args['--format'], checkpoint)
+        else:
+            checkpoint = None
+            rows = jodie.io.iter_rows(args['FILE'], args['--format'])
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error starting import: {str(e)}\n")
+        return 1
+
+    skipped = 0
+
+    def contacts():
+        nonlocal skipped
+        for number, fields in enumerate(rows, 1):
+            contact = jodie.contact.ContactRecord(**fields)
+            try:
+                contact.validate()
+            except ValueError as e:
+                skipped += 1
+                sys.stderr.write(f"Skipping record {number}: {str(e)}\n")
                 continue
+            yield contact
+
+    try:
+        saved = store.save_all(contacts(), batch_size=batch_size)
+        if checkpoint is not None:
+            checkpoint.save()
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error importing contacts: {str(e)}\n")
+        return 1
+    finally:
+        store.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    if isinstance(store, jodie.contact.DedupStore):
+        sys.stdout.write(f"Saved {store.created} contacts, merged {store.merged} and skipped "
+                         f"{store.skipped} duplicates, skipped {skipped} invalid.\n")
+    else:
+        sys.stdout.write(f"Saved {saved} contacts, skipped {skipped}.\n")
+    return 0
 
-    # Second pass: handle company name and any remaining fields
-    for arg in arguments:
-        # Skip if this argument was already used
-        if (arg == detected_fields["email"] or
-            arg in detected_fields["websites"] or
-            arg == detected_fields["job_title"] or
-            arg == f"{detected_fields['first_name']} {detected_fields['last_name']}".strip()):
+
+def export_contacts(args):
+    """
+    Stream every contact in the store to a file in chunks, without holding the whole store in memory.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import sqlite3
+
+    try:
+        store = jodie.contact.get_store(args['--store'])
+    except (ValueError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error starting export: {str(e)}\n")
+        return 1
+    try:
+        written = jodie.io.write_records(store.iter_all(), args['FILE'], args['--format'],
+                                         version=args['--vcard-version'])
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error exporting contacts: {str(e)}\n")
+        return 1
+    finally:
+        store.close()
+
+    sys.stderr.write(f"Exported {written} contacts.\n")
+    return 0
+
+
+def build_index(args):
+    """
+    Compile a CSV of domains and company names into the index `parse_auto` uses to infer companies.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import csv
+    from jodie.parsers.companies import DEFAULT_INDEX_PATH, build_company_index, read_company_csv
+
+    path = args['--output'] or os.environ.get('JODIE_COMPANY_INDEX') or DEFAULT_INDEX_PATH
+    try:
+        count = build_company_index(read_company_csv(args['FILE']), path)
+    except (ValueError, OSError, csv.Error) as e:
+        sys.stderr.write(f"Error building company index: {str(e)}\n")
+        return 1
+
+    sys.stderr.write(f"Indexed {count} domains in {path}.\n")
+    return 0
+
+
+def valid_records(people):
+    """Yield a ContactRecord for each harvested person that has the fields Contacts.app requires."""
+    for person in people:
+        record = jodie.contact.ContactRecord.from_dict(person)
+        try:
+            record.validate()
+        except ValueError:
             continue
+        yield record
 
-        # 5. Company Name - Most ambiguous, use as fallback
-        if not detected_fields["company"]:
-            # Check for business-related terms
-            if any(term in arg.lower() for term in ["inc", "llc", "ltd", "corp", "co"]):
-                detected_fields["company"] = arg.strip()
-                continue
-            
-            # Check if this matches any of the collected website domains
-            if detected_fields["websites"]:
-                for url in detected_fields["websites"]:
-                    domain = url.split("//")[-1].split("/")[0].lower()
-                    if arg.lower() in domain or domain in arg.lower():
-                        detected_fields["company"] = arg.strip()
-                        break
-            if detected_fields["company"]:
-                continue
 
-            # If we get here and still don't have a company, this might be the company name
-            if not detected_fields["company"]:
-                detected_fields["company"] = arg.strip()
+def harvest_contacts(args):
+    """
+    Extract one contact per sender from an mbox file or Maildir and write them as NDJSON,
+    or save them in batches with --save.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import sqlite3
+    import time
+
+    try:
+        jobs = int(args['--jobs']) if args['--jobs'] else None
+        batch_size = int(args['--batch-size'])
+        checkpoint = jodie.io.Checkpoint(args['--checkpoint']) if args['--checkpoint'] else None
+        store = open_store(args) if args['--save'] else None
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error starting harvest: {str(e)}\n")
+        return 1
 
-    return detected_fields
+    messages = 0
+    started = time.perf_counter()
+
+    def results():
+        nonlocal messages
+        new = jodie.harvest.iter_new_messages(args['PATH'], checkpoint) if checkpoint is not None else None
+        for record in jodie.harvest.harvest(args['PATH'], jobs=jobs, messages=new):
+            messages += 1
+            yield record
+
+    try:
+        people = jodie.harvest.collapse(results())
+        if store is None:
+            output = open(args['--output'], 'w', encoding='utf-8') if args['--output'] else sys.stdout
+            try:
+                jodie.pipeline.write_ndjson(people, output)
+            finally:
+                if output is not sys.stdout:
+                    output.close()
+        else:
+            saved = store.save_all(valid_records(people), batch_size=batch_size)
+            sys.stdout.write(f"Saved {saved} contacts, skipped {len(people) - saved} without a full name.\n")
+        if checkpoint is not None:
+            checkpoint.save()
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error harvesting {args['PATH']}: {str(e)}\n")
+        return 1
+    finally:
+        if store is not None:
+            store.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    seconds = time.perf_counter() - started
+    sys.stderr.write(f"Harvested {len(people)} contacts from {messages} messages in {seconds:.2f}s "
+                     f"({messages / seconds * 60 if seconds else 0:,.0f} messages/min).\n")
+    return 0
+
+
+def connect(args, payload):
+    """
+    Forward a request to a running `jodie serve` and print the response.
+
+    :param args: Parsed docopt arguments.
+    :param payload: The request to send.
+    :return: Process exit status.
+    """
+    from jodie.cli.client import request
+
+    try:
+        response = request(args['--connect'], payload)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error connecting to jodie server: {str(e)}\n")
+        return 1
+    if not response.get('ok'):
+        sys.stderr.write(f"Error from jodie server: {response.get('error')}\n")
+        return 1
+    if payload['command'] == 'parse':
+        sys.stdout.write(json.dumps(response['fields']) + '\n')
+    else:
+        sys.stdout.write(f"Saved...\n{response['contact']}\n")
+    return 0
+
+
+def parse(args):
+    """
+    Print the fields detected in TEXT, or in every line of --input, as JSON.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    if args['--input']:
+        return parse_file(args)
+    text = args['TEXT'][0]
+    if args['--connect']:
+        return connect(args, {"command": "parse", "text": text})
+    sys.stdout.write(json.dumps(jodie.parsers.parse_text(text)) + '\n')
+    return 0
+
+
+def parse_file(args):
+    """
+    Parse a file line by line, keeping the input order. With --format ndjson (the default) each
+    record is written as soon as it is parsed; with --format json they are written as one array.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    fmt = args['--format'] or 'ndjson'
+    if fmt not in ('json', 'ndjson'):
+        sys.stderr.write(f"Unknown output format {fmt!r}. Choose json or ndjson.\n")
+        return 1
+    try:
+        jobs = int(args['--jobs']) if args['--jobs'] else 1
+        records = jodie.pipeline.iter_json(args['--input'], jobs=jobs)
+        write = jodie.pipeline.write_ndjson if fmt == 'ndjson' else jodie.pipeline.write_json_array
+        write(records, sys.stdout)
+    except (ValueError, OSError) as e:
+        sys.stderr.write(f"Error reading input: {str(e)}\n")
+        return 1
+    return 0
+
+
+def find(args):
+    """
+    Print the contacts matching QUERY, best matches first: for `jodie find`, those whose names, email or
+    company start with its words; for `jodie search`, those whose notes, job title or company match it.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import sqlite3
+
+    fmt = args['--format'] or 'ndjson'
+    if fmt not in ('json', 'ndjson'):
+        sys.stderr.write(f"Unknown output format {fmt!r}. Choose json or ndjson.\n")
+        return 1
+    if args['search']:
+        # An argument the shell unquoted, like "machine learning", is still a phrase
+        query = ' '.join(f'"{word}"' if ' ' in word.strip() and '"' not in word else word for word in args['QUERY'])
+    else:
+        query = ' '.join(args['QUERY'])
+    try:
+        store = jodie.contact.get_store(args['--store'])
+        try:
+            if args['search']:
+                index = jodie.search.open_store_text_index(store, rebuild=args['--reindex'])
+            else:
+                index = jodie.search.open_store_index(store, rebuild=args['--reindex'])
+        finally:
+            store.close()
+        with index:
+            search = index.search if args['search'] else index.find
+            results = search(query, limit=int(args['--limit']))
+    except (ValueError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error searching contacts: {str(e)}\n")
+        return 1
+    write = jodie.pipeline.write_ndjson if fmt == 'ndjson' else jodie.pipeline.write_json_array
+    write(results, sys.stdout)
+    return 0
+
+
+def serve(args):
+    """
+    Run the `jodie serve` daemon in the foreground.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    from jodie.server import DEFAULT_SOCKET, serve as run_server
+
+    path = args['--socket'] or DEFAULT_SOCKET
+    sys.stderr.write(f"jodie serving on {path}\n")
+    run_server(path, store=args['--store'], batch_size=int(args['--batch-size']),
+               on_duplicate=args['--on-duplicate'])
+    return 0
+
+
+def dedupe(args):
+    """
+    Find likely duplicate contacts in the store and write merge proposals as NDJSON.
+
+    :param args: Parsed docopt arguments.
+    :return: Process exit status.
+    """
+    import sqlite3
+
+    try:
+        threshold = float(args['--threshold'])
+        jobs = int(args['--jobs']) if args['--jobs'] else None
+        store = jodie.contact.get_store(args['--store'])
+    except (ValueError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error starting dedupe: {str(e)}\n")
+        return 1
+    try:
+        records = list(store.iter_all())
+    finally:
+        store.close()
+
+    result = jodie.contact.find_duplicates(records, threshold=threshold, jobs=jobs)
+    output = open(args['--output'], 'w', encoding='utf-8') if args['--output'] else sys.stdout
+    try:
+        for proposal in jodie.contact.merge_proposals(records, result):
+            output.write(json.dumps(proposal) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    sys.stderr.write(
+        f"Compared {result.compared} pairs in {result.blocks} blocks in {result.seconds:.2f}s "
+        f"({result.pairs_per_second:,.0f} pairs/s); found {len(result.clusters)} groups of duplicates "
+        f"among {len(records)} contacts.\n")
+    if result.oversized:
+        sys.stderr.write(f"{result.oversized} contacts were left out of blocks too large to compare.\n")
+    return 0
 
 
 def main():
     first, last, email, phone, title, company, websites, note = (None,) * 8
 
-    args = docopt(__doc__, version=__version__)
+    started = time.perf_counter_ns()
+    with jodie.trace.span("docopt"):
+        args = docopt(__doc__, version=__version__)
+    start_profile(args, started)
+    start_metrics(args)
+    if args['import']:
+        sys.exit(import_contacts(args))
+    if args['export']:
+        sys.exit(export_contacts(args))
+    if args['harvest']:
+        sys.exit(harvest_contacts(args))
+    if args['index']:
+        sys.exit(build_index(args))
+    if args['find'] or args['search']:
+        sys.exit(find(args))
+    if args['parse']:
+        sys.exit(parse(args))
+    if args['serve']:
+        sys.exit(serve(args))
+    if args['dedupe']:
+        sys.exit(dedupe(args))
+
     mode = detect_argument_mode(args)
 
     if mode == "auto":
-        fields = parse_auto(args['TEXT'])
-        if fields:
-            if fields.get('first_name'):
-                human_name = HumanName(f"{fields['first_name']} {fields['last_name']}".strip())
-                if human_name:
-                    first, last = human_name.first, human_name.last
-            
-            email = fields.get('email')
-            phone = fields.get('phone')
-            title = fields.get('job_title')
-            company = fields.get('company')
-            websites = fields.get('websites')  # This is already a list from parse_auto
-            note = fields.get('note')
+        if args['--connect']:
+            sys.exit(connect(args, {"command": "new", "text": args['TEXT']}))
+        fields = jodie.parsers.contact_fields(jodie.parsers.parse_auto(args['TEXT']))
+        first, last = fields['first_name'], fields['last_name']
+        email = fields['email']
+        phone = fields['phone']
+        title = fields['job_title']
+        company = fields['company']
+        websites = fields['websites']
 
     if mode == "positional":
         try:
@@ -172,7 +493,7 @@ def main():
             sys.stderr.write(f"Error processing named arguments: {str(e)}\n")
             sys.exit(1)
 
-    c = jodie.contact.Contact(
+    fields = dict(
         first_name=first,
         last_name=last,
         email=email,
@@ -182,9 +503,25 @@ def main():
         websites=websites
         # note=note
     )
+    if args['--connect']:
+        sys.exit(connect(args, {"command": "new", "fields": fields}))
+
+    c = jodie.contact.ContactRecord(**fields)
+
+    import sqlite3
+
+    try:
+        store = open_store(args)
+    except (ValueError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error opening store: {str(e)}\n")
+        sys.exit(1)
 
     sys.stdout.write(f'Saving...\n{c}\n')
-    status = 0 if c.save() else 1
+    status = 0 if c.save(store=store) else 1
+    if isinstance(store, jodie.contact.DedupStore) and (store.skipped or store.merged):
+        outcome = "Skipped" if store.skipped else "Merged into"
+        sys.stdout.write(f"{outcome} an existing contact with the same email, phone or name.\n")
+    store.close()
     sys.exit(status)
 
 
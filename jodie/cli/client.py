@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# jodie/cli/client.py
+import json
+import socket
+from typing import Optional
+
+
+def request(path: str, payload: dict, timeout: Optional[float] = 30.0) -> dict:
+    """
+    Send one request to a running ContactServer and wait for its response.
+    Uses a plain blocking socket so the client starts fast.
+
+    Args:
+        path (str): The server's Unix socket path.
+        payload (dict): The request, e.g. {"command": "parse", "text": "..."}.
+        timeout (float, optional): Seconds to wait for the response.
+
+    Returns:
+        dict: The decoded response.
+
+    Raises:
+        OSError: If the server cannot be reached.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        with client.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError(f"No response from jodie server at {path}.")
+    return json.loads(line)
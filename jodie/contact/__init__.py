@@ -1,5 +1,51 @@
 #!/usr/bin/env python3
 # jodie/contact/__init__.py
-from jodie.contact.contact import Contact
+from jodie.contact.contact import Contact, get_label_for_email, get_label_for_website
+from jodie.contact.record import ContactRecord, Website
+from jodie.contact.dedup import DedupStore, DuplicateIndex
+from jodie.contact.fuzzy import DedupeResult, find_duplicates, merge_proposals
+from jodie.contact.domains import DomainClassifier, EMAIL_DOMAINS, WEBSITE_DOMAINS
+from jodie.contact.store import (
+    ContactStore,
+    ContactsAppStore,
+    MemoryStore,
+    SQLiteStore,
+    get_store
+)
 
-__all__ = ("Contact", )
+# Loaded on first use (PEP 562): the queue brings in asyncio and concurrent.futures,
+# which `jodie new` and `jodie import` never need.
+LAZY = {"SaveQueue": "jodie.contact.queue"}
+
+__all__ = (
+    "Contact",
+    "get_label_for_email",
+    "get_label_for_website",
+    "ContactRecord",
+    "Website",
+    "DedupStore",
+    "DuplicateIndex",
+    "DedupeResult",
+    "find_duplicates",
+    "merge_proposals",
+    "DomainClassifier",
+    "EMAIL_DOMAINS",
+    "WEBSITE_DOMAINS",
+    "SaveQueue",
+    "ContactStore",
+    "ContactsAppStore",
+    "MemoryStore",
+    "SQLiteStore",
+    "get_store"
+)
+
+
+def __getattr__(name):
+    if name in LAZY:
+        import importlib
+        return getattr(importlib.import_module(LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY))
@@ -1,13 +1,31 @@
 #!/usr/bin/env python3
 # jodie/contact/contact.py
 from datetime import datetime
-from typing import Optional, Set, List, Any, Union, Dict
-import objc
-from Contacts import (CNMutableContact, CNContactStore, CNSaveRequest, CNLabeledValue,
-                      CNPhoneNumber, CNLabelURLAddressHomePage)
-from Foundation import NSCalendar, NSDateComponents
+from functools import lru_cache
+from typing import Optional, List, Any, Union, Dict
+from jodie.contact.domains import EMAIL_DOMAINS, WEBSITE_DOMAINS, is_subdomain, url_host
+from jodie.contact.store import CONTACTS_INVALID, ContactStore, get_store
+from jodie.trace import traced
 
+# Value of CNLabelURLAddressHomePage, so labels can be computed without loading the Contacts framework
+HOMEPAGE_LABEL = "_$!<HomePage>!$_"
 
+
+@lru_cache(maxsize=None)
+def contacts_framework():
+    """
+    Import Apple's Contacts and Foundation frameworks on first use.
+    They are only available on macOS with PyObjC installed.
+
+    Returns:
+        tuple: The (Contacts, Foundation) modules.
+    """
+    import Contacts
+    import Foundation
+    return Contacts, Foundation
+
+
+@traced("get_label_for_email")
 def get_label_for_email(email: str) -> str:
     """
     Determine the label for an email address based on its domain.
@@ -17,26 +35,19 @@ def get_label_for_email(email: str) -> str:
 
     Returns:
         str: "work" if the email domain is neither a common webmail provider nor an educational institution (.edu),
-             otherwise "home".
+             otherwise "home". Disposable email domains loaded into EMAIL_DOMAINS also count as "home".
     """
-    webmail_providers: Set[str] = {
-        "gmail.com", "googlemail.com", "aol.com", "yahoo.com",
-        "hotmail.co.uk", "hotmail.com", "hotmail.de", "hotmail.es",
-        "hotmail.fr", "hotmail.it", "hushmail.com", "protonmail.com",
-        "hey.com", "icloud.com", "mac.com", "qq.com", "tuta.com",
-        "tutanota.com", "verizon.net", "ymail.com"
-    }
-
     # Extract the email's domain
     email_domain: str = email.split('@')[-1] if email else ""
 
-    # Check domain against webmail providers and education domains (.edu)
-    if email_domain not in webmail_providers and not email_domain.endswith('.edu'):
+    # One suffix lookup covers webmail providers, their subdomains and education domains (.edu)
+    if EMAIL_DOMAINS.lookup(email_domain) is None:
         return "work"
     else:
         return "home"
 
 
+@traced("get_label_for_website")
 def get_label_for_website(url: str, email: Optional[str] = None, company: Optional[str] = None) -> str:
     """
     Determine the appropriate label for a website URL based on its domain, email, and company information.
@@ -47,78 +58,82 @@ def get_label_for_website(url: str, email: Optional[str] = None, company: Option
         company (str, optional): The contact's company name to check for domain matching.
 
     Returns:
-        str: A label constant from Contacts framework (CNLabelURLAddress*) or a custom label string.
+        str: A label constant from Contacts framework (CNLabelURLAddress*, see HOMEPAGE_LABEL) or a custom label string.
     """
-    # Common professional/social networks
-    professional_domains = {
-        'linkedin.com': 'LinkedIn',
-        'github.com': 'GitHub',
-        'twitter.com': 'Twitter',
-        'instagram.com': 'Instagram',
-        'facebook.com': 'Facebook',
-    }
-
-    # Common calendar/scheduling domains
-    calendar_domains = {
-        'calendly.com': 'Calendar',
-        'meet.google.com': 'Calendar',
-        'zoom.us': 'Calendar',
-    }
-
-    # Extract the domain from the URL
-    try:
-        # Remove protocol and www if present
-        domain = url.lower().replace('https://', '').replace('http://', '').replace('www.', '')
-        # Get the domain part
-        domain = domain.split('/')[0]
-    except:
-        # If URL parsing fails, default to homepage
-        return CNLabelURLAddressHomePage
-
-    # Rule 1: Check against known professional/social networks
-    for known_domain, label in professional_domains.items():
-        if known_domain in domain:
-            return label
-
-    # Rule 2: Check against known calendar domains
-    for known_domain, label in calendar_domains.items():
-        if known_domain in domain:
-            return label
-
-    # Rule 3: If email is work and domains match, set website to work
+    if not url:
+        return HOMEPAGE_LABEL
+    domain = url_host(url)
+
+    # Rules 1 and 2: Known professional/social networks and calendar domains, including subdomains
+    label = WEBSITE_DOMAINS.lookup(domain)
+    if label:
+        return label
+
     if email:
+        email_label = get_label_for_email(email)
+
+        # Rule 3: If email is work and domains match, set website to work
         email_domain = email.split('@')[-1].lower()
-        if get_label_for_email(email) == "work" and email_domain in domain:
+        if email_label == "work" and (is_subdomain(domain, email_domain) or is_subdomain(email_domain, domain)):
             return "Work"
 
-    # Rule 4: If email is home/webmail and company name exists, check for company name in domain
-    if email and company and get_label_for_email(email) == "home":
-        # Split company name into words and check if any appear in domain
-        company_words = company.lower().split()
-        if any(word in domain for word in company_words):
-            return "Work"
+        # Rule 4: If email is home/webmail and company name exists, check for company name in domain
+        if company and email_label == "home":
+            # Split company name into words and check if any appear in domain
+            company_words = company.lower().split()
+            if any(word in domain for word in company_words):
+                return "Work"
 
     # Rule 5: Fallback to homepage
-    return CNLabelURLAddressHomePage
+    return HOMEPAGE_LABEL
 
 
-class WebsiteLabeledValue(CNLabeledValue):
-    """Wrapper for CNLabeledValue that provides a better string representation and additional functionality."""
-    
-    def __repr__(self) -> str:
-        return f"Website(label={self.label()!r}, url={self.value()!r})"
-    
-    def to_dict(self) -> Dict[str, str]:
-        """Convert to a dictionary representation."""
-        return {"label": self.label(), "url": self.value()}
+@lru_cache(maxsize=None)
+def website_labeled_value_class() -> type:
+    """
+    Define WebsiteLabeledValue on first use.
+    Subclassing CNLabeledValue needs the Contacts framework, and an Objective-C class can only be registered once.
+    """
+    Contacts, _ = contacts_framework()
+
+    class WebsiteLabeledValue(Contacts.CNLabeledValue):
+        """Wrapper for CNLabeledValue that provides a better string representation and additional functionality."""
+
+        def __repr__(self) -> str:
+            return f"Website(label={self.label()!r}, url={self.value()!r})"
+
+        def to_dict(self) -> Dict[str, str]:
+            """Convert to a dictionary representation."""
+            return {"label": self.label(), "url": self.value()}
+
+    return WebsiteLabeledValue
+
+
+def website_value(label: str, url: str) -> 'WebsiteLabeledValue':
+    """Create a WebsiteLabeledValue for a URL."""
+    return website_labeled_value_class().alloc().initWithLabel_value_(label, url)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "WebsiteLabeledValue":
+        return website_labeled_value_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Contact:
     """
     Simple wrapper for Apple iOS / macOS Contact record.
     Provides a Pythonic interface to interact with Apple's Contacts framework.
+
+    Field values are kept in a Python-side mirror. Reads never cross the Objective-C bridge, and
+    writes only mark the field dirty. The CNMutableContact is created, and dirty fields are written
+    to it once, when `contact` is first accessed, i.e. when a store saves the contact.
     """
 
+    # Fields mirrored in Python, in the order they are written to the CNMutableContact
+    FIELDS = ('first_name', 'last_name', 'email', 'phone', 'job_title', 'company', 'websites', 'note', 'created_date')
+
+    @traced("Contact.__init__")
     def __init__(
         self,
         first_name: Optional[str] = None,
@@ -127,7 +142,7 @@ class Contact:
         phone: Optional[str] = None,
         job_title: Optional[str] = None,
         company: Optional[str] = None,
-        websites: Optional[Union[str, List[str], List[Dict[str, str]], List[CNLabeledValue]]] = None,
+        websites: Optional[Union[str, List[str], List[Dict[str, str]], List['CNLabeledValue']]] = None,
         note: Optional[str] = None
     ) -> None:
         """
@@ -144,14 +159,17 @@ class Contact:
             websites: Website URL(s) of the contact
             note: Additional notes for the contact
         """
-        self.contact: CNMutableContact = CNMutableContact.alloc().init()
-        
-        # Convert empty strings to None
-        self.first_name = first_name if first_name and first_name.strip() else None
-        self.last_name = last_name if last_name and last_name.strip() else None
+        self._values: Dict[str, Any] = dict.fromkeys(self.FIELDS)
+        self._values['websites'] = ()
+        self._dirty: set = set()
+        self._cn_contact: Optional['CNMutableContact'] = None
+        self._website_values: Optional[List['WebsiteLabeledValue']] = None
+
+        self.first_name = first_name
+        self.last_name = last_name
         self.email = email
         self.phone = phone
-        self.job_title = job_title if job_title and job_title.strip() else None
+        self.job_title = job_title
         self.company = company
         self.websites = websites
         self.note = note
@@ -161,22 +179,129 @@ class Contact:
         self._created_date: datetime = datetime.now()
         self._set_creation_date()
 
+    @classmethod
+    def from_cn_contact(cls, cn_contact: 'CNContact') -> 'Contact':
+        """
+        Wrap a contact fetched from Contacts.app, reading its fields across the bridge once.
+
+        Args:
+            cn_contact: A CNContact fetched with at least the keys in `ContactsAppStore.KEYS_TO_FETCH`.
+
+        Returns:
+            Contact: A contact backed by a mutable copy of `cn_contact`.
+        """
+        contact = cls.__new__(cls)
+        contact._cn_contact = cn_contact.mutableCopy()
+        contact._dirty = set()
+        contact._website_values = None
+        contact._created_date = datetime.now()
+        for date in cn_contact.dates() or []:
+            if date.label() == "created_date":
+                components = date.value()
+                contact._created_date = datetime(components.year(), components.month(), components.day())
+
+        def text(value: Optional[str]) -> Optional[str]:
+            return value.strip() if value and value.strip() else None
+
+        emails = cn_contact.emailAddresses()
+        phones = cn_contact.phoneNumbers()
+        contact._values = {
+            'first_name': text(cn_contact.givenName()),
+            'last_name': text(cn_contact.familyName()),
+            'email': emails[0].value() if emails else None,
+            'phone': phones[0].value().stringValue() if phones else None,
+            'job_title': text(cn_contact.jobTitle()),
+            'company': text(cn_contact.organizationName()),
+            'websites': tuple((site.label(), site.value()) for site in cn_contact.urlAddresses() or ()),
+            # Reading notes needs an entitlement jodie doesn't have, see `note`
+            'note': None,
+            'created_date': contact._created_date,
+        }
+        return contact
+
+    def _set(self, field: str, value: Any) -> None:
+        """Update the mirror, marking the field dirty if the value changed."""
+        if self._values[field] != value:
+            self._values[field] = value
+            self._dirty.add(field)
+            if field == 'websites':
+                self._website_values = None
+
+    @property
+    def contact(self) -> 'CNMutableContact':
+        """
+        The CNMutableContact behind this contact, with every pending change written to it.
+        Created on first access, which needs the Contacts framework.
+        """
+        if self._cn_contact is None:
+            Contacts, _ = contacts_framework()
+            self._cn_contact = Contacts.CNMutableContact.alloc().init()
+        if self._dirty:
+            self._flush()
+        return self._cn_contact
+
+    def _flush(self) -> None:
+        """Write dirty fields to the CNMutableContact, one bridge call per field."""
+        Contacts, Foundation = contacts_framework()
+        cn_contact, values = self._cn_contact, self._values
+        for field in self.FIELDS:
+            if field not in self._dirty:
+                continue
+            value = values[field]
+            if field == 'first_name':
+                cn_contact.setGivenName_(value)
+            elif field == 'last_name':
+                cn_contact.setFamilyName_(value)
+            elif field == 'email':
+                cn_contact.setEmailAddresses_([Contacts.CNLabeledValue.alloc().initWithLabel_value_(
+                    get_label_for_email(value), value)] if value else [])
+            elif field == 'phone':
+                cn_contact.setPhoneNumbers_([Contacts.CNLabeledValue.alloc().initWithLabel_value_(
+                    "mobile", Contacts.CNPhoneNumber.phoneNumberWithStringValue_(value))] if value else [])
+            elif field == 'job_title':
+                cn_contact.setJobTitle_(value)
+            elif field == 'company':
+                cn_contact.setOrganizationName_(value)
+            elif field == 'websites':
+                cn_contact.setUrlAddresses_(self.websites or [])
+            elif field == 'note':
+                cn_contact.setNote_(value)
+            elif field == 'created_date':
+                dateComponents = Foundation.NSDateComponents.alloc().init()
+                dateComponents.setYear_(value.year)
+                dateComponents.setMonth_(value.month)
+                dateComponents.setDay_(value.day)
+                customDateValue = Contacts.CNLabeledValue.alloc().initWithLabel_value_(
+                    "created_date", dateComponents)
+                cn_contact.setDates_([customDateValue])
+        self._dirty.clear()
+
     def _set_creation_date(self) -> None:
         """
-        Set the creation date for the contact using the current date and store it as a custom date field.
+        Set the creation date for the contact from `_created_date`. It is saved as a custom date field.
+        """
+        self._set('created_date', self._created_date)
+
+    def validate(self) -> None:
+        """
+        Check that the fields Contacts.app requires are set.
+
+        Raises:
+            ValueError: If required fields (first name, last name, email) are missing
         """
-        dateComponents: NSDateComponents = NSDateComponents.alloc().init()
-        dateComponents.setYear_(self._created_date.year)
-        dateComponents.setMonth_(self._created_date.month)
-        dateComponents.setDay_(self._created_date.day)
-        customDateValue: CNLabeledValue = CNLabeledValue.alloc().initWithLabel_value_(
-            "created_date", dateComponents)
-        self.contact.setDates_([customDateValue])
-
-    def save(self) -> 'Contact':
+        if not all([self.first_name, self.last_name, self.email]):
+            CONTACTS_INVALID.inc()
+            raise ValueError(
+                "Missing required fields. First name, last name, and email are required.")
+
+    @traced("Contact.save")
+    def save(self, store: Optional['ContactStore'] = None) -> 'Contact':
         """
         Validate required fields and try to save to Contacts.app / Apple Address Book.
 
+        Args:
+            store: Where to save the contact. Defaults to `get_store()`, i.e. $JODIE_STORE or Contacts.app.
+
         Returns:
             Contact: The saved contact instance
 
@@ -184,20 +309,15 @@ class Contact:
             ValueError: If required fields (first name, last name, email) are missing
             Exception: If the save operation fails
         """
-        if not all([self.contact.givenName(), self.contact.familyName(), self.contact.emailAddresses()]):
-            raise ValueError(
-                "Missing required fields. First name, last name, and email are required.")
-
-        store: CNContactStore = CNContactStore.alloc().init()
-        request: CNSaveRequest = CNSaveRequest.alloc().init()
-        request.addContact_toContainerWithIdentifier_(self.contact, None)
-
-        error: Any = objc.nil
-        success, error = store.executeSaveRequest_error_(request, None)
-        if not success:
-            raise Exception(f"Failed to save contact: {error}")
+        self.validate()
+        if store is None:
+            store = get_store()
+        store.save_many([self])
         return self
 
+    def _website_pairs(self) -> str:
+        return ", ".join(f"{label}: {url}" for label, url in self._values['websites'])
+
     def __str__(self) -> str:
         """String representation of the contact, showing only set fields."""
         fields = []
@@ -223,20 +343,15 @@ class Contact:
         fields.append(f"Company: {self.company}" if self.company else "Company: None")
         
         # Websites
-        if self.websites:
-            website_str = ", ".join(f"{site.label()}: {site.value()}" for site in self.websites)
-            fields.append(f"Websites: {website_str}")
+        if self._values['websites']:
+            fields.append(f"Websites: {self._website_pairs()}")
         else:
             fields.append("Websites: None")
             
         return ", ".join(fields)
 
     def __repr__(self) -> str:
-        websites = self.websites
-        if websites:
-            website_repr = f"[{', '.join(f'{site.label()}: {site.value()}' for site in websites)}]"
-        else:
-            website_repr = "None"
+        website_repr = f"[{self._website_pairs()}]" if self._values['websites'] else "None"
         return (f"{self.__class__.__name__}(first_name={self.first_name!r}, "
                 f"last_name={self.last_name!r}, email={self.email!r}, "
                 f"phone={self.phone!r}, job_title={self.job_title!r}, "
@@ -245,77 +360,63 @@ class Contact:
     @property
     def first_name(self) -> Optional[str]:
         """Get the contact's first name."""
-        val = self.contact.givenName()
-        return val.strip() if val and val.strip() else None
+        return self._values['first_name']
 
     @property
     def last_name(self) -> Optional[str]:
         """Get the contact's last name."""
-        val = self.contact.familyName()
-        return val.strip() if val and val.strip() else None
+        return self._values['last_name']
 
     @property
     def email(self) -> Optional[str]:
         """Get the contact's primary email address."""
-        emailAddresses: List[CNLabeledValue] = self.contact.emailAddresses()
-        return emailAddresses[0].value() if emailAddresses else None
+        return self._values['email']
 
     @email.setter
     def email(self, value: Optional[str]) -> None:
-        if not value or not value.strip():
-            self.contact.setEmailAddresses_([])
-            return
-        email_label = get_label_for_email(value)
-        emailValue = CNLabeledValue.alloc().initWithLabel_value_(
-            email_label, value.strip().lower())
-        self.contact.setEmailAddresses_([emailValue])
+        self._set('email', value.strip().lower() if value and value.strip() else None)
 
     @property
     def phone(self) -> Optional[str]:
         """Get the contact's primary phone number."""
-        phoneNumbers: List[CNLabeledValue] = self.contact.phoneNumbers()
-        return phoneNumbers[0].value().stringValue() if phoneNumbers else None
+        return self._values['phone']
 
     @phone.setter
     def phone(self, value: Optional[str]) -> None:
         if not value or not value.strip():
-            self.contact.setPhoneNumbers_([])
+            self._set('phone', None)
             return
-        cleaned_number = ''.join(ch for ch in value if ch.isdigit() or ch == '+')
-        phone_number = CNPhoneNumber.phoneNumberWithStringValue_(cleaned_number)
-        phone_label_value = CNLabeledValue.alloc().initWithLabel_value_(
-            "mobile", phone_number)
-        self.contact.setPhoneNumbers_([phone_label_value])
+        self._set('phone', ''.join(ch for ch in value if ch.isdigit() or ch == '+'))
 
     @property
     def job_title(self) -> Optional[str]:
         """Get the contact's job title."""
-        val = self.contact.jobTitle()
-        return val.strip() if val and val.strip() else None
+        return self._values['job_title']
 
     @property
     def company(self) -> Optional[str]:
         """Get the contact's company name."""
-        val = self.contact.organizationName()
-        return val.strip() if val and val.strip() else None
+        return self._values['company']
 
     @company.setter
     def company(self, value: Optional[str]) -> None:
-        if not value or not value.strip():
-            self.contact.setOrganizationName_(None)
-            return
-        self.contact.setOrganizationName_(value.strip())
+        self._set('company', value.strip() if value and value.strip() else None)
 
     @property
-    def websites(self) -> Optional[List[WebsiteLabeledValue]]:
-        """Get all websites as a list of WebsiteLabeledValue objects."""
-        urlAddresses: List[CNLabeledValue] = self.contact.urlAddresses()
-        if not urlAddresses:
+    def websites(self) -> Optional[List['WebsiteLabeledValue']]:
+        """
+        Get all websites as a list of WebsiteLabeledValue objects.
+        The objects are built once per change to the websites and need the Contacts framework.
+        """
+        pairs = self._values['websites']
+        if not pairs:
             return None
-        return [WebsiteLabeledValue.alloc().initWithLabel_value_(site.label(), site.value()) for site in urlAddresses]
+        if self._website_values is None:
+            self._website_values = [website_value(label, url) for label, url in pairs]
+        return list(self._website_values)
 
     @websites.setter
-    def websites(self, value: Union[str, List[str], List[Dict[str, str]], List[CNLabeledValue]]) -> None:
+    def websites(self, value: Union[str, List[str], List[Dict[str, str]], List['CNLabeledValue']]) -> None:
         """Set websites. Can handle:
         - Single URL string
         - List of URL strings
@@ -323,66 +424,36 @@ class Contact:
         - List of CNLabeledValue objects
         """
         if not value:
-            self.contact.setUrlAddresses_([])
+            self._set('websites', ())
             return
-
-        # Convert to list of WebsiteLabeledValue objects
         if isinstance(value, str):
-            label = get_label_for_website(value, self.email, self.company)
-            value = [WebsiteLabeledValue.alloc().initWithLabel_value_(label, value.strip().lower())]
-        elif isinstance(value, list):
-            if not value:
-                self.contact.setUrlAddresses_([])
-                return
-                
-            if isinstance(value[0], str):
-                # List of strings
-                url_values = []
-                for url in value:
-                    label = get_label_for_website(url, self.email, self.company)
-                    url_value = WebsiteLabeledValue.alloc().initWithLabel_value_(
-                        label, url.strip().lower())
-                    url_values.append(url_value)
-                value = url_values
-            elif isinstance(value[0], dict):
-                # List of dicts
-                url_values = []
-                for item in value:
-                    url = item["url"]
-                    label = item.get("label") or get_label_for_website(url, self.email, self.company)
-                    url_value = WebsiteLabeledValue.alloc().initWithLabel_value_(
-                        label, url.strip().lower())
-                    url_values.append(url_value)
-                value = url_values
-            elif isinstance(value[0], CNLabeledValue):
-                # Convert existing CNLabeledValue objects to WebsiteLabeledValue
-                url_values = []
-                for site in value:
-                    url_value = WebsiteLabeledValue.alloc().initWithLabel_value_(
-                        site.label(), site.value())
-                    url_values.append(url_value)
-                value = url_values
-
-        self.contact.setUrlAddresses_(value)
+            value = [value]
+
+        pairs = []
+        for site in value:
+            if isinstance(site, str):
+                label = get_label_for_website(site, self.email, self.company)
+                pairs.append((label, site.strip().lower()))
+            elif isinstance(site, dict):
+                url = site["url"]
+                label = site.get("label") or get_label_for_website(url, self.email, self.company)
+                pairs.append((label, url.strip().lower()))
+            else:
+                # CNLabeledValue
+                pairs.append((site.label(), site.value()))
+        self._set('websites', tuple(pairs))
 
     def add_website(self, url: str, label: Optional[str] = None) -> None:
         """Add a single website with optional label."""
-        current = self.websites or []
         if not label:
             label = get_label_for_website(url, self.email, self.company)
-        websiteValue = WebsiteLabeledValue.alloc().initWithLabel_value_(
-            label, url.strip().lower())
-        current.append(websiteValue)
-        self.contact.setUrlAddresses_(current)
+        self._set('websites', self._values['websites'] + ((label, url.strip().lower()),))
 
     def get_website(self, label: str) -> Optional[str]:
         """Get a specific website by its label."""
-        websites = self.websites
-        if not websites:
-            return None
-        for site in websites:
-            if site.label() == label:
-                return site.value()
+        for site_label, url in self._values['websites']:
+            if site_label == label:
+                return url
         return None
 
     # Convenience properties for common website types
@@ -396,7 +467,7 @@ class Contact:
 
     @property
     def home_website(self) -> Optional[str]:
-        return self.get_website(CNLabelURLAddressHomePage)
+        return self.get_website(HOMEPAGE_LABEL)
 
     @property
     def note(self) -> Optional[str]:
@@ -405,7 +476,7 @@ class Contact:
         Note:
             This functionality is currently broken due to Apple entitlements requirements.
         """
-        return self.contact.note()
+        return self._values['note']
 
     @note.setter
     def note(self, value: Optional[str]) -> None:
@@ -414,10 +485,7 @@ class Contact:
         Note:
             This functionality is currently broken due to Apple entitlements requirements.
         """
-        if not value or not value.strip():
-            self.contact.setNote_(None)
-            return
-        self.contact.setNote_(value.strip())
+        self._set('note', value.strip() if value and value.strip() else None)
 
     def __dict__(self) -> dict:
         """
@@ -428,24 +496,17 @@ class Contact:
                  Empty fields are returned as None.
                  Created date is formatted as YYYY-MM-DD.
         """
-        def get_value_or_none(value):
-            if value is None:
-                return None
-            if isinstance(value, str):
-                return value if value.strip() else None
-            if isinstance(value, list):
-                return [item.to_dict() for item in value] if value else None
-            return value
-
+        values = self._values
+        websites = values['websites']
         return {
-            'first_name': get_value_or_none(self.first_name),
-            'last_name': get_value_or_none(self.last_name),
-            'email': get_value_or_none(self.email),
-            'phone': get_value_or_none(self.phone),
-            'job_title': get_value_or_none(self.job_title),
-            'company': get_value_or_none(self.company),
-            'websites': get_value_or_none(self.websites),
-            'note': get_value_or_none(self.note),
+            'first_name': values['first_name'],
+            'last_name': values['last_name'],
+            'email': values['email'],
+            'phone': values['phone'],
+            'job_title': values['job_title'],
+            'company': values['company'],
+            'websites': [{"label": label, "url": url} for label, url in websites] if websites else None,
+            'note': values['note'],
             'created_date': self._created_date.strftime('%Y-%m-%d')
         }
 
@@ -462,23 +523,18 @@ class Contact:
     @first_name.setter
     def first_name(self, value: Optional[str]) -> None:
         """Set first name."""
-        if not value or not value.strip():
-            value = None
-        self.contact.setGivenName_(value)
+        self._set('first_name', value.strip() if value and value.strip() else None)
 
     @last_name.setter
     def last_name(self, value: Optional[str]) -> None:
         """Set last name."""
-        if not value or not value.strip():
-            value = None
-        self.contact.setFamilyName_(value)
+        self._set('last_name', value.strip() if value and value.strip() else None)
 
     @job_title.setter
     def job_title(self, value: Optional[str]) -> None:
         """Set job title."""
-        if not value or not value.strip():
-            value = None
-        self.contact.setJobTitle_(value)
+        self._set('job_title', value.strip() if value and value.strip() else None)
+
 
 def test_website_labels():
     test_cases = [
@@ -493,21 +549,21 @@ def test_website_labels():
 
         # Work Email Domain Match
         ("https://acme.com", "john@acme.com", None, "Work"),  # work email
-        ("https://acme.com", "john@gmail.com", None, CNLabelURLAddressHomePage),  # personal email
+        ("https://acme.com", "john@gmail.com", None, HOMEPAGE_LABEL),  # personal email
 
         # Company Name Match
         ("https://acme-corp.com", "john@gmail.com", "Acme Corp", "Work"),  # company name in domain
         ("https://acme.com", "john@gmail.com", "Acme Corp", "Work"),  # company name in domain
-        ("https://other.com", "john@gmail.com", "Acme Corp", CNLabelURLAddressHomePage),  # no match
+        ("https://other.com", "john@gmail.com", "Acme Corp", HOMEPAGE_LABEL),  # no match
 
         # Multiple URLs for same contact
         ("https://acme.com", "john@acme.com", "Acme Corp", "Work"),  # work website
         ("https://linkedin.com/in/johndoe", "john@acme.com", "Acme Corp", "LinkedIn"),  # LinkedIn profile
 
         # Edge Cases
-        ("invalid-url", None, None, CNLabelURLAddressHomePage),  # invalid URL
-        ("", None, None, CNLabelURLAddressHomePage),  # empty URL
-        (None, None, None, CNLabelURLAddressHomePage),  # None URL
+        ("invalid-url", None, None, HOMEPAGE_LABEL),  # invalid URL
+        ("", None, None, HOMEPAGE_LABEL),  # empty URL
+        (None, None, None, HOMEPAGE_LABEL),  # None URL
     ]
 
     print("Testing website label determination:")
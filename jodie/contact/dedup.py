@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# jodie/contact/dedup.py
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jodie.contact.store import RECORD_FIELDS, ContactStore, as_record
+from jodie.metrics import counter
+from jodie.trace import traced
+
+# What to do when a saved contact matches an existing one
+SKIP = "skip"
+MERGE = "merge"
+CREATE = "create"
+POLICIES = (SKIP, MERGE, CREATE)
+
+DUPLICATES = counter("jodie_duplicates_total", "Saved contacts that matched an existing one, by what was done.",
+                     ["action"])
+
+# Fewer digits than this is too ambiguous to identify a person
+MIN_PHONE_DIGITS = 7
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercase and strip an email address."""
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Keep only the digits of a phone number, e.g. "+1 (555) 555-5555" -> "15555555555"."""
+    digits = "".join(ch for ch in phone or "" if ch.isdigit())
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def normalize_name(first_name: Optional[str], last_name: Optional[str]) -> Optional[str]:
+    """Casefold a full name and drop punctuation, e.g. ("John", "O'Neil Jr.") -> "john oneil jr"."""
+    if not (first_name and first_name.strip() and last_name and last_name.strip()):
+        return None
+    name = _NON_WORD.sub("", f"{first_name} {last_name}".casefold())
+    return " ".join(name.split()) or None
+
+
+def duplicate_keys(record: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the (kind, key) pairs a record can be matched on, strongest first.
+
+    :param record: A record shaped like `Contact.tojson()`.
+    :return: An iterator of ("email" | "phone" | "name", normalized key).
+    """
+    email = normalize_email(record.get('email'))
+    if email:
+        yield 'email', email
+    phone = normalize_phone(record.get('phone'))
+    if phone:
+        yield 'phone', phone
+    name = normalize_name(record.get('first_name'), record.get('last_name'))
+    if name:
+        yield 'name', name
+
+
+def merge_records(existing: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge a new record into an existing one.
+    Fields missing from the existing record are filled in from the new one and websites are combined.
+
+    :param existing: The saved record.
+    :param incoming: The record that was found to duplicate it.
+    :return: A new merged record that keeps the existing identifier and created date.
+    """
+    merged = dict(existing)
+    for field in RECORD_FIELDS:
+        if field in ('websites', 'created_date'):
+            continue
+        if not merged.get(field) and incoming.get(field):
+            merged[field] = incoming[field]
+
+    websites = list(existing.get('websites') or [])
+    seen = {site['url'] for site in websites}
+    for site in incoming.get('websites') or []:
+        if site['url'] not in seen:
+            websites.append(site)
+            seen.add(site['url'])
+    merged['websites'] = websites or None
+    return merged
+
+
+class DuplicateIndex:
+    """
+    In-memory index from normalized email, phone and full name to a contact identifier.
+    Each lookup and update is a handful of dict operations, independent of the number of contacts.
+    """
+
+    def __init__(self) -> None:
+        self.keys: Dict[Tuple[str, str], str] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'DuplicateIndex':
+        """Build an index over records that carry an "identifier"."""
+        index = cls()
+        for record in records:
+            index.add(record, record['identifier'])
+        return index
+
+    def find(self, record: Dict[str, Any]) -> Optional[str]:
+        """Return the identifier of a contact the record duplicates, or None."""
+        for key in duplicate_keys(record):
+            identifier = self.keys.get(key)
+            if identifier is not None:
+                return identifier
+        return None
+
+    def add(self, record: Dict[str, Any], identifier: str) -> None:
+        """Index a record's keys. Keys that already belong to another contact are left alone."""
+        for key in duplicate_keys(record):
+            self.keys.setdefault(key, identifier)
+
+    def remove(self, record: Dict[str, Any], identifier: str) -> None:
+        """Drop the keys a record added for `identifier`."""
+        for key in duplicate_keys(record):
+            if self.keys.get(key) == identifier:
+                del self.keys[key]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class DedupStore(ContactStore):
+    """
+    Wraps another store and checks every saved contact against a DuplicateIndex first.
+
+    The index is built from the wrapped store on the first save and then kept up to date
+    as contacts are saved or deleted. Duplicates are skipped, merged into the existing
+    contact, or created anyway, depending on `on_duplicate`. Counts of each outcome are
+    kept in `created`, `merged` and `skipped`.
+    """
+
+    def __init__(self, store: ContactStore, on_duplicate: str = SKIP) -> None:
+        """
+        Args:
+            store: The store to save to.
+            on_duplicate (str): One of "skip", "merge" or "create".
+        """
+        if on_duplicate not in POLICIES:
+            raise ValueError(
+                f"Unknown duplicate policy {on_duplicate!r}. Choose one of: {', '.join(POLICIES)}.")
+        self.store = store
+        self.on_duplicate = on_duplicate
+        self.index: Optional[DuplicateIndex] = None
+        self.created = 0
+        self.merged = 0
+        self.skipped = 0
+
+    def _index(self) -> DuplicateIndex:
+        if self.index is None:
+            self.index = DuplicateIndex.from_records(self.store.iter_all())
+        return self.index
+
+    @traced("DedupStore.save_many")
+    def save_many(self, contacts: List[Any]) -> List[str]:
+        index = self._index()
+        # Records to write, and for each input contact: ("saved", position) or ("existing", identifier)
+        pending: List[Dict[str, Any]] = []
+        outcomes: List[Tuple[str, Any]] = []
+        # Keys of records in this batch, so duplicates within the batch are caught too
+        batch_keys: Dict[Tuple[str, str], int] = {}
+
+        for contact in contacts:
+            record = as_record(contact)
+            identifier, position = None, None
+            if self.on_duplicate != CREATE:
+                position = next((batch_keys[key] for key in duplicate_keys(record) if key in batch_keys), None)
+                if position is None:
+                    identifier = index.find(record)
+
+            if identifier is None and position is None:
+                position = len(pending)
+                pending.append(record)
+                self.created += 1
+            elif self.on_duplicate == SKIP:
+                self.skipped += 1
+                DUPLICATES.inc(SKIP)
+                outcomes.append(("existing", identifier) if identifier else ("saved", position))
+                continue
+            elif position is not None:
+                pending[position] = merge_records(pending[position], record)
+                self.merged += 1
+                DUPLICATES.inc(MERGE)
+            else:
+                existing = self.store.get(identifier)
+                if existing is None:
+                    # Deleted behind our back; forget it and save as new
+                    index.remove(record, identifier)
+                    position = len(pending)
+                    pending.append(record)
+                    self.created += 1
+                else:
+                    position = len(pending)
+                    pending.append(merge_records(existing, record))
+                    self.merged += 1
+                    DUPLICATES.inc(MERGE)
+
+            for key in duplicate_keys(pending[position]):
+                batch_keys.setdefault(key, position)
+            outcomes.append(("saved", position))
+
+        identifiers = self.store.save_many(pending) if pending else []
+        for record, identifier in zip(pending, identifiers):
+            index.add(record, identifier)
+        return [identifiers[value] if kind == "saved" else value for kind, value in outcomes]
+
+    def get(self, identifier: str) -> Optional[dict]:
+        return self.store.get(identifier)
+
+    def iter_all(self) -> Iterator[dict]:
+        return self.store.iter_all()
+
+    def delete(self, identifier: str) -> bool:
+        record = self.store.get(identifier) if self.index is not None else None
+        deleted = self.store.delete(identifier)
+        if deleted and record is not None:
+            self.index.remove(record, identifier)
+        return deleted
+
+    def close(self) -> None:
+        self.store.close()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# jodie/contact/domains.py
+import os
+from functools import lru_cache
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+# Email domain categories
+WEBMAIL = "webmail"
+DISPOSABLE = "disposable"
+EDUCATION = "education"
+
+
+def normalize_domain(domain: str) -> str:
+    """Lowercase a domain and drop surrounding whitespace, dots and a leading "@"."""
+    return domain.strip().lower().lstrip('@').strip('.')
+
+
+def url_host(url: str) -> str:
+    """
+    Extract the host from a URL or bare domain, e.g. "https://www.acme.com:8080/about" -> "acme.com".
+
+    Args:
+        url (str): The URL to analyze.
+
+    Returns:
+        str: The lowercase host without scheme, credentials, port, path or a leading "www.".
+    """
+    host = url.strip().lower()
+    if '://' in host:
+        host = host.split('://', 1)[1]
+    for separator in '/?#':
+        host = host.split(separator, 1)[0]
+    host = host.rsplit('@', 1)[-1].split(':', 1)[0].strip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+def read_domains(path: str) -> Iterator[str]:
+    """Yield the domains in a list file, one per line, skipping blanks and "#" comments."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield normalize_domain(line)
+
+
+class DomainClassifier:
+    """
+    Maps domains to a value (a category or a label) and matches hosts on domain suffixes.
+
+    A host matches an entry if it is that domain or any subdomain of it, so "m.linkedin.com"
+    matches "linkedin.com" but "notlinkedin.com" does not. The most specific entry wins.
+    A lookup walks the host's suffixes from the longest down, one dict lookup per label,
+    so its cost does not depend on how many domains are loaded. Results are LRU-cached per host.
+    """
+
+    def __init__(self, domains: Union[Mapping[str, str], Iterable[Tuple[str, str]]] = (),
+                 cache_size: int = 65536) -> None:
+        """
+        Args:
+            domains: A mapping or (domain, value) pairs.
+            cache_size (int): Number of recent hosts whose result is cached.
+        """
+        self.domains = {}
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+        self.update(domains)
+
+    def update(self, domains: Union[Mapping[str, str], Iterable[Tuple[str, str]]]) -> None:
+        """Add (domain, value) entries, replacing existing values for the same domain."""
+        if isinstance(domains, Mapping):
+            domains = domains.items()
+        self.domains.update((normalize_domain(domain), value) for domain, value in domains)
+        self.lookup.cache_clear()
+
+    def load(self, path: str, value: str) -> int:
+        """
+        Add every domain in a list file with the same value.
+
+        Args:
+            path (str): File with one domain per line.
+            value (str): The value to map the domains to, e.g. WEBMAIL or DISPOSABLE.
+
+        Returns:
+            int: The number of domains read.
+        """
+        before = len(self.domains)
+        self.update((domain, value) for domain in read_domains(path))
+        return len(self.domains) - before
+
+    def _lookup(self, host: str) -> Optional[str]:
+        """
+        Return the value of the most specific entry matching `host`. Use `lookup`, which is cached.
+
+        :param host: A hostname or email domain.
+        :return: The matching value, or None.
+        """
+        domains = self.domains
+        host = normalize_domain(host)
+        while host:
+            value = domains.get(host)
+            if value is not None:
+                return value
+            host = host.partition('.')[2]
+        return None
+
+    def __contains__(self, host: str) -> bool:
+        return self.lookup(host) is not None
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+
+def is_subdomain(host: str, domain: str) -> bool:
+    """True if `host` is `domain` or a subdomain of it."""
+    return bool(domain) and (host == domain or host.endswith('.' + domain))
+
+
+# Email domains that are personal rather than work addresses.
+# Extend with `EMAIL_DOMAINS.load(path, WEBMAIL)` or the JODIE_WEBMAIL_DOMAINS /
+# JODIE_DISPOSABLE_DOMAINS environment variables, each naming a one-domain-per-line file.
+EMAIL_DOMAINS = DomainClassifier({
+    "gmail.com": WEBMAIL, "googlemail.com": WEBMAIL, "aol.com": WEBMAIL, "yahoo.com": WEBMAIL,
+    "hotmail.co.uk": WEBMAIL, "hotmail.com": WEBMAIL, "hotmail.de": WEBMAIL, "hotmail.es": WEBMAIL,
+    "hotmail.fr": WEBMAIL, "hotmail.it": WEBMAIL, "hushmail.com": WEBMAIL, "protonmail.com": WEBMAIL,
+    "hey.com": WEBMAIL, "icloud.com": WEBMAIL, "mac.com": WEBMAIL, "qq.com": WEBMAIL, "tuta.com": WEBMAIL,
+    "tutanota.com": WEBMAIL, "verizon.net": WEBMAIL, "ymail.com": WEBMAIL,
+    "edu": EDUCATION,
+})
+
+# Website hosts with a well-known label
+WEBSITE_DOMAINS = DomainClassifier({
+    # Common professional/social networks
+    'linkedin.com': 'LinkedIn',
+    'github.com': 'GitHub',
+    'twitter.com': 'Twitter',
+    'instagram.com': 'Instagram',
+    'facebook.com': 'Facebook',
+    # Common calendar/scheduling domains
+    'calendly.com': 'Calendar',
+    'meet.google.com': 'Calendar',
+    'zoom.us': 'Calendar',
+})
+
+for _variable, _category in (('JODIE_WEBMAIL_DOMAINS', WEBMAIL), ('JODIE_DISPOSABLE_DOMAINS', DISPOSABLE)):
+    if os.environ.get(_variable):
+        EMAIL_DOMAINS.load(os.environ[_variable], _category)
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# jodie/contact/fuzzy.py
+import os
+import re
+import time
+from functools import partial
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from jodie.contact.dedup import merge_records, normalize_email, normalize_phone
+from jodie.contact.domains import DISPOSABLE, EMAIL_DOMAINS, WEBMAIL
+
+# Pairs scoring at least this much are proposed as duplicates
+DEFAULT_THRESHOLD = 0.85
+
+# Blocks larger than this are split by first initial, and skipped if still too large
+MAX_BLOCK = 1000
+
+# Score weights for first name, last name, email local part and shared organization
+WEIGHTS = (0.45, 0.35, 0.1, 0.1)
+
+# Words that say nothing about which company a contact works for
+COMPANY_STOPWORDS = frozenset((
+    'the', 'a', 'an', 'and', 'of', 'inc', 'llc', 'ltd', 'co', 'corp', 'corporation',
+    'company', 'group', 'gmbh', 'plc', 'sa', 'ag', 'limited', 'holdings',
+))
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'), 'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+BlockKey = Tuple[str, ...]
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def soundex(name: Optional[str]) -> Optional[str]:
+    """
+    American Soundex code of a name, e.g. "Smith" and "Smyth" -> "S530".
+
+    :param name: A name. Non-letters are ignored.
+    :return: A four character code, or None if the name has no letters.
+    """
+    letters = [ch for ch in (name or "").lower() if 'a' <= ch <= 'z']
+    if not letters:
+        return None
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0])
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch)
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def normalize_words(text: Optional[str]) -> str:
+    """Casefold text, drop punctuation and collapse whitespace, e.g. "O'Neil  Jr." -> "oneil jr"."""
+    return " ".join(_NON_WORD.sub("", (text or "").casefold()).split())
+
+
+def company_token(company: Optional[str]) -> Optional[str]:
+    """The first distinctive word of a company name, e.g. "The Acme Co." -> "acme"."""
+    for word in normalize_words(company).split():
+        if word not in COMPANY_STOPWORDS:
+            return word
+    return None
+
+
+def bigrams(text: str) -> FrozenSet[str]:
+    """The set of character pairs in text padded with spaces, e.g. "ann" -> {" a", "an", "nn", "n "}."""
+    padded = f" {text} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1)) if text else frozenset()
+
+
+def dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Dice coefficient of two bigram sets: 1 for identical strings, 0 for nothing in common."""
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+class Features(NamedTuple):
+    """The normalized fields of a record that fuzzy matching looks at, with bigrams of the names."""
+    first: str
+    last: str
+    local: str
+    domain: str
+    phone: str
+    company: str
+    first_grams: FrozenSet[str]
+    last_grams: FrozenSet[str]
+    local_grams: FrozenSet[str]
+
+
+def features(record: Dict[str, Any]) -> Features:
+    """Normalize a record's fields for scoring."""
+    local, _, domain = (normalize_email(record.get('email')) or "").partition('@')
+    if EMAIL_DOMAINS.lookup(domain) in (WEBMAIL, DISPOSABLE):
+        # Everyone at gmail.com does not work together
+        domain = ""
+    first = normalize_words(record.get('first_name'))
+    last = normalize_words(record.get('last_name'))
+    local = "".join(ch for ch in local.split('+')[0] if ch.isalnum())
+    return Features(
+        first=first,
+        last=last,
+        local=local,
+        domain=domain,
+        phone=normalize_phone(record.get('phone')) or "",
+        company=company_token(record.get('company')) or "",
+        first_grams=bigrams(first),
+        last_grams=bigrams(last),
+        local_grams=bigrams(local),
+    )
+
+
+def blocking_keys(record: Features) -> List[BlockKey]:
+    """
+    Keys of the blocks a record is compared within: its email domain, the Soundex code
+    of its last name, and its company name. Only records sharing a key are compared.
+    """
+    keys = []
+    if record.domain:
+        keys.append(('domain', record.domain))
+    surname = soundex(record.last)
+    if surname:
+        keys.append(('surname', surname))
+    if record.company:
+        keys.append(('company', record.company))
+    return keys
+
+
+def score(a: Features, b: Features) -> float:
+    """
+    Similarity of two records between 0 and 1.
+
+    The same email address or phone number scores 1. Otherwise the bigram similarity of first
+    and last names and of the email local part, and a shared work domain or company, are weighted
+    by WEIGHTS. A first name that starts the other ("Jon" / "Jonathan", "J" / "Jane") counts as 0.9.
+
+    :param a: Features of one record.
+    :param b: Features of the other.
+    :return: The similarity score.
+    """
+    if (a.phone and a.phone == b.phone) or (a.local and a.domain and (a.local, a.domain) == (b.local, b.domain)):
+        return 1.0
+    w_first, w_last, w_local, w_org = WEIGHTS
+    if a.first != b.first and a.first and b.first and (a.first.startswith(b.first) or b.first.startswith(a.first)):
+        first = 0.9
+    else:
+        first = dice(a.first_grams, b.first_grams)
+    org = (a.domain and a.domain == b.domain) or (a.company and a.company == b.company)
+    return (w_first * first + w_last * dice(a.last_grams, b.last_grams)
+            + w_local * dice(a.local_grams, b.local_grams) + (w_org if org else 0.0))
+
+
+Block = Tuple[BlockKey, List[Tuple[int, Features, Tuple[BlockKey, ...]]]]
+
+
+def compare_blocks(blocks: Sequence[Block], threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[Tuple[int, int, float]], int]:
+    """
+    Score every pair of records within each block. Runs in worker processes.
+
+    A pair sharing several blocks is only scored in the block with the smallest key.
+
+    :param blocks: (key, [(record index, features, the record's block keys), ...]) pairs.
+    :param threshold: Minimum score of a reported match.
+    :return: The matching (index, index, score) triples and the number of pairs compared.
+    """
+    matches = []
+    compared = 0
+    for key, members in blocks:
+        for (i, a, keys_a), (j, b, keys_b) in combinations(members, 2):
+            # Keys are sorted, so this is the smallest key the pair shares
+            if next(k for k in keys_a if k in keys_b) != key:
+                continue
+            compared += 1
+            similarity = score(a, b)
+            if similarity >= threshold:
+                matches.append((i, j, similarity))
+    return matches, compared
+
+
+class UnionFind:
+    """Disjoint sets over the integers 0..size-1, with path halving and union by size."""
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+    def groups(self) -> List[List[int]]:
+        """Every set with more than one member, each sorted, in order of their smallest member."""
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+class DedupeResult(NamedTuple):
+    """Clusters of likely duplicates found by `find_duplicates`, with the work it took."""
+    clusters: List[List[int]]
+    matches: List[Tuple[int, int, float]]
+    blocks: int
+    oversized: int
+    compared: int
+    seconds: float
+
+    @property
+    def pairs_per_second(self) -> float:
+        return self.compared / self.seconds if self.seconds else 0.0
+
+
+def build_blocks(records: Sequence[Features], max_block: int = MAX_BLOCK) -> Tuple[List[Block], int]:
+    """
+    Group records by blocking key. Blocks over `max_block` records are split by first initial,
+    and dropped if a part is still too large.
+
+    :return: The blocks with at least two records, and the number of records left out of a block that was too large.
+    """
+    members: Dict[BlockKey, List[int]] = {}
+    record_keys: List[List[BlockKey]] = []
+    for index, record in enumerate(records):
+        keys = blocking_keys(record)
+        record_keys.append(keys)
+        for key in keys:
+            members.setdefault(key, []).append(index)
+
+    skipped = set()
+    for key in [key for key, indices in members.items() if len(indices) > max_block]:
+        split: Dict[BlockKey, List[int]] = {}
+        for index in members.pop(key):
+            record_keys[index].remove(key)
+            split.setdefault(key + (records[index].first[:1],), []).append(index)
+        for sub_key, indices in split.items():
+            if len(indices) > max_block:
+                skipped.update(indices)
+                continue
+            members[sub_key] = indices
+            for index in indices:
+                record_keys[index].append(sub_key)
+
+    keys = [tuple(sorted(keys)) for keys in record_keys]
+    blocks = [(key, [(index, records[index], keys[index]) for index in indices])
+              for key, indices in members.items() if len(indices) > 1]
+    return blocks, len(skipped)
+
+
+def _chunks(blocks: List[Block], count: int) -> List[List[Block]]:
+    # Deal blocks out largest first so each worker gets a similar number of pairs
+    chunks: List[List[Block]] = [[] for _ in range(count)]
+    loads = [0] * count
+    for block in sorted(blocks, key=lambda block: len(block[1]), reverse=True):
+        smallest = loads.index(min(loads))
+        chunks[smallest].append(block)
+        loads[smallest] += len(block[1]) * (len(block[1]) - 1) // 2
+    return [chunk for chunk in chunks if chunk]
+
+
+def find_duplicates(records: Iterable[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD,
+                    jobs: Optional[int] = None, max_block: int = MAX_BLOCK) -> DedupeResult:
+    """
+    Find clusters of records that probably describe the same person.
+
+    Records are grouped into blocks (see `blocking_keys`) and only pairs within a block are scored,
+    across a pool of `jobs` processes. Matching pairs are joined into clusters with union-find,
+    so if A matches B and B matches C all three end up together.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        threshold (float): Minimum pair score, see `score`.
+        jobs (int, optional): Worker processes. Defaults to the number of CPUs; 1 runs in-process.
+        max_block (int): Largest block compared in full.
+
+    Returns:
+        DedupeResult: Clusters as lists of positions in `records`, plus counts and timings.
+    """
+    started = time.perf_counter()
+    prepared = [features(record) for record in records]
+    blocks, oversized = build_blocks(prepared, max_block)
+    jobs = jobs or os.cpu_count() or 1
+    compare = partial(compare_blocks, threshold=threshold)
+
+    if jobs == 1 or len(blocks) < 2:
+        results = [compare(blocks)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(compare, _chunks(blocks, jobs * 4)))
+
+    matches = [match for found, _ in results for match in found]
+    clusters = UnionFind(len(prepared))
+    for i, j, _ in matches:
+        clusters.union(i, j)
+    return DedupeResult(
+        clusters=clusters.groups(),
+        matches=matches,
+        blocks=len(blocks),
+        oversized=oversized,
+        compared=sum(compared for _, compared in results),
+        seconds=time.perf_counter() - started,
+    )
+
+
+def merge_proposals(records: Sequence[Dict[str, Any]], result: DedupeResult) -> Iterator[dict]:
+    """
+    Describe each cluster as a proposed merge.
+
+    :param records: The records passed to `find_duplicates`.
+    :param result: Its result.
+    :return: An iterator of {"identifiers", "score", "merged"} dicts. "score" is the weakest
+        match that joined the cluster and "merged" folds the cluster into its first record.
+    """
+    members = {index: number for number, cluster in enumerate(result.clusters) for index in cluster}
+    weakest: Dict[int, float] = {}
+    for i, _, similarity in result.matches:
+        number = members[i]
+        weakest[number] = min(weakest.get(number, similarity), similarity)
+    for number, cluster in enumerate(result.clusters):
+        merged = records[cluster[0]]
+        for index in cluster[1:]:
+            merged = merge_records(merged, records[index])
+        yield {
+            "identifiers": [records[index].get('identifier') for index in cluster],
+            "score": round(weakest[number], 3),
+            "merged": merged,
+        }
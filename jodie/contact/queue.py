@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# jodie/contact/queue.py
+import asyncio
+import random
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
+
+from jodie.contact.store import ContactStore, as_record, get_store
+from jodie.metrics import counter
+
+# Errors worth retrying: a locked or busy database, a dropped connection, a timeout.
+# Of sqlite3.OperationalError, only the locked / busy cases are retried, see `is_transient`.
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (sqlite3.OperationalError, ConnectionError, TimeoutError)
+
+# Primary result codes of a database held by another connection: SQLITE_BUSY and SQLITE_LOCKED
+SQLITE_BUSY_CODES = (5, 6)
+
+# A store spec for `get_store`, or a function that opens a store
+StoreOpener = Union[None, str, Callable[[], ContactStore]]
+
+Pending = Tuple[Any, asyncio.Future]
+
+SAVE_RETRIES = counter("jodie_save_retries_total", "Batches retried by SaveQueue after a transient error.")
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a commit that raised `error` may succeed if tried again. A sqlite3.OperationalError is
+    transient only when the database is locked or busy, not for e.g. "no such table" or a disk I/O error.
+
+    Args:
+        error: An instance of one of the `retry_on` types.
+
+    Returns:
+        bool: True if the batch should be retried.
+    """
+    if isinstance(error, sqlite3.OperationalError):
+        code = getattr(error, 'sqlite_errorcode', None)
+        if code is not None:
+            return code & 0xFF in SQLITE_BUSY_CODES
+        message = str(error).lower()
+        return 'locked' in message or 'busy' in message
+    return True
+
+
+class SaveQueue:
+    """
+    Asynchronous, batching front end for a `ContactStore`.
+
+    Producers `put` contacts and get a future back for each one, which resolves to the saved
+    contact's identifier or to the error that stopped it from being saved. Contacts are committed
+    in batches of up to `batch_size`, waiting at most `linger` seconds for a batch to fill.
+
+    - Backpressure: `put` waits while `max_pending` contacts are queued and not yet saved.
+    - Retries: batches that fail with one of `retry_on` are retried up to `retries` times, with
+      exponential backoff and jitter.
+    - Isolation: if a batch fails with any other error, its contacts are saved one by one, so only
+      the contacts that cause the error fail.
+
+    The store is opened, used and closed on one worker thread (sqlite3 connections cannot be shared
+    between threads), so the event loop never waits on store latency.
+
+        async with SaveQueue("sqlite", batch_size=500) as queue:
+            futures = [await queue.put(record) for record in records]
+        identifiers = [future.result() for future in futures if not future.exception()]
+    """
+
+    def __init__(self, store: StoreOpener = None, batch_size: int = 500, linger: float = 0.05,
+                 max_pending: int = 10000, retries: int = 3, backoff: float = 0.1,
+                 max_backoff: float = 5.0,
+                 retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS) -> None:
+        """
+        Args:
+            store: A store spec for `get_store`, or a function returning an open store.
+                Defaults to $JODIE_STORE or Contacts.app.
+            batch_size (int): Maximum number of contacts per store commit.
+            linger (float): Seconds to wait for more contacts before committing a partial batch.
+            max_pending (int): Queued contacts above which `put` waits.
+            retries (int): Retries of a batch that fails with a transient error.
+            backoff (float): Seconds before the first retry; doubled for each further retry.
+            max_backoff (float): Longest wait between retries, in seconds.
+            retry_on (tuple): Exception types treated as transient, narrowed by `is_transient`.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self.store_opener = store
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_pending = max_pending
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.store: Optional[ContactStore] = None
+        self.saved = self.failed = self.commits = self.retried = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jodie-store')
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open_store(self) -> ContactStore:
+        if callable(self.store_opener):
+            return self.store_opener()
+        return get_store(self.store_opener)
+
+    async def start(self) -> 'SaveQueue':
+        """Open the store and start saving. Called by `async with`."""
+        if self._worker is None:
+            self.store = await self._run(self._open_store)
+            self._queue = asyncio.Queue(self.max_pending)
+            self._worker = asyncio.create_task(self._save_batches())
+        return self
+
+    def _future(self, contact: Any) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            # Invalid contacts fail on their own rather than taking a whole batch with them
+            if hasattr(contact, 'validate'):
+                contact.validate()
+            else:
+                as_record(contact)
+        except ValueError as e:
+            self.failed += 1
+            future.set_exception(e)
+        return future
+
+    async def put(self, contact: Any) -> asyncio.Future:
+        """
+        Queue a contact to be saved, waiting while the queue is full.
+
+        Args:
+            contact: A `ContactRecord`, `Contact` or record mapping.
+
+        Returns:
+            asyncio.Future: Resolves to the saved contact's identifier, or raises why it was not saved.
+        """
+        future = self._future(contact)
+        if not future.done():
+            await self._queue.put((contact, future))
+        return future
+
+    def put_nowait(self, contact: Any) -> asyncio.Future:
+        """
+        Like `put`, but never waits.
+
+        Raises:
+            asyncio.QueueFull: If `max_pending` contacts are already queued.
+        """
+        future = self._future(contact)
+        if not future.done():
+            self._queue.put_nowait((contact, future))
+        return future
+
+    async def save(self, contact: Any) -> str:
+        """Queue a contact and wait until it is saved. Returns its identifier."""
+        return await (await self.put(contact))
+
+    async def flush(self) -> None:
+        """Wait until every queued contact has been saved or has failed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Save everything still queued, then close the store."""
+        if self._worker is not None:
+            await self.flush()
+            self._worker.cancel()
+            self._worker = None
+        if self.store is not None:
+            await self._run(self.store.close)
+            self.store = None
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'SaveQueue':
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _next_batch(self) -> List[Pending]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _save_batches(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._commit(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _delay(self, attempt: int) -> float:
+        return min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    async def _commit(self, batch: List[Pending]) -> None:
+        """Save one batch, retrying transient errors and isolating the contacts behind other errors."""
+        attempt = 0
+        while True:
+            try:
+                identifiers = await self._run(self.store.save_many, [contact for contact, _ in batch])
+            except Exception as e:
+                if isinstance(e, self.retry_on) and is_transient(e):
+                    if attempt >= self.retries:
+                        return self._fail(batch, e)
+                    self.retried += 1
+                    SAVE_RETRIES.inc()
+                    await asyncio.sleep(self._delay(attempt))
+                    attempt += 1
+                    continue
+                if len(batch) == 1:
+                    return self._fail(batch, e)
+                for pending in batch:
+                    await self._commit([pending])
+                return
+            else:
+                self.commits += 1
+                self.saved += len(batch)
+                for (_, future), identifier in zip(batch, identifiers):
+                    if not future.done():
+                        future.set_result(identifier)
+                return
+
+    def _fail(self, batch: List[Pending], error: BaseException) -> None:
+        self.failed += len(batch)
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
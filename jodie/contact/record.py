@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# jodie/contact/record.py
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple, Union
+
+from jodie.contact.contact import Contact, get_label_for_website
+from jodie.contact.store import CONTACTS_INVALID, REQUIRED_FIELDS, ContactStore, get_store
+from jodie.trace import traced
+
+_today: Tuple[Optional[date], str] = (None, "")
+
+
+def today() -> str:
+    """Today's date as "YYYY-MM-DD". Records created on the same day share one string object."""
+    global _today
+    current = date.today()
+    if _today[0] != current:
+        _today = (current, current.strftime('%Y-%m-%d'))
+    return _today[1]
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    # Empty or whitespace-only values are treated as None, as in Contact
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+class Website(NamedTuple):
+    """A labeled URL, e.g. Website("LinkedIn", "https://linkedin.com/in/jdoe")."""
+    label: str
+    url: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"label": self.label, "url": self.url}
+
+
+class ContactRecord:
+    """
+    Pure-Python contact with the same fields, cleaning and website labels as `Contact`.
+
+    Records only hold strings and tuples in `__slots__`, so they are cheap to create and keep by the
+    million on any platform. Use them for parsing, importing, deduplicating and serializing; the
+    Objective-C objects Contacts.app needs are only built by `to_contact`, when a store saves them.
+    """
+
+    __slots__ = ('first_name', 'last_name', 'email', 'phone', 'job_title', 'company',
+                 'websites', 'note', 'created_date', 'identifier')
+
+    @traced("ContactRecord.__init__")
+    def __init__(
+        self,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        job_title: Optional[str] = None,
+        company: Optional[str] = None,
+        websites: Optional[Union[str, Iterable[Union[str, Mapping[str, str], Website]]]] = None,
+        note: Optional[str] = None,
+        created_date: Optional[str] = None,
+        identifier: Optional[str] = None
+    ) -> None:
+        """
+        Args:
+            first_name: First name of the contact
+            last_name: Last name of the contact
+            email: Email address of the contact, stored lowercase
+            phone: Phone number of the contact
+            job_title: Job title of the contact
+            company: Company name of the contact
+            websites: A URL, or a list of URLs, {"label", "url"} dicts or Website tuples.
+                URLs without a label are labeled with `get_label_for_website`.
+            note: Additional notes for the contact
+            created_date: "YYYY-MM-DD". Defaults to today.
+            identifier: The identifier of a saved contact, if this record came from a store.
+        """
+        self.first_name = _clean(first_name)
+        self.last_name = _clean(last_name)
+        email = _clean(email)
+        self.email = email.lower() if email else None
+        self.phone = _clean(phone)
+        self.job_title = _clean(job_title)
+        self.company = _clean(company)
+        self.websites = self._label_websites(websites)
+        self.note = _clean(note)
+        self.created_date = created_date or today()
+        self.identifier = identifier
+
+    def _label_websites(self, websites: Any) -> Tuple[Website, ...]:
+        if not websites:
+            return ()
+        if isinstance(websites, str):
+            websites = [websites]
+        labeled = []
+        for site in websites:
+            if isinstance(site, str):
+                url, label = site, None
+            elif isinstance(site, Website):
+                url, label = site.url, site.label
+            else:
+                url, label = site["url"], site.get("label")
+            url = url.strip().lower()
+            labeled.append(Website(label or get_label_for_website(url, self.email, self.company), url))
+        return tuple(labeled)
+
+    @classmethod
+    def from_dict(cls, record: Mapping[str, Any]) -> 'ContactRecord':
+        """Build a record from a dict shaped like `Contact.tojson()`, optionally with an "identifier"."""
+        return cls(**{field: record.get(field) for field in cls.__slots__})
+
+    @classmethod
+    def from_contact(cls, contact: Contact) -> 'ContactRecord':
+        """Copy the fields of a Contacts.app-backed Contact."""
+        return cls.from_dict(contact.tojson())
+
+    def validate(self) -> None:
+        """
+        Check that the fields Contacts.app requires are set.
+
+        Raises:
+            ValueError: If required fields (first name, last name, email) are missing
+        """
+        if not all(getattr(self, field) for field in REQUIRED_FIELDS):
+            CONTACTS_INVALID.inc()
+            raise ValueError(
+                "Missing required fields. First name, last name, and email are required.")
+
+    @traced("ContactRecord.save")
+    def save(self, store: Optional[ContactStore] = None) -> 'ContactRecord':
+        """
+        Validate required fields and save the record.
+
+        Args:
+            store: Where to save the contact. Defaults to `get_store()`, i.e. $JODIE_STORE or Contacts.app.
+
+        Returns:
+            ContactRecord: This record, with `identifier` set to the saved contact's identifier.
+        """
+        self.validate()
+        if store is None:
+            store = get_store()
+        self.identifier = store.save_many([self])[0]
+        return self
+
+    def to_contact(self) -> Contact:
+        """Build the Contacts.app-backed Contact for this record. Needs macOS and PyObjC."""
+        contact = Contact(
+            first_name=self.first_name,
+            last_name=self.last_name,
+            email=self.email,
+            phone=self.phone,
+            job_title=self.job_title,
+            company=self.company,
+            websites=[site.to_dict() for site in self.websites],
+            note=self.note,
+        )
+        contact._created_date = datetime.strptime(self.created_date, '%Y-%m-%d')
+        contact._set_creation_date()
+        return contact
+
+    def tojson(self) -> dict:
+        """
+        Return a JSON-serializable dictionary, shaped like `Contact.tojson()`.
+        "identifier" is included only if the record has one.
+        """
+        record = {
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'email': self.email,
+            'phone': self.phone,
+            'job_title': self.job_title,
+            'company': self.company,
+            'websites': [site.to_dict() for site in self.websites] or None,
+            'note': self.note,
+            'created_date': self.created_date,
+        }
+        if self.identifier:
+            record['identifier'] = self.identifier
+        return record
+
+    def get_website(self, label: str) -> Optional[str]:
+        """Get a specific website by its label."""
+        for site in self.websites:
+            if site.label == label:
+                return site.url
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContactRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        """String representation of the contact, in the same format as `Contact`."""
+        name = " ".join(part for part in (self.first_name, self.last_name) if part)
+        websites = ", ".join(f"{site.label}: {site.url}" for site in self.websites)
+        return ", ".join((
+            f"Contact: {name or 'Unknown'}",
+            f"Email: {self.email}",
+            f"Phone: {self.phone}",
+            f"Job Title: {self.job_title}",
+            f"Company: {self.company}",
+            f"Websites: {websites or None}",
+        ))
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(first_name={self.first_name!r}, "
+                f"last_name={self.last_name!r}, email={self.email!r}, "
+                f"phone={self.phone!r}, job_title={self.job_title!r}, "
+                f"company={self.company!r}, websites={list(self.websites) or None})")
+
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# jodie/contact/store.py
+import json
+import os
+import sqlite3
+import time
+import uuid
+from functools import wraps
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional
+
+from jodie.metrics import BATCH_BUCKETS, counter, histogram
+from jodie.trace import traced
+
+# Fields every saved contact must have, matching Contact.validate()
+REQUIRED_FIELDS = ('first_name', 'last_name', 'email')
+
+# Fields of a stored record, in the shape returned by Contact.tojson()
+RECORD_FIELDS = (
+    'first_name', 'last_name', 'email', 'phone', 'job_title',
+    'company', 'websites', 'note', 'created_date'
+)
+
+# Directory for jodie's local data files
+DATA_DIR = os.path.join(os.path.expanduser('~'), '.jodie')
+DEFAULT_SQLITE_PATH = os.path.join(DATA_DIR, 'contacts.db')
+
+CONTACTS_SAVED = counter("jodie_contacts_saved_total", "Contacts written to a store.", ["store"])
+CONTACTS_INVALID = counter("jodie_contacts_invalid_total", "Contacts rejected for missing required fields.")
+SAVE_ERRORS = counter("jodie_save_errors_total", "Store commits that raised an error.", ["store"])
+SAVE_BATCH_SIZE = histogram("jodie_save_batch_size", "Contacts per store commit.", ["store"], BATCH_BUCKETS)
+COMMIT_SECONDS = histogram("jodie_store_commit_seconds", "Time taken by each store commit.", ["store"])
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Yield successive lists of at most `size` items from `iterable`.
+
+    Args:
+        iterable: Any iterable, consumed lazily.
+        size (int): Maximum number of items per batch.
+
+    Yields:
+        list: The next batch of items.
+    """
+    if size < 1:
+        raise ValueError("Batch size must be at least 1.")
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def metered(store: str) -> Callable[[Callable], Callable]:
+    """Decorator for `save_many` that counts each commit's contacts, batch size, latency and errors."""
+    def decorate(save_many: Callable) -> Callable:
+        @wraps(save_many)
+        def wrapper(self, contacts: List[Any]) -> List[str]:
+            started = time.perf_counter()
+            try:
+                identifiers = save_many(self, contacts)
+            except Exception:
+                SAVE_ERRORS.inc(store)
+                raise
+            COMMIT_SECONDS.observe(time.perf_counter() - started, store)
+            SAVE_BATCH_SIZE.observe(len(contacts), store)
+            CONTACTS_SAVED.inc(store, amount=len(identifiers))
+            return identifiers
+        return wrapper
+    return decorate
+
+
+def journaled(operation: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator for a store's `save_many` ("save") or `delete` ("delete") that records the change in the
+    journals of the store's `jodie find` and `jodie search` indexes, once a build has started.
+    """
+    def decorate(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, argument: Any) -> Any:
+            result = method(self, argument)
+            for path in (self.index_path, self.text_index_path):
+                if not path or not (os.path.exists(path) or os.path.exists(f"{path}.journal")):
+                    continue
+                from jodie.search.index import append_journal
+                if operation == "save":
+                    append_journal(path, saved=[{**as_record(contact), 'identifier': identifier}
+                                                for contact, identifier in zip(argument, result)])
+                elif result:
+                    append_journal(path, deleted=[argument])
+            return result
+        return wrapper
+    return decorate
+
+
+def as_record(contact: Any) -> dict:
+    """
+    Convert a Contact or a mapping of contact fields into a record dict.
+
+    Args:
+        contact: A `Contact`, or a mapping shaped like `Contact.tojson()`.
+
+    Returns:
+        dict: The record. Includes "identifier" only if the input had one.
+
+    Raises:
+        ValueError: If required fields (first name, last name, email) are missing
+    """
+    if isinstance(contact, Mapping):
+        if not all(contact.get(field) for field in REQUIRED_FIELDS):
+            CONTACTS_INVALID.inc()
+            raise ValueError(
+                "Missing required fields. First name, last name, and email are required.")
+        return dict(contact)
+    contact.validate()
+    return contact.tojson()
+
+
+class ContactStore:
+    """
+    Base class for the places a Contact can be saved to.
+    Subclasses commit a whole batch of contacts at once and return records
+    shaped like `Contact.tojson()` plus an "identifier" key.
+    """
+
+    # Where the store's `jodie find` and `jodie search` indexes are kept, or None to rebuild them in memory
+    # for each search
+    index_path: Optional[str] = None
+    text_index_path: Optional[str] = None
+
+    def save_many(self, contacts: List[Any]) -> List[str]:
+        """
+        Save a batch of contacts in a single commit.
+        This method should be implemented by subclasses.
+
+        Args:
+            contacts: `Contact` objects or record mappings.
+
+        Returns:
+            list: The identifiers of the saved contacts, in order.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def get(self, identifier: str) -> Optional[dict]:
+        """
+        Fetch one saved contact.
+        This method should be implemented by subclasses.
+
+        Args:
+            identifier (str): An identifier returned by `save_many`.
+
+        Returns:
+            dict: The record, or None if there is no such contact.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def iter_all(self) -> Iterator[dict]:
+        """
+        Iterate over every saved contact.
+        This method should be implemented by subclasses.
+
+        Yields:
+            dict: One record per contact.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete one saved contact.
+        This method should be implemented by subclasses.
+
+        Args:
+            identifier (str): An identifier returned by `save_many`.
+
+        Returns:
+            bool: True if a contact was deleted.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def save_all(self, contacts: Iterable[Any], batch_size: int = 500) -> int:
+        """
+        Save an iterable of contacts, committing once per `batch_size` contacts.
+
+        Args:
+            contacts: The contacts to save, consumed lazily.
+            batch_size (int): Number of contacts per commit.
+
+        Returns:
+            int: The total number of contacts saved.
+        """
+        saved = 0
+        for batch in batched(contacts, batch_size):
+            saved += len(self.save_many(batch))
+        return saved
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class ContactsAppStore(ContactStore):
+    """
+    Saves contacts to Contacts.app / Apple Address Book.
+    One CNContactStore is opened per store and one CNSaveRequest is executed per batch.
+    """
+
+    # Properties read back from Contacts.app. Notes need an entitlement jodie doesn't have.
+    KEYS_TO_FETCH = (
+        'givenName', 'familyName', 'emailAddresses', 'phoneNumbers',
+        'jobTitle', 'organizationName', 'urlAddresses', 'dates'
+    )
+
+    # Contacts fetched ahead of the consumer by `iter_all`
+    FETCH_QUEUE_SIZE = 1000
+
+    index_path = os.path.join(DATA_DIR, 'contacts.index')
+    text_index_path = os.path.join(DATA_DIR, 'contacts.text')
+
+    def __init__(self) -> None:
+        try:
+            from Contacts import CNContactStore
+        except ImportError:
+            raise ValueError(
+                "The Contacts.app store needs macOS with PyObjC installed; use --store sqlite:PATH instead.") from None
+        self.store = CNContactStore.alloc().init()
+
+    @staticmethod
+    def _to_record(cn_contact: Any) -> dict:
+        from jodie.contact.contact import Contact
+        record = Contact.from_cn_contact(cn_contact).tojson()
+        record['identifier'] = cn_contact.identifier()
+        return record
+
+    def _execute(self, request: Any) -> None:
+        success, error = self.store.executeSaveRequest_error_(request, None)
+        if not success:
+            raise Exception(f"Failed to save contacts: {error}")
+
+    @traced("ContactsAppStore.save_many")
+    @metered("contacts")
+    @journaled("save")
+    def save_many(self, contacts: List[Any]) -> List[str]:
+        from Contacts import CNSaveRequest
+        from jodie.contact.contact import Contact
+        from jodie.contact.record import ContactRecord
+
+        if not contacts:
+            return []
+        request = CNSaveRequest.alloc().init()
+        saved = []
+        for contact in contacts:
+            existing = None
+            if isinstance(contact, Mapping):
+                contact = ContactRecord.from_dict(as_record(contact))
+            if isinstance(contact, ContactRecord):
+                # The Objective-C objects are only built here, at save time
+                if contact.identifier:
+                    existing = self._fetch(contact.identifier, self.KEYS_TO_FETCH)
+                if existing is not None:
+                    # Update the saved contact in place
+                    record, contact = contact, Contact.from_cn_contact(existing)
+                    for key in RECORD_FIELDS[:6]:
+                        setattr(contact, key, getattr(record, key))
+                    contact.websites = [site.to_dict() for site in record.websites]
+                else:
+                    contact = contact.to_contact()
+            contact.validate()
+            if existing is not None:
+                request.updateContact_(contact.contact)
+            else:
+                request.addContact_toContainerWithIdentifier_(contact.contact, None)
+            saved.append(contact)
+
+        self._execute(request)
+        return [contact.contact.identifier() for contact in saved]
+
+    def _fetch(self, identifier: str, keys: Iterable[str] = ()) -> Any:
+        cn_contact, error = self.store.unifiedContactWithIdentifier_keysToFetch_error_(
+            identifier, list(keys), None)
+        return cn_contact
+
+    def get(self, identifier: str) -> Optional[dict]:
+        cn_contact = self._fetch(identifier, self.KEYS_TO_FETCH)
+        return self._to_record(cn_contact) if cn_contact else None
+
+    def iter_all(self) -> Iterator[dict]:
+        """
+        Iterate over every contact in Contacts.app.
+
+        Enumeration blocks until the whole book has been visited, so it runs on a worker thread
+        that hands contacts over through a queue of FETCH_QUEUE_SIZE. The worker waits while the
+        queue is full, so memory stays flat however large the book is, and stops the enumeration
+        if the caller stops iterating.
+        """
+        import queue
+        import threading
+        from Contacts import CNContactFetchRequest
+
+        contacts: queue.Queue = queue.Queue(self.FETCH_QUEUE_SIZE)
+        abandoned = threading.Event()
+        done = object()
+
+        def handle(cn_contact: Any, stop: Any) -> bool:
+            # `stop` is a BOOL * output argument, which PyObjC sets from the block's return value
+            while not abandoned.is_set():
+                try:
+                    contacts.put(cn_contact, timeout=0.1)
+                    return False
+                except queue.Full:
+                    continue
+            return True
+
+        def enumerate_contacts() -> None:
+            try:
+                request = CNContactFetchRequest.alloc().initWithKeysToFetch_(list(self.KEYS_TO_FETCH))
+                success, error = self.store.enumerateContactsWithFetchRequest_error_usingBlock_(
+                    request, None, handle)
+                result = done if success else Exception(f"Failed to fetch contacts: {error}")
+            except Exception as e:
+                result = e
+            while not abandoned.is_set():
+                try:
+                    contacts.put(result, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        worker = threading.Thread(target=enumerate_contacts, name="jodie-contacts-fetch", daemon=True)
+        worker.start()
+        try:
+            while True:
+                cn_contact = contacts.get()
+                if cn_contact is done:
+                    return
+                if isinstance(cn_contact, Exception):
+                    raise cn_contact
+                yield self._to_record(cn_contact)
+        finally:
+            # Makes the worker stop the enumeration if the caller stops early
+            abandoned.set()
+
+    @journaled("delete")
+    def delete(self, identifier: str) -> bool:
+        from Contacts import CNSaveRequest
+
+        cn_contact = self._fetch(identifier)
+        if not cn_contact:
+            return False
+        request = CNSaveRequest.alloc().init()
+        request.deleteContact_(cn_contact.mutableCopy())
+        self._execute(request)
+        return True
+
+
+class MemoryStore(ContactStore):
+    """
+    Keeps saved contacts in memory as JSON-serializable dictionaries.
+    Useful for dry runs, tests and benchmarking the import path.
+    """
+
+    def __init__(self) -> None:
+        self.records: dict = {}
+        self.commits: int = 0
+
+    @traced("MemoryStore.save_many")
+    @metered("memory")
+    def save_many(self, contacts: List[Any]) -> List[str]:
+        records = [as_record(contact) for contact in contacts]
+        identifiers = []
+        for record in records:
+            record['identifier'] = record.get('identifier') or uuid.uuid4().hex
+            self.records[record['identifier']] = record
+            identifiers.append(record['identifier'])
+        self.commits += 1
+        return identifiers
+
+    def get(self, identifier: str) -> Optional[dict]:
+        return self.records.get(identifier)
+
+    def iter_all(self) -> Iterator[dict]:
+        yield from list(self.records.values())
+
+    def delete(self, identifier: str) -> bool:
+        return self.records.pop(identifier, None) is not None
+
+
+class SQLiteStore(ContactStore):
+    """
+    Saves contacts to a local SQLite database.
+    The database runs in WAL mode, and each batch is one transaction written with `executemany`
+    through statements that sqlite3 prepares once and keeps in its statement cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (
+            identifier   TEXT PRIMARY KEY,
+            first_name   TEXT,
+            last_name    TEXT,
+            email        TEXT,
+            phone        TEXT,
+            job_title    TEXT,
+            company      TEXT,
+            websites     TEXT,
+            note         TEXT,
+            created_date TEXT
+        )
+    """
+    COLUMNS = ('identifier',) + RECORD_FIELDS
+    INSERT = (f"INSERT OR REPLACE INTO contacts ({', '.join(COLUMNS)}) "
+              f"VALUES ({', '.join('?' for _ in COLUMNS)})")
+    SELECT = f"SELECT {', '.join(COLUMNS)} FROM contacts"
+    SELECT_ONE = f"{SELECT} WHERE identifier = ?"
+    SELECT_ALL = f"{SELECT} ORDER BY rowid"
+    DELETE = "DELETE FROM contacts WHERE identifier = ?"
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, fetch_size: int = 1000) -> None:
+        """
+        Open (and create if needed) the database at `path`.
+
+        Args:
+            path (str): Database file, or ":memory:" for a throwaway database.
+            fetch_size (int): Rows fetched per round trip by `iter_all`.
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.index_path = None if path == ':memory:' else f"{path}.index"
+        self.text_index_path = None if path == ':memory:' else f"{path}.text"
+        self.fetch_size = fetch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(self.SCHEMA)
+        self.connection.commit()
+
+    def _to_row(self, record: dict) -> tuple:
+        websites = record.get('websites')
+        return (
+            record.get('identifier') or uuid.uuid4().hex,
+            *(record.get(field) for field in RECORD_FIELDS[:6]),
+            json.dumps(websites) if websites else None,
+            record.get('note'),
+            record.get('created_date'),
+        )
+
+    def _to_record(self, row: tuple) -> dict:
+        record = dict(zip(self.COLUMNS, row))
+        if record['websites']:
+            record['websites'] = json.loads(record['websites'])
+        return record
+
+    @traced("SQLiteStore.save_many")
+    @metered("sqlite")
+    @journaled("save")
+    def save_many(self, contacts: List[Any]) -> List[str]:
+        rows = [self._to_row(as_record(contact)) for contact in contacts]
+        with self.connection:
+            self.connection.executemany(self.INSERT, rows)
+        return [row[0] for row in rows]
+
+    def get(self, identifier: str) -> Optional[dict]:
+        row = self.connection.execute(self.SELECT_ONE, (identifier,)).fetchone()
+        return self._to_record(row) if row else None
+
+    def iter_all(self) -> Iterator[dict]:
+        cursor = self.connection.execute(self.SELECT_ALL)
+        while True:
+            rows = cursor.fetchmany(self.fetch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_record(row)
+
+    @journaled("delete")
+    def delete(self, identifier: str) -> bool:
+        with self.connection:
+            cursor = self.connection.execute(self.DELETE, (identifier,))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+STORES = {
+    "contacts": ContactsAppStore,
+    "memory": MemoryStore,
+    "sqlite": SQLiteStore,
+}
+
+
+def get_store(spec: Optional[str] = None) -> ContactStore:
+    """
+    Create a store from a spec such as "contacts", "memory", "sqlite" or "sqlite:/path/to/contacts.db".
+
+    Args:
+        spec (str, optional): Store name, optionally followed by ":" and a path.
+            Defaults to $JODIE_STORE, or "contacts" if that is unset.
+
+    Returns:
+        ContactStore: A new store instance.
+
+    Raises:
+        ValueError: If `spec` does not name a known store, or names one that can't run here,
+            such as "contacts" without macOS and PyObjC.
+    """
+    spec = spec or os.environ.get('JODIE_STORE') or 'contacts'
+    name, _, path = spec.partition(':')
+    try:
+        store_class = STORES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown store {name!r}. Choose one of: {', '.join(STORES)}.") from None
+    return store_class(path) if path else store_class()
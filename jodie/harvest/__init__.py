@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# jodie/harvest/__init__.py
+from jodie.harvest.archive import (
+    Message,
+    MessageReader,
+    iter_maildir,
+    iter_mbox,
+    iter_messages,
+    iter_new_messages
+)
+from jodie.harvest.signature import find_signature
+from jodie.harvest.harvest import (
+    collapse,
+    harvest,
+    harvest_message
+)
+
+__all__ = (
+    "Message",
+    "MessageReader",
+    "collapse",
+    "find_signature",
+    "harvest",
+    "harvest_message",
+    "iter_maildir",
+    "iter_mbox",
+    "iter_messages",
+    "iter_new_messages"
+)
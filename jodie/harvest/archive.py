@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# jodie/harvest/archive.py
+import mmap
+import os
+import re
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Dict, Iterator, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from jodie.io.checkpoint import Checkpoint
+
+# Maildir subdirectories that hold delivered messages
+MAILDIR_FOLDERS = ('cur', 'new')
+
+MESSAGE_ID = re.compile(rb"^message-id:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+
+class Message(NamedTuple):
+    """
+    Where one message lives: a byte range of an mbox file, or a whole Maildir file (end is None).
+    Locations are small and picklable, so they are what gets sent to worker processes.
+    """
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+
+
+def is_maildir(path: str) -> bool:
+    """Whether `path` is a Maildir, i.e. a directory with cur/ or new/ in it."""
+    return any(os.path.isdir(os.path.join(path, folder)) for folder in MAILDIR_FOLDERS)
+
+
+def map_file(path: str) -> Optional[mmap.mmap]:
+    """Memory-map a file read-only. Returns None for an empty file, which cannot be mapped."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+
+def iter_mbox(path: str, start: int = 0) -> Iterator[Message]:
+    """
+    Find the messages of an mbox file without reading them.
+    The file is memory-mapped and only searched for "From " separator lines.
+
+    Args:
+        path (str): Path to the mbox file.
+        start (int): Offset to start at; must be the start of a message.
+
+    Yields:
+        Message: The byte range of each message, including its "From " line.
+    """
+    mapped = map_file(path)
+    if mapped is None:
+        return
+    with mapped:
+        size = len(mapped)
+        if start == 0 and mapped[:5] != b"From ":
+            start = mapped.find(b"\nFrom ") + 1 or size
+        while start < size:
+            end = mapped.find(b"\nFrom ", start)
+            end = size if end < 0 else end + 1
+            yield Message(path, start, end)
+            start = end
+
+
+def iter_maildir(path: str) -> Iterator[Message]:
+    """Yield every message file of a Maildir, from cur/ then new/, in name order."""
+    for folder in MAILDIR_FOLDERS:
+        directory = os.path.join(path, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(entry.name for entry in os.scandir(directory) if entry.is_file()):
+            yield Message(os.path.join(directory, name))
+
+
+def iter_messages(path: str) -> Iterator[Message]:
+    """
+    Yield the messages of an mbox file or a Maildir directory.
+
+    Raises:
+        ValueError: If `path` is a directory that is not a Maildir.
+    """
+    if os.path.isdir(path):
+        if not is_maildir(path):
+            raise ValueError(f"{path!r} is a directory but not a Maildir (no cur/ or new/).")
+        return iter_maildir(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such mbox file or Maildir: {path!r}")
+    return iter_mbox(path)
+
+
+class MessageReader:
+    """
+    Reads the bytes of messages, keeping each mbox file mapped until `close`.
+    Use one reader per process; maps cannot be shared across processes.
+    """
+
+    def __init__(self) -> None:
+        self._maps: Dict[str, Optional[mmap.mmap]] = {}
+
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        if path not in self._maps:
+            self._maps[path] = map_file(path)
+        return self._maps[path]
+
+    def read(self, message: Message) -> bytes:
+        """Return the raw message, without the mbox "From " line."""
+        if message.end is None:
+            with open(message.path, 'rb') as f:
+                return f.read()
+        mapped = self._map(message.path)
+        if mapped is None:
+            return b""
+        data = mapped[message.start:message.end]
+        if data.startswith(b"From "):
+            data = data[data.find(b"\n") + 1:]
+        return data
+
+    def headers(self, message: Message) -> bytes:
+        """Return the header section of a message, reading no further than the first blank line."""
+        if message.end is None:
+            return self.read(message).split(b"\n\n", 1)[0]
+        mapped = self._map(message.path)
+        if mapped is None:
+            return b""
+        end = mapped.find(b"\n\n", message.start, message.end)
+        return mapped[message.start:message.end if end < 0 else end]
+
+    def key(self, message: Message) -> str:
+        """
+        A key that identifies a message across runs: the unique part of a Maildir file name (the flags
+        after ":" change when a message is read), else the Message-ID, else a hash of the message.
+        """
+        if message.end is None:
+            return "maildir:" + os.path.basename(message.path).split(':')[0]
+        match = MESSAGE_ID.search(self.headers(message))
+        if match:
+            return "message-id:" + match.group(1).decode('ascii', errors='replace')
+        return "blake2b:" + blake2b(self.read(message), digest_size=16).hexdigest()
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            if mapped is not None:
+                mapped.close()
+        self._maps.clear()
+
+    def __enter__(self) -> 'MessageReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_new_messages(path: str, checkpoint: 'Checkpoint') -> Iterator[Message]:
+    """
+    Yield the messages of an mbox file or Maildir that `checkpoint` has not seen, and remember them.
+
+    An mbox file that has not changed since the last run is skipped without being opened, and one
+    that has only been appended to is read from where the last run stopped. Maildir messages are
+    recognized by file name, so their contents are never read. Call `checkpoint.save()` once the
+    messages have been processed.
+    """
+    if os.path.isdir(path):
+        with MessageReader() as reader:
+            for message in iter_messages(path):
+                if checkpoint.add(reader.key(message)):
+                    yield message
+        return
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such mbox file or Maildir: {path!r}")
+    if checkpoint.unchanged(path):
+        return
+    start = end = checkpoint.resume_offset(path)
+    with MessageReader() as reader:
+        for message in iter_mbox(path, start):
+            end = message.end
+            if checkpoint.add(reader.key(message)):
+                yield message
+    checkpoint.mark_file(path, end)
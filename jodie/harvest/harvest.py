@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# jodie/harvest/harvest.py
+import re
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from email.message import Message as EmailMessage
+from email.utils import getaddresses
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jodie.contact.dedup import merge_records, normalize_email
+from jodie.contact.record import ContactRecord
+from jodie.harvest.archive import Message, MessageReader, iter_messages
+from jodie.harvest.signature import find_signature, signature_arguments
+from jodie.parsers import EmailParser, NameParser, parse_auto
+from jodie.parsers.parallel import map_chunks, warm_up
+
+# Messages sent to a worker at a time
+CHUNK_SIZE = 500
+
+# Senders that are not people; their Reply-To is used instead, if there is one
+AUTOMATED_SENDER = re.compile(
+    r"^(no-?reply|do-?not-?reply|mailer-daemon|postmaster|notifications?|bounces?|"
+    r"alerts?|newsletter|updates)([+.\-_].*)?@", re.IGNORECASE)
+
+# Fields a signature can add to what the headers say about the sender
+SIGNATURE_FIELDS = ('phone', 'job_title', 'company', 'websites')
+
+
+def header_text(value: Optional[str]) -> str:
+    """Decode RFC 2047 encoded words, e.g. "=?utf-8?q?Jos=C3=A9?=" -> "José"."""
+    if not value:
+        return ""
+    try:
+        return str(make_header(decode_header(value)))
+    except (LookupError, ValueError):
+        return value
+
+
+def sender(message: EmailMessage) -> Optional[Tuple[str, str]]:
+    """
+    Pick the person behind a message from its From and Reply-To headers.
+
+    :param message: A parsed email message.
+    :return: (display name, email address), or None if the sender is automated and has no Reply-To.
+    """
+    for header in ('From', 'Reply-To'):
+        for name, address in getaddresses([header_text(value) for value in message.get_all(header, [])]):
+            email = EmailParser.parse(address)
+            if email and not AUTOMATED_SENDER.match(email):
+                return name.strip().strip('"'), email
+    return None
+
+
+def body_text(message: EmailMessage) -> str:
+    """Return the first text/plain part of a message that is not an attachment, decoded."""
+    for part in message.walk():
+        if part.get_content_type() != 'text/plain' or part.get_filename():
+            continue
+        payload = part.get_payload(decode=True)
+        if not payload:
+            continue
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return payload.decode(charset, errors='replace')
+        except LookupError:
+            return payload.decode('utf-8', errors='replace')
+    return ""
+
+
+def harvest_message(data: bytes) -> Optional[dict]:
+    """
+    Build a contact from one raw message: name and email from the headers, the rest from the signature.
+
+    :param data: The raw RFC 5322 message.
+    :return: A record shaped like `ContactRecord.tojson()`, or None if the message has no human sender.
+    """
+    message = message_from_bytes(data)
+    found = sender(message)
+    if found is None:
+        return None
+    name, email = found
+    first_name, last_name = NameParser.parse(f"{name} <{email}>" if name else email)
+
+    signature = find_signature(body_text(message))
+    detected = parse_auto(signature_arguments(signature)) if signature else {}
+    if not (first_name or last_name) and detected.get('first_name'):
+        first_name, last_name = detected['first_name'], detected['last_name']
+
+    fields = {field: detected.get(field) for field in SIGNATURE_FIELDS}
+    return ContactRecord(first_name=first_name, last_name=last_name, email=email, **fields).tojson()
+
+
+def harvest_chunk(messages: List[Message]) -> List[Optional[dict]]:
+    """Read and harvest a chunk of messages, one result per message."""
+    with MessageReader() as reader:
+        return [harvest_message(reader.read(message)) for message in messages]
+
+
+def harvest(path: str, jobs: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+            messages: Optional[Iterable[Message]] = None) -> Iterator[Optional[dict]]:
+    """
+    Extract a contact from every message of an mbox file or Maildir, on a pool of worker processes.
+
+    Only message locations are sent to the workers; each worker maps the mbox file and parses the
+    messages itself, so the archive is never copied between processes.
+
+    Args:
+        path (str): Path to an mbox file or a Maildir directory.
+        jobs (int, optional): Worker processes. Defaults to the number of CPUs; 1 runs in-process.
+        chunk_size (int): Messages per task sent to a worker.
+        messages: The messages to harvest. Defaults to every message in `path`.
+
+    Yields:
+        dict or None: One result per message, in archive order; see `harvest_message`.
+    """
+    if messages is None:
+        messages = iter_messages(path)
+    yield from map_chunks(harvest_chunk, messages, jobs=jobs, chunk_size=chunk_size, initializer=warm_up)
+
+
+def collapse(records: Iterable[Optional[dict]]) -> List[dict]:
+    """
+    Merge records with the same email address, in first-seen order.
+    Later messages fill in fields that earlier ones were missing, e.g. a phone number from a signature.
+
+    :param records: Results of `harvest`; None entries are skipped.
+    :return: One record per email address.
+    """
+    people: Dict[str, dict] = {}
+    for record in records:
+        if not record:
+            continue
+        key = normalize_email(record['email'])
+        people[key] = merge_records(people[key], record) if key in people else record
+    return list(people.values())
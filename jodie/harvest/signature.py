@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# jodie/harvest/signature.py
+import re
+from typing import List
+
+from jodie.parsers import BaseParser, split_text
+from jodie.parsers.scanner import EMAIL, PHONE, TITLE, URL
+
+# Signature blocks longer than this are probably not signatures
+MAX_LINES = 8
+
+# Lines longer than this are prose, not signature lines
+MAX_LINE_LENGTH = 80
+
+# The RFC 3676 signature separator, "-- " on a line of its own
+DELIMITER = re.compile(r"^--\s?$")
+
+# Closings that usually come right before the sender's name
+VALEDICTION = re.compile(
+    r"^(best|best regards|best wishes|regards|kind regards|warm regards|warmly|many thanks|thanks|"
+    r"thank you|thanks again|cheers|sincerely|yours|yours truly|all the best|talk soon|thx|br)[\s,.!]*$",
+    re.IGNORECASE)
+
+# Where the quoted or forwarded part of a message starts
+QUOTE_START = re.compile(
+    r"^(>|On .+wrote:$|Le .+a écrit ?:$|Am .+schrieb .+:$|-{2,}\s*Original Message\s*-{2,}|"
+    r"-{2,}\s*Forwarded message\s*-{2,}|Begin forwarded message:|_{20,}$|From: .+)",
+    re.IGNORECASE)
+
+# Mobile client footers, e.g. "Sent from my iPhone"
+DEVICE_FOOTER = re.compile(r"^(sent from|get outlook for|sent via) ", re.IGNORECASE)
+
+# Span kinds that mark a line as contact details rather than prose
+SIGNAL_KINDS = (EMAIL, PHONE, TITLE, URL)
+
+
+def strip_quoted(body: str) -> List[str]:
+    """Return the lines the sender wrote, up to the first quoted or forwarded line, without trailing blanks."""
+    lines = []
+    for line in body.splitlines():
+        line = line.strip()
+        if QUOTE_START.match(line):
+            break
+        if DEVICE_FOOTER.match(line):
+            continue
+        lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _block(lines: List[str]) -> List[str]:
+    block = [line for line in lines if line]
+    if len(block) > MAX_LINES or any(len(line) > MAX_LINE_LENGTH for line in block):
+        return []
+    return block
+
+
+def find_signature(body: str) -> List[str]:
+    """
+    Find the signature block of a plain text message body.
+
+    In order of preference:
+    - the lines after a "-- " separator,
+    - the lines after a closing such as "Best," or "Thanks,",
+    - the last paragraph, if it is short and has an email, phone, website or job title in it.
+
+    :param body: The message body.
+    :return: The non-empty lines of the signature, or [] if none was found.
+    """
+    lines = strip_quoted(body)
+    for i in range(len(lines) - 1, max(-1, len(lines) - MAX_LINES - 3), -1):
+        if DELIMITER.match(lines[i]):
+            return _block(lines[i + 1:])
+    for i in range(len(lines) - 1, max(-1, len(lines) - MAX_LINES - 3), -1):
+        if VALEDICTION.match(lines[i]):
+            return _block(lines[i + 1:])
+
+    start = len(lines)
+    while start > 0 and lines[start - 1]:
+        start -= 1
+    block = _block(lines[start:])
+    if any(span.kind in SIGNAL_KINDS for line in block for span in BaseParser.scan(line)):
+        return block
+    return []
+
+
+def signature_arguments(lines: List[str]) -> List[str]:
+    """
+    Split signature lines into arguments for `parse_auto`, dropping bare labels such as "Mobile:"
+    and leftover punctuation such as "·".
+
+    :param lines: Lines returned by `find_signature`.
+    :return: A list of strings, one field each.
+    """
+    return [part for line in lines for part in split_text(line)
+            if not part.endswith(':') and any(ch.isalnum() for ch in part)]
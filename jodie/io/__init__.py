@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# jodie/io/__init__.py
+from jodie.io.checkpoint import (
+    Checkpoint,
+    iter_new_rows
+)
+from jodie.io.readers import (
+    detect_format,
+    iter_rows,
+    row_to_fields
+)
+from jodie.io.vcard import (
+    format_vcard,
+    iter_vcards,
+    write_vcards
+)
+from jodie.io.writers import (
+    iter_chunks,
+    write_csv_records,
+    write_ndjson_records,
+    write_parquet_records,
+    write_records
+)
+
+__all__ = (
+    "Checkpoint",
+    "detect_format",
+    "format_vcard",
+    "iter_chunks",
+    "iter_new_rows",
+    "iter_rows",
+    "iter_vcards",
+    "row_to_fields",
+    "write_csv_records",
+    "write_ndjson_records",
+    "write_parquet_records",
+    "write_records",
+    "write_vcards"
+)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# jodie/io/checkpoint.py
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterator, NamedTuple, Optional, Set
+
+MAGIC = b"JODIECK1"
+
+# magic, number of hashes, Bloom filter size in bits, Bloom filter hash count, length of the file table
+HEADER = struct.Struct('<8sQQQQ')
+
+# Bloom filter bits per remembered key; with BLOOM_HASHES hashes that is about 1% false positives
+BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+
+# Bytes before a resume offset whose hash must match for a file to count as appended to
+FINGERPRINT_BYTES = 4096
+
+# Hashes read or written at a time when rewriting the checkpoint
+BLOCK = 8192
+
+
+def key_hash(key: str) -> int:
+    """Hash a key, such as a Message-ID, to the 64-bit integer kept in a checkpoint."""
+    return int.from_bytes(blake2b(key.encode('utf-8', errors='surrogatepass'), digest_size=8).digest(), 'little')
+
+
+def _bloom_positions(value: int, bits: int) -> Iterator[int]:
+    # Double hashing: k positions from the two 32-bit halves of one 64-bit hash
+    low, high = value & 0xFFFFFFFF, value >> 32
+    for i in range(BLOOM_HASHES):
+        yield (low + i * high) % bits
+
+
+class FileState(NamedTuple):
+    """What a checkpoint knows about an input file: its size and mtime, and how far it was read."""
+    size: int
+    mtime_ns: int
+    offset: int
+    fingerprint: str
+
+
+def fingerprint(path: str, offset: int) -> str:
+    """Hash of the FINGERPRINT_BYTES before `offset`, to tell an appended-to file from a rewritten one."""
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - FINGERPRINT_BYTES))
+        return blake2b(f.read(min(offset, FINGERPRINT_BYTES)), digest_size=16).hexdigest()
+
+
+class Checkpoint:
+    """
+    A persistent record of what earlier harvest and import runs have already processed.
+
+    Keys (Message-IDs, Maildir file names, content hashes) are kept as 64-bit hashes in a sorted array,
+    behind a Bloom filter. The file is memory-mapped, not read: a key that was never seen is usually
+    rejected by the Bloom filter alone, and others cost one binary search over the mapped array.
+    Keys added during a run are held in memory until `save`, which merges them into a new file.
+
+    Per-file sizes, mtimes and read offsets let callers skip unchanged files without opening them, and
+    resume an appended-to mbox file where the last run stopped.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): The checkpoint file. It is created on the first `save` if it does not exist.
+        """
+        self.path = path
+        self.files: Dict[str, FileState] = {}
+        self.added: Set[int] = set()
+        self._map: Optional[mmap.mmap] = None
+        self._count = self._bloom_bits = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._bloom_bits, hashes, files_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or hashes != BLOOM_HASHES:
+            self.close()
+            raise ValueError(f"{self.path!r} is not a jodie checkpoint file.")
+        table = self._map[len(self._map) - files_length:]
+        self.files = {path: FileState(*state) for path, state in json.loads(table).items()}
+
+    @property
+    def _hashes_start(self) -> int:
+        return HEADER.size + self._bloom_bits // 8
+
+    def __len__(self) -> int:
+        return self._count + len(self.added)
+
+    def _saved(self, value: int) -> bool:
+        if not self._count:
+            return False
+        mapped = self._map
+        for position in _bloom_positions(value, self._bloom_bits):
+            if not mapped[HEADER.size + position // 8] & (1 << position % 8):
+                return False
+        low, high, start = 0, self._count, self._hashes_start
+        while low < high:
+            middle = (low + high) // 2
+            found = struct.unpack_from('<Q', mapped, start + middle * 8)[0]
+            if found == value:
+                return True
+            if found < value:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+    def __contains__(self, key: str) -> bool:
+        value = key_hash(key)
+        return value in self.added or self._saved(value)
+
+    def add(self, key: str) -> bool:
+        """
+        Remember a key.
+
+        Returns:
+            bool: True if the key is new, False if an earlier run or this one already processed it.
+        """
+        value = key_hash(key)
+        if value in self.added or self._saved(value):
+            return False
+        self.added.add(value)
+        return True
+
+    def file_state(self, path: str) -> Optional[FileState]:
+        return self.files.get(os.path.abspath(path))
+
+    def unchanged(self, path: str) -> bool:
+        """Whether `path` has the size and mtime it had when it was last read to the end."""
+        state = self.file_state(path)
+        if state is None:
+            return False
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns) == (state.size, state.mtime_ns) and state.offset == state.size
+
+    def resume_offset(self, path: str) -> int:
+        """
+        Where to start reading `path`: the end of the last run if the file has only been appended to
+        since, otherwise 0.
+        """
+        state = self.file_state(path)
+        if state is None or os.path.getsize(path) < state.offset:
+            return 0
+        return state.offset if fingerprint(path, state.offset) == state.fingerprint else 0
+
+    def mark_file(self, path: str, offset: Optional[int] = None) -> None:
+        """Record that `path` was read up to `offset` (default: to the end)."""
+        stat = os.stat(path)
+        offset = stat.st_size if offset is None else offset
+        self.files[os.path.abspath(path)] = FileState(stat.st_size, stat.st_mtime_ns, offset,
+                                                      fingerprint(path, offset))
+
+    def _iter_saved(self) -> Iterator[int]:
+        start = self._hashes_start
+        for first in range(0, self._count, BLOCK):
+            block = array('Q')
+            block.frombytes(self._map[start + first * 8:start + min(self._count, first + BLOCK) * 8])
+            if sys.byteorder == 'big':
+                block.byteswap()
+            yield from block
+
+    def save(self) -> None:
+        """Merge the keys added in this run into the checkpoint file, replacing it atomically."""
+        count = len(self)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'wb') as f:
+            if self._map is not None and not self.added:
+                # Only the file table changed: copy the Bloom filter and hashes as they are
+                end = self._hashes_start + self._count * 8
+                for first in range(0, end, BLOCK * 8):
+                    f.write(self._map[first:min(end, first + BLOCK * 8)])
+                bloom_bits, bloom = self._bloom_bits, None
+            else:
+                bloom_bits = max(64, count * BITS_PER_KEY + 7) // 8 * 8
+                bloom = bytearray(bloom_bits // 8)
+                f.seek(HEADER.size + len(bloom))
+                block = array('Q')
+                for value in heapq.merge(self._iter_saved(), sorted(self.added)):
+                    for position in _bloom_positions(value, bloom_bits):
+                        bloom[position // 8] |= 1 << position % 8
+                    block.append(value)
+                    if len(block) == BLOCK:
+                        self._write_block(f, block)
+                        block = array('Q')
+                self._write_block(f, block)
+            table = json.dumps({path: list(state) for path, state in self.files.items()}).encode('utf-8')
+            f.write(table)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, count, bloom_bits, BLOOM_HASHES, len(table)))
+            if bloom is not None:
+                f.write(bloom)
+        self.close()
+        os.replace(temporary, self.path)
+        self.added = set()
+        self._load()
+
+    @staticmethod
+    def _write_block(f, block: array) -> None:
+        if sys.byteorder == 'big':
+            block.byteswap()
+        f.write(block.tobytes())
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._count = self._bloom_bits = 0
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def row_key(fields: Dict[str, object]) -> str:
+    """A key for an input row: its fields, serialized in a stable order."""
+    return "row:" + json.dumps(fields, sort_keys=True, default=str)
+
+
+def iter_new_rows(path: str, fmt: Optional[str], checkpoint: Checkpoint) -> Iterator[Dict[str, object]]:
+    """
+    Like `iter_rows`, but skip rows that `checkpoint` has seen, and remember the new ones.
+    A file that has not changed since the last run is skipped without being opened.
+    Call `checkpoint.save()` once the rows have been processed.
+    """
+    from jodie.io.readers import iter_rows
+
+    if path != '-' and checkpoint.unchanged(path):
+        return
+    for fields in iter_rows(path, fmt):
+        if checkpoint.add(row_key(fields)):
+            yield fields
+    if path != '-':
+        checkpoint.mark_file(path)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# jodie/io/readers.py
+import csv
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from jodie.parsers import NameParser
+
+FORMATS = ('csv', 'ndjson', 'vcf')
+
+# File extensions that name a format differently
+EXTENSIONS = {'jsonl': 'ndjson', 'json': 'ndjson', 'vcard': 'vcf'}
+
+# Keyword arguments accepted by `jodie.contact.Contact`
+CONTACT_FIELDS = (
+    'first_name', 'last_name', 'email', 'phone',
+    'job_title', 'company', 'websites', 'note'
+)
+
+# Common column names in CRM / spreadsheet exports and the Contact field they map to
+FIELD_ALIASES = {
+    'first': 'first_name',
+    'firstname': 'first_name',
+    'given_name': 'first_name',
+    'last': 'last_name',
+    'lastname': 'last_name',
+    'family_name': 'last_name',
+    'surname': 'last_name',
+    'email_address': 'email',
+    'e_mail': 'email',
+    'mobile': 'phone',
+    'phone_number': 'phone',
+    'title': 'job_title',
+    'organization': 'company',
+    'organisation': 'company',
+    'org': 'company',
+    'website': 'websites',
+    'url': 'websites',
+    'urls': 'websites',
+    'notes': 'note',
+    'full_name': 'name',
+}
+
+
+def detect_format(path: str, fmt: Optional[str] = None,
+                  formats: Tuple[str, ...] = FORMATS, kind: str = "input") -> str:
+    """
+    Pick the file format from an explicit value or the file extension.
+
+    Args:
+        path (str): Path to the file, or "-" for stdin / stdout.
+        fmt (str, optional): Explicit format, one of `formats`.
+        formats (tuple): The formats to accept. Defaults to the input formats, `FORMATS`.
+        kind (str): "input" or "output", for the error message.
+
+    Returns:
+        str: The file format.
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred.
+    """
+    if not fmt:
+        ext = os.path.splitext(path)[1].lower().lstrip('.')
+        fmt = EXTENSIONS.get(ext, ext)
+    fmt = fmt.lower()
+    if fmt not in formats:
+        raise ValueError(
+            f"Unknown {kind} format {fmt!r} for {path!r}. Use one of: {', '.join(formats)}.")
+    return fmt
+
+
+def normalize_key(key: str) -> str:
+    """Map a column name such as "First Name" or "E-mail" to a Contact field name."""
+    key = key.strip().lower().replace('-', '_').replace(' ', '_')
+    return FIELD_ALIASES.get(key, key)
+
+
+def row_to_fields(row: Dict[str, object]) -> Dict[str, object]:
+    """
+    Convert one input row into keyword arguments for `Contact`.
+    - Column names are normalized with `normalize_key`.
+    - A "name" column is split with `NameParser` when first/last names are missing.
+    - A websites string is split on commas.
+    - Unknown columns are ignored.
+
+    :param row: A mapping of column name to value.
+    :return: A dict with a subset of `CONTACT_FIELDS` as keys.
+    """
+    fields = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        key = normalize_key(key)
+        if key in CONTACT_FIELDS or key == 'name':
+            fields[key] = value if isinstance(value, (str, list)) else str(value)
+
+    name = fields.pop('name', None)
+    if name and not (fields.get('first_name') or fields.get('last_name')):
+        fields['first_name'], fields['last_name'] = NameParser.parse(str(name))
+
+    websites = fields.get('websites')
+    if isinstance(websites, str):
+        fields['websites'] = [url.strip() for url in websites.split(',') if url.strip()]
+    return fields
+
+
+def iter_csv(stream: Iterable[str]) -> Iterator[Dict[str, object]]:
+    """Yield one dict per CSV row, using the header row as keys."""
+    yield from csv.DictReader(stream)
+
+
+def iter_ndjson(stream: Iterable[str]) -> Iterator[Dict[str, object]]:
+    """Yield one dict per non-empty line of newline-delimited JSON."""
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {lineno}: {e}") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"Expected a JSON object on line {lineno}.")
+        yield record
+
+
+READERS = {
+    'csv': iter_csv,
+    'ndjson': iter_ndjson,
+}
+
+
+def iter_rows(source: Union[str, Iterable[str]], fmt: Optional[str] = None) -> Iterator[Dict[str, object]]:
+    """
+    Stream Contact keyword arguments from a CSV, NDJSON or vCard file, one row at a time.
+
+    Args:
+        source: Path to the input file, "-" to read stdin, or an open text stream or iterable
+            of lines of CSV or NDJSON.
+        fmt (str, optional): Input format. Inferred from the extension of a path (or a stream's
+            `name`) if omitted; required for other iterables.
+
+    Yields:
+        dict: Keyword arguments for `Contact`, see `row_to_fields`.
+
+    Raises:
+        ValueError: If the format is unknown, or is vCard for a source that is not a path.
+    """
+    path = source if isinstance(source, str) else getattr(source, 'name', None)
+    if not isinstance(path, str):
+        if not fmt:
+            raise ValueError("The input format must be given when reading rows from a stream.")
+        path = '<stream>'
+    fmt = detect_format(path, fmt)
+    if not isinstance(source, str):
+        if fmt not in READERS:
+            raise ValueError(f"{fmt!r} input can only be read from a file path.")
+        for row in READERS[fmt](source):
+            yield row_to_fields(row)
+        return
+    if fmt == 'vcf':
+        # vCards are read through a memory map of the file rather than a text stream
+        from jodie.io.vcard import iter_vcards
+        yield from iter_vcards(path)
+        return
+    reader = READERS[fmt]
+    if path == '-':
+        for row in reader(sys.stdin):
+            yield row_to_fields(row)
+        return
+    with open(path, newline='', encoding='utf-8') as stream:
+        for row in reader(stream):
+            yield row_to_fields(row)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# jodie/io/vcard.py
+import mmap
+import sys
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jodie.contact.contact import HOMEPAGE_LABEL, get_label_for_email
+
+VERSIONS = ('3.0', '4.0')
+
+# Longest line written before folding, in octets, per RFC 6350 / RFC 2426
+FOLD_AT = 75
+
+# Label of the custom date Contact uses for its created date
+CREATED_LABEL = "created_date"
+
+# URL TYPE parameters and the Contacts.app label they stand for
+URL_TYPES = {"work": "Work", "home": HOMEPAGE_LABEL}
+
+Property = Tuple[Optional[str], str, Dict[str, List[str]], str]
+
+
+def iter_physical_lines(path: str) -> Iterator[bytes]:
+    """
+    Yield the lines of a file through a read-only memory map, or of stdin for "-".
+    Only the current line is copied out of the map, so memory use does not depend on the file size.
+    """
+    if path == '-':
+        yield from sys.stdin.buffer
+        return
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+        with mapped:
+            yield from iter(mapped.readline, b"")
+
+
+def unfold(lines: Iterable[bytes]) -> Iterator[str]:
+    """
+    Join folded lines: a line starting with a space or tab continues the previous one.
+
+    :param lines: Physical lines, with or without line endings.
+    :return: An iterator of logical lines, decoded as UTF-8.
+    """
+    parts: List[bytes] = []
+    for line in lines:
+        line = line.rstrip(b"\r\n")
+        if line[:1] in (b" ", b"\t") and parts:
+            parts.append(line[1:])
+            continue
+        if parts:
+            yield b"".join(parts).decode('utf-8', errors='replace')
+        parts = [line] if line else []
+    if parts:
+        yield b"".join(parts).decode('utf-8', errors='replace')
+
+
+def split_escaped(value: str, separator: str) -> List[str]:
+    """Split on `separator` where it is not escaped with a backslash, e.g. r"Doe\\;Jr;Jane" -> ["Doe\\;Jr", "Jane"]."""
+    parts, start, i = [], 0, 0
+    while i < len(value):
+        if value[i] == '\\':
+            i += 2
+            continue
+        if value[i] == separator:
+            parts.append(value[start:i])
+            start = i + 1
+        i += 1
+    parts.append(value[start:])
+    return parts
+
+
+def unescape(value: str) -> str:
+    """Undo vCard text escaping: \\n, \\, \\; and \\\\."""
+    if '\\' not in value:
+        return value
+    out, i = [], 0
+    while i < len(value):
+        ch = value[i]
+        if ch == '\\' and i + 1 < len(value):
+            following = value[i + 1]
+            out.append('\n' if following in 'nN' else following)
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def escape(value: str) -> str:
+    """Escape text for a vCard property value."""
+    return (value.replace('\\', '\\\\').replace(',', '\\,').replace(';', '\\;')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def parse_property(line: str) -> Optional[Property]:
+    """
+    Split a logical line such as "item1.EMAIL;TYPE=INTERNET,WORK:jane@acme.com".
+
+    :param line: One unfolded content line.
+    :return: (group, NAME, {PARAM: [values]}, raw value), or None if the line has no ":".
+    """
+    colon = line.find(':')
+    if colon < 0:
+        return None
+    if '"' in line[:colon]:
+        # A quoted parameter value may itself contain ":"
+        quoted = False
+        for colon, ch in enumerate(line):
+            if ch == '"':
+                quoted = not quoted
+            elif ch == ':' and not quoted:
+                break
+        else:
+            return None
+
+    head, value = line[:colon], line[colon + 1:]
+    name, *raw_params = head.split(';')
+    group, _, name = name.rpartition('.')
+    params: Dict[str, List[str]] = {}
+    for param in raw_params:
+        key, sep, values = param.partition('=')
+        if not sep:
+            # vCard 2.1 style bare type, e.g. "TEL;WORK:..."
+            key, values = 'TYPE', key
+        params.setdefault(key.upper(), []).extend(v.strip('"').lower() for v in values.split(','))
+    return group or None, name.upper(), params, value
+
+
+def iter_cards(lines: Iterable[str]) -> Iterator[List[Property]]:
+    """Group logical lines into the properties of each BEGIN:VCARD ... END:VCARD block."""
+    card: Optional[List[Property]] = None
+    for line in lines:
+        prop = parse_property(line)
+        if prop is None:
+            continue
+        name, value = prop[1], prop[3]
+        if name == 'BEGIN' and value.upper() == 'VCARD':
+            card = []
+        elif name == 'END' and value.upper() == 'VCARD':
+            if card is not None:
+                yield card
+            card = None
+        elif card is not None:
+            card.append(prop)
+
+
+def card_to_row(card: List[Property]) -> Dict[str, object]:
+    """
+    Convert the properties of one vCard into a row for `row_to_fields`.
+    Apple-style grouped labels ("item1.URL" with "item1.X-ABLabel") are kept as website labels.
+    """
+    labels = {group: unescape(value) for group, name, _, value in card if name == 'X-ABLABEL' and group}
+    row: Dict[str, object] = {}
+    websites = []
+    for group, name, params, value in card:
+        if name == 'N':
+            parts = [unescape(part) for part in split_escaped(value, ';')]
+            row.setdefault('last_name', parts[0])
+            row.setdefault('first_name', parts[1] if len(parts) > 1 else "")
+        elif name == 'FN':
+            row.setdefault('name', unescape(value))
+        elif name == 'EMAIL':
+            row.setdefault('email', unescape(value))
+        elif name == 'TEL':
+            row.setdefault('phone', unescape(value[4:] if value.lower().startswith('tel:') else value))
+        elif name == 'TITLE':
+            row.setdefault('job_title', unescape(value))
+        elif name == 'ORG':
+            row.setdefault('company', unescape(split_escaped(value, ';')[0]))
+        elif name == 'NOTE':
+            row.setdefault('note', unescape(value))
+        elif name == 'URL':
+            label = labels.get(group) or next(
+                (URL_TYPES[t] for t in params.get('TYPE', ()) if t in URL_TYPES), None)
+            websites.append({"label": label, "url": unescape(value)})
+        elif name == 'X-ABDATE' and labels.get(group) == CREATED_LABEL:
+            row['created_date'] = value[:10]
+    if websites:
+        row['websites'] = websites
+    return row
+
+
+def iter_vcards(path: str) -> Iterator[Dict[str, object]]:
+    """
+    Stream Contact keyword arguments from a vCard 3.0 or 4.0 file, one card at a time.
+
+    Args:
+        path (str): Path to a .vcf file, or "-" to read stdin.
+
+    Yields:
+        dict: Keyword arguments for `ContactRecord`, see `row_to_fields`.
+    """
+    from jodie.io.readers import row_to_fields
+
+    for card in iter_cards(unfold(iter_physical_lines(path))):
+        row = card_to_row(card)
+        fields = row_to_fields(row)
+        if row.get('created_date'):
+            fields['created_date'] = row['created_date']
+        yield fields
+
+
+def fold(line: str) -> str:
+    """Fold a content line into CRLF-terminated lines of at most FOLD_AT octets, never inside a character."""
+    if len(line) <= FOLD_AT // 4 or len(line.encode('utf-8')) <= FOLD_AT:
+        return line + "\r\n"
+    out, current, size = [], [], 0
+    for ch in line:
+        width = len(ch.encode('utf-8'))
+        if size + width > FOLD_AT:
+            out.append("".join(current))
+            # Continuation lines start with a space, which counts towards their length
+            current, size = [" "], 1
+        current.append(ch)
+        size += width
+    out.append("".join(current))
+    return "\r\n".join(out) + "\r\n"
+
+
+def format_vcard(record: Dict[str, object], version: str = '3.0') -> str:
+    """
+    Render one record as a vCard.
+
+    Args:
+        record (dict): A record shaped like `Contact.tojson()`, optionally with an "identifier".
+        version (str): "3.0" or "4.0".
+
+    Returns:
+        str: The vCard, folded and CRLF-terminated.
+    """
+    if version not in VERSIONS:
+        raise ValueError(f"Unknown vCard version {version!r}. Use one of: {', '.join(VERSIONS)}.")
+    first, last = record.get('first_name') or "", record.get('last_name') or ""
+    lines = ["BEGIN:VCARD", f"VERSION:{version}",
+             f"N:{escape(last)};{escape(first)};;;",
+             f"FN:{escape(' '.join(part for part in (first, last) if part))}"]
+    email = record.get('email')
+    if email:
+        kind = get_label_for_email(email)
+        lines.append(f"EMAIL;TYPE=INTERNET,{kind.upper()}:{email}" if version == '3.0'
+                     else f"EMAIL;TYPE={kind}:{email}")
+    if record.get('phone'):
+        lines.append(f"TEL;TYPE={'CELL' if version == '3.0' else 'cell'}:{escape(record['phone'])}")
+    if record.get('job_title'):
+        lines.append(f"TITLE:{escape(record['job_title'])}")
+    if record.get('company'):
+        lines.append(f"ORG:{escape(record['company'])}")
+
+    item = 0
+    for site in record.get('websites') or ():
+        item += 1
+        lines.append(f"item{item}.URL:{site['url']}")
+        if site.get('label'):
+            lines.append(f"item{item}.X-ABLabel:{escape(site['label'])}")
+    if record.get('note'):
+        lines.append(f"NOTE:{escape(record['note'])}")
+    if record.get('created_date'):
+        item += 1
+        lines.append(f"item{item}.X-ABDATE:{record['created_date']}")
+        lines.append(f"item{item}.X-ABLabel:{CREATED_LABEL}")
+    if record.get('identifier'):
+        lines.append(f"UID:{record['identifier']}")
+    lines.append("END:VCARD")
+    return "".join(fold(line) for line in lines)
+
+
+def write_vcards(records: Iterable[Dict[str, object]], stream: IO[str], version: str = '3.0') -> int:
+    """
+    Write records as vCards, one at a time, e.g. straight from `ContactStore.iter_all()`.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        stream: A text stream opened with newline="" so CRLF line endings are kept.
+        version (str): "3.0" or "4.0".
+
+    Returns:
+        int: The number of cards written.
+    """
+    count = 0
+    for record in records:
+        stream.write(format_vcard(record, version))
+        count += 1
+    return count
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# jodie/io/writers.py
+import csv
+import json
+import sys
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from jodie.io.readers import detect_format
+from jodie.io.vcard import write_vcards
+
+OUTPUT_FORMATS = ('csv', 'ndjson', 'parquet', 'vcf')
+
+# Formats written as bytes: their writers are given the path rather than a text stream
+BINARY_FORMATS = ('parquet',)
+
+# Columns written by the CSV and Parquet writers, in order
+EXPORT_COLUMNS = ('identifier', 'first_name', 'last_name', 'email', 'phone', 'job_title', 'company',
+                  'websites', 'note', 'created_date')
+WEBSITES = EXPORT_COLUMNS.index('websites')
+
+# Records converted and written at a time: large enough that per-write overhead vanishes,
+# small enough that memory stays flat however many contacts there are
+CHUNK_SIZE = 10000
+
+# Rows per Parquet row group
+ROW_GROUP_SIZE = 65536
+
+# Bytes buffered by output files between writes to disk
+BUFFER_SIZE = 1 << 20
+
+
+def iter_chunks(records: Iterable[Dict[str, Any]], size: int = CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Group records into lists of `size`, the last one shorter."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def website_urls(websites: Optional[Iterable[Any]]) -> Optional[str]:
+    """Comma-separated URLs of a record's websites, the form `jodie import` reads back from CSV."""
+    if not websites:
+        return None
+    return ','.join(site.get('url') or '' if isinstance(site, dict) else str(site) for site in websites)
+
+
+def write_csv_records(records: Iterable[Dict[str, Any]], stream: IO[str]) -> int:
+    """
+    Write records as CSV with a header row of EXPORT_COLUMNS, a chunk of rows per write.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        stream: A text stream opened with newline="".
+
+    Returns:
+        int: The number of records written.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for chunk in iter_chunks(records):
+        rows = [list(map(record.get, EXPORT_COLUMNS)) for record in chunk]
+        for row in rows:
+            if row[WEBSITES]:
+                row[WEBSITES] = website_urls(row[WEBSITES])
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+
+def write_ndjson_records(records: Iterable[Dict[str, Any]], stream: IO[str]) -> int:
+    """
+    Write one JSON object per line, a chunk of lines per write. Unlike `jodie.pipeline.write_ndjson`,
+    lines are not flushed one by one, which suits whole-store exports rather than live output.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        stream: A text stream.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    for chunk in iter_chunks(records):
+        stream.write('\n'.join(map(json.dumps, chunk)) + '\n')
+        count += len(chunk)
+    return count
+
+
+def write_parquet_records(records: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Write records to a Parquet file with pyarrow, which must be installed.
+
+    Each chunk of ROW_GROUP_SIZE records is gathered into one buffer per column and written as a row
+    group, so memory stays flat. Every column is a string except websites, a list of (label, url) structs.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        path (str): Path to the output file, or "-" to write to stdout.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Writing Parquet needs pyarrow. Install it with `pip install pyarrow`.") from None
+
+    website = pyarrow.struct([('label', pyarrow.string()), ('url', pyarrow.string())])
+    schema = pyarrow.schema([(column, pyarrow.list_(website) if column == 'websites' else pyarrow.string())
+                             for column in EXPORT_COLUMNS])
+    count = 0
+    writer = pyarrow.parquet.ParquetWriter(sys.stdout.buffer if path == '-' else path, schema)
+    try:
+        for chunk in iter_chunks(records, ROW_GROUP_SIZE):
+            columns = {column: [record.get(column) for record in chunk] for column in EXPORT_COLUMNS}
+            columns['websites'] = [
+                [site if isinstance(site, dict) else {'label': None, 'url': str(site)} for site in websites]
+                if websites else None
+                for websites in columns['websites']
+            ]
+            writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count
+
+
+WRITERS = {
+    'csv': write_csv_records,
+    'ndjson': write_ndjson_records,
+    'parquet': write_parquet_records,
+    'vcf': write_vcards,
+}
+
+# Keyword options each writer takes; others passed to `write_records` are ignored
+WRITER_OPTIONS = {
+    'vcf': ('version',),
+}
+
+
+def write_records(records: Iterable[Dict[str, object]], path: str, fmt: Optional[str] = None,
+                  **options) -> int:
+    """
+    Stream records to a file as they are produced, e.g. from `ContactStore.iter_all()`.
+
+    Args:
+        records: Records shaped like `Contact.tojson()`.
+        path (str): Path to the output file, or "-" to write to stdout.
+        fmt (str, optional): Output format. Inferred from the extension if omitted.
+        **options: Passed on to writers that take them, e.g. `version="4.0"` for vCards.
+
+    Returns:
+        int: The number of records written.
+    """
+    fmt = detect_format(path, fmt, formats=OUTPUT_FORMATS, kind="output")
+    writer = WRITERS[fmt]
+    options = {name: value for name, value in options.items() if name in WRITER_OPTIONS.get(fmt, ())}
+    if fmt in BINARY_FORMATS:
+        return writer(records, path, **options)
+    if path == '-':
+        return writer(records, sys.stdout, **options)
+    with open(path, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE) as stream:
+        return writer(records, stream, **options)
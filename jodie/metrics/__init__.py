@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# jodie/metrics/__init__.py
+from jodie.metrics.metrics import (
+    BATCH_BUCKETS,
+    LATENCY_BUCKETS,
+    REGISTRY,
+    Counter,
+    Histogram,
+    MetricsWriter,
+    Registry,
+    counter,
+    histogram
+)
+
+__all__ = (
+    "BATCH_BUCKETS",
+    "LATENCY_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Histogram",
+    "MetricsWriter",
+    "Registry",
+    "counter",
+    "histogram"
+)
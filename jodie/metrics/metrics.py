@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# jodie/metrics/metrics.py
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Contacts per save_many call
+BATCH_BUCKETS = (1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Seconds per store commit
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """
+    Base class for counters and histograms.
+
+    Every thread updates its own shard of the values, so updates take no lock and never race;
+    `collect` adds the shards up. A lock is only taken the first time a thread touches the metric.
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """
+        Args:
+            name (str): The Prometheus metric name, e.g. "jodie_records_parsed_total".
+            documentation (str): One line for the # HELP comment.
+            labelnames: Names of the labels whose values are passed to `inc` / `observe`.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, Any]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, Any]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append(values)
+            return values
+
+    def _check(self, labels: Labels) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels}.")
+
+    def _add(self, total: Any, value: Any) -> Any:
+        raise NotImplementedError
+
+    def collect(self) -> Dict[Labels, Any]:
+        """The current value for each combination of label values, summed over threads."""
+        with self._lock:
+            shards = list(self._shards)
+        totals: Dict[Labels, Any] = {}
+        for shard in shards:
+            # dict.copy is atomic, so a thread updating its shard meanwhile is fine
+            for labels, value in shard.copy().items():
+                totals[labels] = self._add(totals.get(labels), value)
+        return totals
+
+    def merge(self, values: Dict[Labels, Any]) -> None:
+        """Add values collected elsewhere, e.g. in a worker process, to this thread's shard."""
+        shard = self._shard()
+        for labels, value in values.items():
+            shard[tuple(labels)] = self._add(shard.get(tuple(labels)), value)
+
+    def reset(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Yield (name, labels, value) for each Prometheus sample of the metric."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A count that only goes up, such as records parsed or contacts saved."""
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Add `amount` to the count for the given label values:
+
+            FIELDS_DETECTED.inc("email")
+        """
+        shard = self._shard()
+        try:
+            shard[labels] += amount
+        except KeyError:
+            self._check(labels)
+            shard[labels] = amount
+
+    def _add(self, total: Optional[float], value: float) -> float:
+        return value if total is None else total + value
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for labels, value in sorted(self.collect().items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(Metric):
+    """
+    Counts observations, such as commit latencies, in buckets with fixed upper bounds, and keeps their sum.
+    Each state is a list: one count per bucket plus one for +Inf, then the sum of all observations.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            self._check(labels)
+            state = shard[labels] = [0] * (len(self.buckets) + 2)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _add(self, total: Optional[List[float]], value: List[float]) -> List[float]:
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for labels, state in sorted(self.collect().items()):
+            labels = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, state[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+class Registry:
+    """
+    The metrics of one process, exportable in the Prometheus text format or as a JSON snapshot.
+
+    Worker processes start from `reset` and send back what they counted with `drain`;
+    the parent adds it to its own values with `merge`. `jodie.parsers.map_chunks` does this for
+    every chunk it runs on a worker.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self.metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name!r} is already registered with a different type or labels.")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create a counter, or return the one already registered under `name`."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Create a histogram, or return the one already registered under `name`."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def reset(self) -> None:
+        """Set every metric back to zero."""
+        for metric in list(self.metrics.values()):
+            metric.reset()
+
+    def drain(self) -> Dict[str, Dict[Labels, Any]]:
+        """Return the values counted since the last drain or reset, and reset them."""
+        values = {name: metric.collect() for name, metric in list(self.metrics.items())}
+        self.reset()
+        return {name: value for name, value in values.items() if value}
+
+    def merge(self, values: Dict[str, Dict[Labels, Any]]) -> None:
+        """Add values returned by `drain` in another process."""
+        for name, metric_values in values.items():
+            if name in self.metrics:
+                self.metrics[name].merge(metric_values)
+
+    def write_text(self, stream: IO[str]) -> None:
+        """Write every metric in the Prometheus text exposition format."""
+        for name, metric in sorted(self.metrics.items()):
+            stream.write(f"# HELP {name} {metric.documentation}\n# TYPE {name} {metric.type}\n")
+            for sample, labels, value in metric.samples():
+                stream.write(f"{sample}{_format_labels(labels)} {_format_value(value)}\n")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as one JSON-serializable dict, with a timestamp and the process id."""
+        return {
+            "timestamp": time.time(),
+            "pid": os.getpid(),
+            "metrics": {
+                name: {"type": metric.type, "help": metric.documentation,
+                       "samples": [{"name": sample, "labels": labels, "value": value}
+                                   for sample, labels, value in metric.samples()]}
+                for name, metric in sorted(self.metrics.items())
+            },
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Replace `path` atomically with the current metrics: a JSON snapshot if it ends in ".json",
+        otherwise a Prometheus textfile, e.g. for node_exporter's textfile collector.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                json.dump(self.snapshot(), f)
+                f.write('\n')
+            else:
+                self.write_text(f)
+        os.replace(temporary, path)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Create a counter in the default registry."""
+    return REGISTRY.counter(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    """Create a histogram in the default registry."""
+    return REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+
+class MetricsWriter:
+    """
+    Writes a registry to a file every `interval` seconds on a daemon thread, and once more on `stop`,
+    so long imports and `jodie serve` can be watched while they run.
+    """
+
+    def __init__(self, path: str, interval: float = 10.0, registry: Registry = REGISTRY) -> None:
+        """
+        Args:
+            path (str): Where to write, see `Registry.write`.
+            interval (float): Seconds between writes.
+            registry: The registry to write.
+        """
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='jodie-metrics', daemon=True)
+
+    def start(self) -> 'MetricsWriter':
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.registry.write(self.path)
+
+    def stop(self) -> None:
+        """Stop writing periodically and write the final values."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.registry.write(self.path)
+
+    def __enter__(self) -> 'MetricsWriter':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
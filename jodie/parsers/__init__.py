@@ -4,14 +4,41 @@ from jodie.parsers.parsers import (
     BaseParser, 
     EmailParser, 
     NameParser, 
+    PhoneParser,
     WebsiteParser, 
-    TitleParser
+    TitleParser,
+    SCANNER
 )
+from jodie.parsers.companies import CompanyIndex, build_company_index, company_index, load_company_index
+from jodie.parsers.names import Name, clear_name_cache, name_cache_info, name_constants, parse_name
+from jodie.parsers.scanner import Scanner, Span, Spans
+from jodie.parsers.auto import contact_fields, parse_auto, parse_text, split_text
+from jodie.parsers.parallel import map_chunks, parse_lines
 
 __all__ = (
     "BaseParser", 
     "EmailParser", 
     "NameParser", 
+    "PhoneParser",
     "WebsiteParser", 
-    "TitleParser"
+    "TitleParser",
+    "SCANNER",
+    "CompanyIndex",
+    "Name",
+    "Scanner",
+    "Span",
+    "Spans",
+    "build_company_index",
+    "clear_name_cache",
+    "company_index",
+    "contact_fields",
+    "load_company_index",
+    "map_chunks",
+    "name_cache_info",
+    "name_constants",
+    "parse_auto",
+    "parse_lines",
+    "parse_name",
+    "parse_text",
+    "split_text"
 )
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# jodie/parsers/auto.py
+from jodie.parsers.companies import company_index
+from jodie.parsers.names import parse_name
+from jodie.parsers.parsers import BaseParser, NameParser, TitleParser
+from jodie.metrics import counter
+from jodie.trace import traced
+
+RECORDS_PARSED = counter("jodie_records_parsed_total", "Inputs run through parse_auto.")
+FIELDS_DETECTED = counter("jodie_fields_detected_total", "Fields found by parse_auto, by field.", ["field"])
+
+
+def split_text(text):
+    """
+    Split free text such as a signature line into the arguments `parse_auto` expects.
+    Uses the scanner's spans, so "Jane Doe | CEO, Acme | jane@acme.com" becomes
+    ["Jane Doe", "CEO", "Acme", "jane@acme.com"].
+
+    :param text: The text to split.
+    :return: A list of strings.
+    """
+    return [span.text for span in BaseParser.scan(text)]
+
+
+class DetectedFields(dict):
+    """
+    The fields `parse_auto` found. A plain dict to callers and `json.dumps`, which also keeps
+    the parsed name in `name` so `contact_fields` doesn't parse it a second time.
+    """
+    name = None
+
+
+def _set_name(detected_fields, arg):
+    """Fill in the name fields from `arg`, returning True if it held a name."""
+    name = NameParser.parse_parts(arg)
+    if name is None or not (name.first or name.middle or name.last):
+        return False
+    detected_fields["first_name"] = name.first
+    detected_fields["last_name"] = f"{name.middle} {name.last}".strip()
+    detected_fields.name = name
+    return True
+
+
+@traced("parse_auto")
+def parse_auto(arguments):
+    """
+    Guess which contact field each argument is, e.g. ["CEO", "jane@acme.com", "Jane Doe"].
+
+    :param arguments: A list of strings, one field each.
+    :return: A dict of detected fields. Missing fields are None; "websites" is a list.
+    """
+    detected_fields = DetectedFields({
+        "first_name": None,
+        "last_name": None,
+        "email": None,
+        "phone": None,
+        "job_title": None,
+        "company": None,
+        "websites": [],
+        "note": None
+    })
+
+    # First pass: identify all fields that can be unambiguously determined
+    for arg in arguments:
+        # Tokenize once; the parsers below reuse the memoized spans
+        spans = BaseParser.scan(arg)
+
+        # 1. Email Address - Strong, unambiguous signal
+        if not detected_fields["email"]:
+            email = spans.first("email")
+            if email:
+                detected_fields["email"] = email.text
+                # Infer name from mailbox format if name is not already set
+                if not detected_fields["first_name"]:
+                    _set_name(detected_fields, arg)
+                continue
+
+        # 2. Website URL - High-confidence markers
+        website = spans.first("url")
+        if website:
+            if not detected_fields["websites"]:
+                detected_fields["websites"] = []
+            detected_fields["websites"].append(website.text)
+            continue
+
+        # 2b. Phone Number - only when it is the whole argument
+        if not detected_fields["phone"] and len(spans) == 1 and spans[0].kind == "phone":
+            detected_fields["phone"] = spans[0].text
+            continue
+
+        # 3. Job Title - Common patterns, after ruling out email/URL
+        if not detected_fields["job_title"]:
+            title = TitleParser.parse(arg)
+            if title:
+                detected_fields["job_title"] = title
+                continue
+
+        # 4. Person Name - Often ambiguous without context
+        if not detected_fields["first_name"]:
+            if _set_name(detected_fields, arg):
+                continue
+
+    # 4b. Company from the email (or website) domain, the strongest signal, if a company index is installed
+    # Webmail, disposable and education addresses (the "home" emails of get_label_for_email) say nothing
+    # about an employer, so they are not looked up even if the index maps their domain
+    index = company_index()
+    if index is not None:
+        from jodie.contact.domains import EMAIL_DOMAINS
+
+        email = detected_fields["email"]
+        if email and EMAIL_DOMAINS.lookup(email.rpartition("@")[2]) is not None:
+            email = None
+        for host in [email, *detected_fields["websites"]]:
+            company = host and index.lookup(host)
+            if company:
+                detected_fields["company"] = company
+                break
+
+    # Second pass: handle company name and any remaining fields
+    for arg in arguments:
+        # Skip if this argument was already used
+        if (arg == detected_fields["email"] or
+            arg == detected_fields["phone"] or
+            arg in detected_fields["websites"] or
+            arg == detected_fields["job_title"] or
+            arg == f"{detected_fields['first_name']} {detected_fields['last_name']}".strip()):
+            continue
+
+        # 5. Company Name - Most ambiguous, use as fallback
+        if not detected_fields["company"]:
+            # Check for business-related terms
+            if any(term in arg.lower() for term in ["inc", "llc", "ltd", "corp", "co"]):
+                detected_fields["company"] = arg.strip()
+                continue
+            
+            # Check if this matches any of the collected website domains
+            if detected_fields["websites"]:
+                for url in detected_fields["websites"]:
+                    domain = url.split("//")[-1].split("/")[0].lower()
+                    if arg.lower() in domain or domain in arg.lower():
+                        detected_fields["company"] = arg.strip()
+                        break
+            if detected_fields["company"]:
+                continue
+
+            # If we get here and still don't have a company, this might be the company name
+            if not detected_fields["company"]:
+                detected_fields["company"] = arg.strip()
+
+    RECORDS_PARSED.inc()
+    for field, value in detected_fields.items():
+        if value:
+            FIELDS_DETECTED.inc(field)
+    return detected_fields
+
+
+def parse_text(text):
+    """
+    Detect contact fields in one piece of free text.
+
+    :param text: The text to parse.
+    :return: A dict of detected fields, see `parse_auto`.
+    """
+    return parse_auto(split_text(text))
+
+
+def contact_fields(detected_fields):
+    """
+    Turn the output of `parse_auto` into keyword arguments for `jodie.contact.Contact`.
+    The first and last name come from the name `parse_auto` parsed, without its middle name.
+    Dicts built some other way have their name parsed again from first_name and last_name.
+
+    :param detected_fields: A dict returned by `parse_auto`.
+    :return: A dict with first_name, last_name, email, phone, job_title, company and websites.
+    """
+    first, last = None, None
+    if detected_fields.get('first_name'):
+        name = getattr(detected_fields, 'name', None)
+        if name is None:
+            name = parse_name(f"{detected_fields['first_name']} {detected_fields['last_name']}")
+        if any(name):
+            first, last = name.first, name.last
+
+    return {
+        "first_name": first,
+        "last_name": last,
+        "email": detected_fields.get('email'),
+        "phone": detected_fields.get('phone'),
+        "job_title": detected_fields.get('job_title'),
+        "company": detected_fields.get('company'),
+        "websites": detected_fields.get('websites'),  # This is already a list from parse_auto
+    }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# jodie/parsers/companies.py
+import csv
+import heapq
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from operator import itemgetter
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"JODIEDX1"
+
+# magic, number of domains, position of the record offsets table
+HEADER = struct.Struct('<8sQQ')
+
+# Each record: domain length, company length, then both UTF-8 encoded
+RECORD = struct.Struct('<HH')
+
+# Where `jodie index build` writes by default, and where `company_index` looks if $JODIE_COMPANY_INDEX is unset
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.jodie', 'companies.idx')
+
+# Rows sorted in memory at a time while building; larger inputs are merged from sorted runs on disk
+RUN_SIZE = 500000
+
+# Column names recognized in the header of a company CSV
+DOMAIN_COLUMNS = ('domain', 'website', 'url', 'homepage', 'email')
+COMPANY_COLUMNS = ('company', 'company_name', 'organization', 'organisation', 'org', 'name')
+
+
+def index_key(value: str) -> str:
+    """
+    The domain an email address, URL or bare domain is indexed under,
+    e.g. "jane@Acme.com" -> "acme.com" and "https://www.acme.com/about" -> "acme.com".
+
+    :param value: An email address, URL or domain.
+    :return: The lowercase domain, or "" if there is none.
+    """
+    value = value.strip().lower()
+    if '@' in value and '//' not in value:
+        value = value.rpartition('@')[2]
+    host = value.split('//')[-1].split('/')[0].split('?')[0].split(':')[0].strip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+class CompanyIndex:
+    """
+    A read-only map from domain to company name in a memory-mapped file.
+
+    Records are sorted by domain and found by binary search through a table of record offsets,
+    so opening an index takes the same time however many domains it holds, and only the pages
+    a lookup touches are read. Nothing is loaded onto the Python heap except cached results.
+    """
+
+    def __init__(self, path: str, cache_size: int = 65536) -> None:
+        """
+        :param path: An index written by `build_company_index`.
+        :param cache_size: Number of recent hosts whose result is cached.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path!r} is not a jodie company index.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._offsets = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path!r} is not a jodie company index.")
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, domain: str) -> Optional[str]:
+        """
+        Return the company of exactly `domain`, which must already be normalized with `index_key`.
+
+        :param domain: A domain such as "acme.com".
+        :return: The company name, or None.
+        """
+        mapped, offsets = self._map, self._offsets
+        key = domain.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            position = struct.unpack_from('<Q', mapped, offsets + middle * 8)[0]
+            key_length, value_length = RECORD.unpack_from(mapped, position)
+            start = position + RECORD.size
+            found = mapped[start:start + key_length]
+            if found == key:
+                value = mapped[start + key_length:start + key_length + value_length]
+                return value.decode('utf-8', errors='replace')
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _lookup(self, host: str) -> Optional[str]:
+        """
+        Return the company of `host` or of the closest parent domain in the index, so
+        "mail.eng.acme.co.uk" finds "acme.co.uk". Use `lookup`, which is cached.
+
+        :param host: An email address, URL or domain.
+        :return: The company name, or None.
+        """
+        host = index_key(host)
+        while '.' in host:
+            company = self.get(host)
+            if company is not None:
+                return company
+            host = host.partition('.')[2]
+        return None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> 'CompanyIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_company_csv(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (domain, company) pairs from a CSV file.
+
+    The domain and company columns are found by header name (e.g. "domain" or "website", and
+    "company" or "name"); without a recognized header the first two columns are used.
+
+    :param path: The CSV file, or "-" for stdin.
+    :return: An iterator of (domain, company) pairs.
+    """
+    f = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+    try:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip().lower().replace(' ', '_').replace('-', '_') for column in header]
+        domain_column = next((columns.index(name) for name in DOMAIN_COLUMNS if name in columns), None)
+        company_column = next((columns.index(name) for name in COMPANY_COLUMNS if name in columns), None)
+        if domain_column is None or company_column is None:
+            domain_column, company_column = 0, 1
+            reader = _prepend(header, reader)
+        for row in reader:
+            if len(row) > max(domain_column, company_column):
+                yield row[domain_column], row[company_column]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _prepend(row: List[str], rows: Iterator[List[str]]) -> Iterator[List[str]]:
+    yield row
+    yield from rows
+
+
+def _write_run(run: List[Tuple[bytes, bytes]], directory: str) -> str:
+    import tempfile
+
+    with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.run', delete=False) as f:
+        for domain, company in run:
+            f.write(RECORD.pack(len(domain), len(company)) + domain + company)
+        return f.name
+
+
+def _read_run(path: str) -> Iterator[Tuple[bytes, bytes]]:
+    with open(path, 'rb') as f:
+        while True:
+            lengths = f.read(RECORD.size)
+            if not lengths:
+                return
+            key_length, value_length = RECORD.unpack(lengths)
+            yield f.read(key_length), f.read(value_length)
+
+
+def _sorted_runs(pairs: Iterable[Tuple[str, str]], directory: str, run_size: int,
+                 runs: List[str]) -> Iterator[Tuple[bytes, bytes]]:
+    """Sort the pairs by domain, spilling sorted runs of `run_size` to disk and merging them."""
+    run: List[Tuple[bytes, bytes]] = []
+    for domain, company in pairs:
+        domain, company = index_key(domain), ' '.join(company.split())
+        if not domain or not company:
+            continue
+        run.append((domain.encode('utf-8')[:0xFFFF], company.encode('utf-8')[:0xFFFF]))
+        if len(run) >= run_size:
+            # Sorting on the domain alone is stable, so the first row for a domain stays first
+            run.sort(key=itemgetter(0))
+            runs.append(_write_run(run, directory))
+            run = []
+    run.sort(key=itemgetter(0))
+    if not runs:
+        return iter(run)
+    return heapq.merge(*(_read_run(path) for path in runs), run, key=itemgetter(0))
+
+
+def build_company_index(pairs: Iterable[Tuple[str, str]], path: str, run_size: int = RUN_SIZE) -> int:
+    """
+    Write a `CompanyIndex` file from (domain, company) pairs, replacing `path` atomically.
+
+    Domains may be given as URLs or email addresses and are normalized with `index_key`. When a domain
+    appears more than once, its first company is kept. Inputs larger than `run_size` pairs are sorted
+    in runs on disk, so memory use stays bounded however many domains there are.
+
+    :param pairs: (domain, company) pairs, e.g. from `read_company_csv`.
+    :param path: Where to write the index.
+    :param run_size: Pairs sorted in memory at a time.
+    :return: The number of domains in the index.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    runs: List[str] = []
+    try:
+        offsets = array('Q')
+        with open(temporary, 'wb') as f:
+            f.seek(HEADER.size)
+            position, previous = HEADER.size, None
+            for domain, company in _sorted_runs(pairs, directory, run_size, runs):
+                if domain == previous:
+                    continue
+                previous = domain
+                offsets.append(position)
+                record = RECORD.pack(len(domain), len(company)) + domain + company
+                f.write(record)
+                position += len(record)
+            _write_offsets(f, offsets)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, len(offsets), position))
+        os.replace(temporary, path)
+    finally:
+        for run in runs:
+            os.remove(run)
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return len(offsets)
+
+
+def _write_offsets(f: IO[bytes], offsets: array) -> None:
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    f.write(offsets.tobytes())
+
+
+_index: Optional[CompanyIndex] = None
+_index_loaded = False
+
+
+def company_index() -> Optional[CompanyIndex]:
+    """
+    Return the company index `parse_auto` uses, opening it on first use from the file named by
+    $JODIE_COMPANY_INDEX, or DEFAULT_INDEX_PATH if that exists. An index that can't be read
+    (e.g. empty or corrupt) is skipped with one warning on stderr, as if there were none.
+
+    :return: The shared `CompanyIndex`, or None if there is no usable index.
+    """
+    global _index, _index_loaded
+    if not _index_loaded:
+        path = os.environ.get('JODIE_COMPANY_INDEX') or DEFAULT_INDEX_PATH
+        _index = None
+        if os.path.exists(path):
+            try:
+                _index = CompanyIndex(path)
+            except (ValueError, OSError) as e:
+                sys.stderr.write(f"Warning: ignoring company index: {str(e)}\n")
+        _index_loaded = True
+    return _index
+
+
+def load_company_index(path: Optional[str]) -> Optional[CompanyIndex]:
+    """
+    Use the index at `path` for company inference from now on, or none if `path` is None.
+
+    :param path: An index written by `build_company_index`, or None.
+    :return: The opened `CompanyIndex`, or None.
+    """
+    global _index, _index_loaded
+    if _index is not None:
+        _index.close()
+    _index = CompanyIndex(path) if path else None
+    _index_loaded = True
+    return _index
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# jodie/parsers/names.py
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple
+
+from jodie.trace import span
+
+# Distinct names remembered per process. Senders and signatures repeat, so most lookups are hits.
+NAME_CACHE_SIZE = 65536
+
+
+class Name(NamedTuple):
+    """The parts of a person's name that jodie uses."""
+    first: str
+    middle: str
+    last: str
+
+
+def normalize_name(text: str) -> str:
+    """The cache key for a name: the text with runs of whitespace collapsed to single spaces."""
+    return " ".join(text.split())
+
+
+def name_constants() -> Any:
+    """
+    The `nameparser` constants (titles, suffixes, prefixes...) every name is parsed with.
+    One object is shared by all parses; after changing it, call `clear_name_cache`.
+    """
+    # Imported here because loading nameparser's constants is slow.
+    from nameparser.config import CONSTANTS
+    return CONSTANTS
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _parse_name(name: str) -> Name:
+    from nameparser import HumanName
+    with span("HumanName"):
+        human_name = HumanName(name, constants=name_constants())
+    return Name(human_name.first, human_name.middle, human_name.last)
+
+
+def parse_name(text: str) -> Name:
+    """
+    Split a name into first, middle and last name with `nameparser`, memoized.
+
+    Results are kept in a bounded LRU cache keyed on the normalized name, which is safe to use from
+    several threads. Each worker process of a pool has its own cache.
+
+    :param text: A name, e.g. "Dr. Jane  Q. Doe".
+    :return: A Name tuple; parts that were not found are "".
+    """
+    return _parse_name(normalize_name(text))
+
+
+def name_cache_info() -> Dict[str, Any]:
+    """
+    Statistics for this process's name cache.
+
+    :return: A dict with hits, misses, size, maxsize and hit_rate (0 to 1).
+    """
+    info = _parse_name.cache_info()
+    lookups = info.hits + info.misses
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0}
+
+
+def clear_name_cache() -> None:
+    """Forget every parsed name, e.g. after changing `name_constants()`."""
+    _parse_name.cache_clear()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# jodie/parsers/parallel.py
+import json
+import os
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from jodie.metrics import REGISTRY
+from jodie.parsers.auto import parse_text
+from jodie.parsers.parsers import NameParser, TitleParser
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Lines sent to a worker at a time
+CHUNK_SIZE = 2000
+
+# Chunks in flight per worker; bounds how far ahead of the output the workers can get
+CHUNKS_PER_WORKER = 2
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def warm_up() -> None:
+    """Build the title matcher and load nameparser, so the first real line is not the slow one."""
+    TitleParser.matcher()
+    # Through NameParser rather than parse_text, so warming up is not counted as a parsed record
+    NameParser.parse("Jane Doe <jane@acme.com>")
+
+
+def parse_chunk(lines: List[str]) -> List[str]:
+    """Parse each line and return the results already serialized, one JSON object per line."""
+    return [json.dumps(parse_text(line)) for line in lines]
+
+
+def parse_lines(lines: Iterable[str], jobs: Optional[int] = None,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Run `parse_text` over many lines on a pool of worker processes, keeping the input order.
+
+    Lines are sent to the workers in chunks. Finished chunks wait in a bounded reorder buffer until
+    every earlier chunk is done, so at most `jobs * CHUNKS_PER_WORKER` chunks are held in memory
+    however long the input is.
+
+    Args:
+        lines: The input lines, consumed lazily. Trailing newlines are ignored.
+        jobs (int, optional): Worker processes. Defaults to the number of CPUs; 1 parses in-process.
+        chunk_size (int): Lines per task sent to a worker.
+
+    Yields:
+        str: The detected fields of each line as JSON, in input order.
+    """
+    lines = (line.rstrip('\r\n') for line in lines)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        warm_up()
+        for line in lines:
+            yield json.dumps(parse_text(line))
+        return
+    yield from map_chunks(parse_chunk, lines, jobs=jobs, chunk_size=chunk_size, initializer=warm_up)
+
+
+def _init_worker(initializer: Optional[Callable[[], None]]) -> None:
+    # Forked workers inherit the parent's metrics; start from zero so each chunk reports only its own
+    REGISTRY.reset()
+    if initializer:
+        initializer()
+
+
+def _run_chunk(func: Callable[[List[T]], List[R]], chunk: List[T]) -> Tuple[List[R], Dict[str, Any]]:
+    return func(chunk), REGISTRY.drain()
+
+
+def _chunk_results(future: 'Future') -> List[Any]:
+    results, metrics = future.result()
+    REGISTRY.merge(metrics)
+    return results
+
+
+def map_chunks(func: Callable[[List[T]], List[R]], items: Iterable[T], jobs: Optional[int] = None,
+               chunk_size: int = CHUNK_SIZE, initializer: Optional[Callable[[], None]] = None) -> Iterator[R]:
+    """
+    Call `func` on chunks of `items` on a pool of worker processes and yield its results in input order.
+
+    At most `jobs * CHUNKS_PER_WORKER` chunks are in flight or waiting to be yielded, so memory use does
+    not grow with the input. `func` and `initializer` must be importable module-level functions.
+    Metrics counted in the workers are added to this process's `jodie.metrics.REGISTRY`.
+
+    Args:
+        func: Takes a list of items and returns a list of results, e.g. one per item.
+        items: The inputs, consumed lazily.
+        jobs (int, optional): Worker processes. Defaults to the number of CPUs; 1 runs in-process.
+        chunk_size (int): Items per task sent to a worker.
+        initializer: Called once in each worker before its first chunk.
+
+    Yields:
+        The results of each chunk, in input order.
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        if initializer:
+            initializer()
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+
+    # Deferred: loading concurrent.futures costs more than a whole single-line `jodie parse`
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(initializer,)) as executor:
+        pending: Deque['Future'] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_run_chunk, func, chunk))
+            if len(pending) >= jobs * CHUNKS_PER_WORKER:
+                yield from _chunk_results(pending.popleft())
+        while pending:
+            yield from _chunk_results(pending.popleft())
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 # jodie/parsers/parsers.py
+import os
 import re
-from nameparser import HumanName
+from jodie.parsers.titles import TitleMatcher, read_titles
+from jodie.parsers.names import parse_name
+from jodie.parsers.scanner import EMAIL, PHONE, TITLE, URL, Scanner
+from jodie.trace import traced
 
 class BaseParser:
     """
@@ -22,6 +26,17 @@ class BaseParser:
         """
         return re.findall(pattern, text)
 
+    @staticmethod
+    def scan(text):
+        """
+        Split the text into typed spans with the shared, memoized `Scanner`.
+        Every parser works from these spans, so a text is only tokenized once.
+
+        :param text: The text to scan.
+        :return: A `Spans` tuple of (kind, text, start, end).
+        """
+        return SCANNER.scan(text)
+
     @classmethod
     def parse(cls, text):
         """
@@ -36,20 +51,26 @@ class BaseParser:
 
 class EmailParser(BaseParser):
     @classmethod
+    @traced("EmailParser.parse")
     def parse(cls, text):
         """
         Extracts a single email from the text.
         Returns the first valid match or None.
         """
-        email_pattern = r'<(\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)>' \
-                        r'|(\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
-        matches = cls.find_matches(email_pattern, text)
-        for match in matches:
-            # Return the first non-empty match
-            if isinstance(match, tuple):
-                return next((item for item in match if item), None)
-            return match
-        return None
+        span = cls.scan(text).first(EMAIL)
+        return span.text if span else None
+
+
+class PhoneParser(BaseParser):
+    @classmethod
+    @traced("PhoneParser.parse")
+    def parse(cls, text):
+        """
+        Extracts a single phone number from the text.
+        Returns the first match as written, or None.
+        """
+        span = cls.scan(text).first(PHONE)
+        return span.text if span else None
 
 
 class TitleParser(BaseParser):
@@ -95,7 +116,60 @@ class TitleParser(BaseParser):
         "full stack", "front end", "back end", "full-stack", "front-end", "back-end"
     }
 
+    # Built on first use by `matcher()`
+    _matcher = None
+
     @classmethod
+    def matcher(cls):
+        """
+        Return the title automaton, building it on first use from COMMON_TITLES, PREFIXES
+        and the dictionary file named by $JODIE_TITLES, if set.
+
+        :return: The shared `TitleMatcher`.
+        """
+        if cls._matcher is None:
+            matcher = TitleMatcher(cls.COMMON_TITLES, cls.PREFIXES)
+            path = os.environ.get('JODIE_TITLES')
+            if path:
+                matcher.update(read_titles(path))
+            cls._set_matcher(matcher)
+        return cls._matcher
+
+    @classmethod
+    def _set_matcher(cls, matcher):
+        cls._matcher = matcher
+        # Keep the scanner's title candidates in line with the dictionary
+        SCANNER.set_title_words(matcher.words())
+
+    @classmethod
+    def load_titles(cls, path, replace=False):
+        """
+        Load job titles from a file with one title per line.
+
+        :param path: Path to the title dictionary.
+        :param replace: If True, use only the file's titles (plus PREFIXES) instead of adding to COMMON_TITLES.
+        """
+        matcher = TitleMatcher(prefixes=cls.PREFIXES) if replace else cls.matcher()
+        matcher.update(read_titles(path))
+        cls._set_matcher(matcher)
+
+    @classmethod
+    def extract(cls, text):
+        """
+        Find the longest job title inside the text, including any prefixes before it.
+        e.g. "Jane Doe, Senior Software Engineer at Acme" -> "Senior Software Engineer"
+
+        :param text: The text to search.
+        :return: The title as written in the text, or None.
+        """
+        if not isinstance(text, str) or not text.strip():
+            return None
+        words = text.split()
+        match = cls.matcher().longest([word.lower() for word in words])
+        return " ".join(words[match.start:match.end]) if match else None
+
+    @classmethod
+    @traced("TitleParser.parse")
     def parse(cls, text):
         """
         Enhanced title parsing:
@@ -107,78 +181,76 @@ class TitleParser(BaseParser):
         if not isinstance(text, str) or not text.strip():
             return None
 
-        # Normalize text for comparison
-        cleaned_text = text.strip().lower()
-        
-        # Direct match against common titles
-        if cleaned_text in cls.COMMON_TITLES:
-            # Preserve original case for acronyms
-            if text.upper() in cls.ACRONYMS:
-                return text.upper()
-            # Preserve original case for the entire title
-            return text
+        matcher = cls.matcher()
 
-        # Check for compound titles with prefixes
-        words = cleaned_text.split()
-        if len(words) >= 2:
-            # First check if the entire phrase is a known title
-            if cleaned_text in cls.COMMON_TITLES:
-                return text
-            
-            # Then check for prefix + title combinations
-            for i in range(len(words)):
-                prefix = " ".join(words[:i+1])
-                if prefix in cls.PREFIXES:
-                    remaining = " ".join(words[i+1:])
-                    if remaining in cls.COMMON_TITLES:
-                        return text
-            
-            # Finally check if any part matches a known title
-            for i in range(len(words)):
-                for j in range(i + 1, len(words) + 1):
-                    phrase = " ".join(words[i:j])
-                    if phrase in cls.COMMON_TITLES:
-                        return text
+        # Skip the dictionary search unless the scanner saw a known title word
+        if not cls.scan(text).first(TITLE):
+            return None
+
+        # Preserve original case for acronyms
+        if text.upper() in cls.ACRONYMS:
+            return text.upper()
+
+        # Any known title in the text, alone or after prefixes, makes it a title.
+        # The automaton finds it in one pass over the words.
+        if matcher.longest(text.strip().lower().split()):
+            return text
 
         return None
 
 
 class WebsiteParser(BaseParser):
     @classmethod
+    @traced("WebsiteParser.parse")
     def parse(cls, text):
         # Match typical URL patterns
-        url_pattern = r'https?://[^\s]+|www\.[^\s]+'
-        urls = cls.find_matches(url_pattern, text)
-        return urls[0] if urls else None
+        span = cls.scan(text).first(URL)
+        return span.text if span else None
 
 
 class NameParser(BaseParser):
     @classmethod
     def parse(cls, text):
         """
-        Parse a name from the given text.
+        Parse a name from the given text, see `parse_parts`.
+
+        :param text: The text to parse.
+        :return: A tuple of (first_name, last_name), where the last name includes any middle names.
+        """
+        name = cls.parse_parts(text)
+        if name is None:
+            return "", ""
+
+        # Return the first and last names as a tuple.
+        return name.first, f"{name.middle} {name.last}".strip()
+
+    @classmethod
+    @traced("NameParser.parse")
+    def parse_parts(cls, text):
+        """
+        Parse a name from the given text, keeping the middle name apart.
         - If an email is present in mailbox format, extract the portion before the email.
-        - Use the `nameparser` package to parse the extracted name.
+        - Use the `nameparser` package to parse the extracted name, memoized by `parse_name`.
 
         :param text: The text to parse.
-        :return: A tuple of (first_name, last_name).
+        :return: A Name tuple, or None if the text holds no name.
         """
         # Check for email in the text.
-        email = EmailParser.parse(text)
+        email = cls.scan(text).first(EMAIL)
         if email:
             # Extract the portion of text before the email for name parsing.
-            name_portion_index = text.find(email)
-            name_portion = text[:name_portion_index].strip()
+            name_portion = text[:email.start].strip()
             name_portion = name_portion.rstrip('<').strip()
         else:
             # Use the entire text if no email is found.
             name_portion = text.strip()
 
         if not name_portion:
-            return "", ""
+            return None
 
-        # Use the `HumanName` class to parse the name intelligently.
-        name = HumanName(name_portion)
+        return parse_name(name_portion)
 
-        # Return the first and last names as a tuple.
-        return name.first, f"{name.middle} {name.last}".strip()
+
+# Shared by all parsers. Segments containing any word of a known title or title prefix are title candidates.
+SCANNER = Scanner(
+    word for phrase in TitleParser.COMMON_TITLES | TitleParser.PREFIXES for word in phrase.split())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# jodie/parsers/scanner.py
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+from jodie.trace import traced
+
+# Span kinds
+EMAIL = "email"
+URL = "url"
+PHONE = "phone"
+TITLE = "title"
+NAME = "name"
+
+# Fewer digits than this is more likely a date, zip code or street number than a phone number
+MIN_PHONE_DIGITS = 7
+
+
+class Span(NamedTuple):
+    """A typed piece of scanned text and its [start, end) offsets in that text."""
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class Spans(tuple):
+    """The spans found in one text, in order of their offsets."""
+
+    def first(self, kind: str) -> Optional[Span]:
+        """Return the first span of the given kind, or None."""
+        for span in self:
+            if span.kind == kind:
+                return span
+        return None
+
+
+class Scanner:
+    """
+    Single-pass tokenizer for contact text.
+
+    One precompiled pattern walks the text left to right and picks out emails, URLs and phone numbers.
+    The text left between those tokens is cut on separators (commas, pipes, brackets, newlines...)
+    into candidate segments: a segment containing a known title word becomes a "title" span,
+    anything else a "name" span. Parsers confirm or reject the candidates.
+    """
+
+    # Alternatives are tried in order at each position, so a URL wins over an email inside it
+    TOKEN_PATTERN = re.compile(r"""
+          (?P<url>https?://[^\s]+|www\.[^\s]+)
+        | (?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)
+        | (?P<phone>(?<![\w+])\+?\(?\d[\d ().-]{5,}\d(?!\w))
+        | (?P<separator>[,;|<>()\[\]\n\r\t]+)
+    """, re.VERBOSE)
+
+    def __init__(self, title_words: Iterable[str] = (), cache_size: int = 4096) -> None:
+        """
+        Args:
+            title_words: Lowercase words that mark a segment as a title candidate.
+            cache_size (int): Number of recent texts whose spans are memoized.
+        """
+        self.title_words = frozenset(title_words)
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def set_title_words(self, title_words: Iterable[str]) -> None:
+        """Replace the title vocabulary and drop memoized spans that were classified with the old one."""
+        self.title_words = frozenset(title_words)
+        self.scan.cache_clear()
+
+    def _segment(self, text: str, start: int, end: int) -> Optional[Span]:
+        segment = text[start:end]
+        stripped = segment.strip()
+        if not stripped:
+            return None
+        start += len(segment) - len(segment.lstrip())
+        kind = TITLE if any(word in self.title_words for word in stripped.lower().split()) else NAME
+        return Span(kind, stripped, start, start + len(stripped))
+
+    @traced("Scanner.scan")
+    def _scan(self, text: str) -> Spans:
+        """
+        Scan `text` once and return its spans. Use `scan`, which memoizes the result.
+
+        :param text: The text to scan.
+        :return: A Spans tuple ordered by offset.
+        """
+        spans: List[Span] = []
+        segment_start = 0
+        for match in self.TOKEN_PATTERN.finditer(text):
+            kind = match.lastgroup
+            if kind == PHONE and sum(ch.isdigit() for ch in match.group()) < MIN_PHONE_DIGITS:
+                # Not a phone number, leave it in the surrounding segment
+                continue
+            segment = self._segment(text, segment_start, match.start())
+            if segment:
+                spans.append(segment)
+            if kind != "separator":
+                spans.append(Span(kind, match.group(), match.start(), match.end()))
+            segment_start = match.end()
+
+        segment = self._segment(text, segment_start, len(text))
+        if segment:
+            spans.append(segment)
+        return Spans(spans)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# jodie/parsers/titles.py
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Phrase kinds
+TITLE = "title"
+PREFIX = "prefix"
+
+
+class Match(NamedTuple):
+    """A dictionary phrase found in a word sequence, covering words[start:end]."""
+    kind: str
+    start: int
+    end: int
+
+
+class TitleMatcher:
+    """
+    Word-level Aho-Corasick automaton over job titles and title prefixes.
+
+    Every phrase is a sequence of lowercase words. `find_all` reports every dictionary
+    phrase in a word sequence in one left-to-right pass, so the cost grows with the
+    input length plus the number of matches, not with the dictionary size.
+    """
+
+    def __init__(self, titles: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+        # State 0 is the root. goto[s] maps a word to the next state.
+        self.goto: List[Dict[str, int]] = [{}]
+        # Phrases ending exactly at each state, as (number of words, kind)
+        self.phrases: List[List[Tuple[int, str]]] = [[]]
+        # Filled in by _build: failure links, and phrases ending at each state including via failure links
+        self.fail: List[int] = []
+        self.output: List[List[Tuple[int, str]]] = []
+        self.size = 0
+        for prefix in prefixes:
+            self.add(prefix, PREFIX)
+        for title in titles:
+            self.add(title, TITLE)
+
+    @classmethod
+    def from_file(cls, path: str, prefixes: Iterable[str] = ()) -> 'TitleMatcher':
+        """
+        Build a matcher from a text file with one title per line.
+        Blank lines and lines starting with "#" are skipped.
+
+        Args:
+            path (str): Path to the title dictionary.
+            prefixes: Title prefixes such as "senior" or "lead".
+
+        Returns:
+            TitleMatcher: The matcher.
+        """
+        matcher = cls(prefixes=prefixes)
+        matcher.update(read_titles(path))
+        return matcher
+
+    def add(self, phrase: str, kind: str = TITLE) -> None:
+        """Add one phrase. The automaton is rebuilt lazily on the next search."""
+        words = phrase.lower().split()
+        if not words:
+            return
+        state = 0
+        for word in words:
+            next_state = self.goto[state].get(word)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][word] = next_state
+                self.goto.append({})
+                self.phrases.append([])
+            state = next_state
+        if (len(words), kind) not in self.phrases[state]:
+            self.phrases[state].append((len(words), kind))
+            self.size += 1
+            self.output = []
+
+    def update(self, phrases: Iterable[str], kind: str = TITLE) -> None:
+        """Add many phrases."""
+        for phrase in phrases:
+            self.add(phrase, kind)
+
+    def _build(self) -> None:
+        """Compute failure links breadth-first and merge the outputs they lead to."""
+        goto = self.goto
+        fail = [0] * len(goto)
+        output = [list(phrases) for phrases in self.phrases]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                if state:
+                    fail[next_state] = goto[fallback].get(word, 0)
+                output[next_state].extend(output[fail[next_state]])
+                queue.append(next_state)
+        self.fail = fail
+        self.output = output
+
+    def find_all(self, words: Sequence[str]) -> Iterator[Match]:
+        """
+        Find every dictionary phrase in a sequence of lowercase words.
+
+        :param words: The words to search.
+        :return: An iterator of Match(kind, start, end), ordered by end position.
+        """
+        if not self.output:
+            self._build()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for end, word in enumerate(words, 1):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, kind in output[state]:
+                yield Match(kind, end - length, end)
+
+    def longest(self, words: Sequence[str]) -> Optional[Match]:
+        """
+        Find the longest title in a sequence of lowercase words.
+        A title directly preceded by a prefix ("senior" + "engineer") counts as one title.
+
+        :param words: The words to search.
+        :return: The longest title Match, or None if there is no title.
+        """
+        best = None
+        # Earliest start of a run of prefixes ending at each word position
+        prefix_start: Dict[int, int] = {}
+        for match in self.find_all(words):
+            if match.kind == PREFIX:
+                start = prefix_start.get(match.start, match.start)
+                prefix_start[match.end] = min(prefix_start.get(match.end, start), start)
+                continue
+            start = prefix_start.get(match.start, match.start)
+            if best is None or match.end - start > best.end - best.start:
+                best = Match(TITLE, start, match.end)
+        return best
+
+    def words(self) -> set:
+        """Return every word that appears in a dictionary phrase."""
+        return {word for transitions in self.goto for word in transitions}
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def read_titles(path: str) -> Iterator[str]:
+    """Yield the titles in a dictionary file, one per line, skipping blanks and "#" comments."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# jodie/pipeline/__init__.py
+from jodie.pipeline.pipeline import (
+    iter_json,
+    iter_records,
+    read_lines,
+    write_json_array,
+    write_ndjson
+)
+
+__all__ = (
+    "iter_json",
+    "iter_records",
+    "read_lines",
+    "write_json_array",
+    "write_ndjson"
+)
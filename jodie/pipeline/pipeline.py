@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# jodie/pipeline/pipeline.py
+import json
+import sys
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from jodie.parsers import parse_lines, parse_text
+
+# A path, "-" for stdin, an open text file, or any iterable of lines
+Source = Union[str, IO[str], Iterable[str]]
+
+# Formats of structured sources, read with `jodie.io.iter_rows` instead of being parsed
+ROW_FORMATS = ('csv', 'ndjson')
+
+
+def read_lines(source: Source) -> Iterator[str]:
+    """
+    Yield the lines of a source one at a time, without trailing newlines.
+    A path is opened on the first `next()` and closed when the generator finishes or is closed.
+
+    Args:
+        source: A path, "-" for stdin, an open text file, or an iterable of lines.
+
+    Yields:
+        str: One line.
+    """
+    if source == '-':
+        source = sys.stdin
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as stream:
+            for line in stream:
+                yield line.rstrip('\r\n')
+        return
+    for line in source:
+        yield line.rstrip('\r\n')
+
+
+def iter_records(source: Source, fmt: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream contact records out of a source, one per input record, reading lazily.
+
+    Plain text is parsed with `parse_text`, one record per line. CSV and NDJSON sources are
+    read with `jodie.io.iter_rows`, one record per row. Memory use does not grow with the input.
+
+    Args:
+        source: A path, "-" for stdin, an open text file, or an iterable of lines.
+        fmt (str, optional): "text", "csv" or "ndjson". Defaults to "text".
+
+    Yields:
+        dict: The fields of one record, shaped like the output of `parse_auto`
+            for text and like `Contact` keyword arguments for CSV / NDJSON rows.
+    """
+    if fmt in ROW_FORMATS:
+        import jodie.io
+        yield from jodie.io.iter_rows(source, fmt)
+        return
+    for line in read_lines(source):
+        yield parse_text(line)
+
+
+def iter_json(source: Source, jobs: int = 1) -> Iterator[str]:
+    """
+    Parse each line of a text source and yield the results serialized as JSON, in input order.
+
+    Args:
+        source: A path, "-" for stdin, an open text file, or an iterable of lines.
+        jobs (int): Worker processes. 1 parses in-process and yields each record as soon as
+            its line is read; more parse chunks of lines in parallel, see `parse_lines`.
+
+    Yields:
+        str: One JSON object per input line.
+    """
+    if jobs == 1:
+        for record in iter_records(source):
+            yield json.dumps(record)
+    else:
+        yield from parse_lines(read_lines(source), jobs=jobs)
+
+
+def write_ndjson(records: Iterable[Union[str, dict]], stream: IO[str]) -> int:
+    """
+    Write one JSON object per line, flushing after each so readers such as `jq` see it right away.
+
+    Args:
+        records: Dicts, or strings that are already JSON.
+        stream: A text stream, e.g. sys.stdout.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    for record in records:
+        stream.write((record if isinstance(record, str) else json.dumps(record)) + '\n')
+        stream.flush()
+        count += 1
+    return count
+
+
+def write_json_array(records: Iterable[Union[str, dict]], stream: IO[str]) -> int:
+    """
+    Write records as a single JSON array, one element per line, without holding them all in memory.
+
+    Args:
+        records: Dicts, or strings that are already JSON.
+        stream: A text stream, e.g. sys.stdout.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    stream.write('[')
+    for record in records:
+        stream.write(',\n' if count else '\n')
+        stream.write(record if isinstance(record, str) else json.dumps(record))
+        count += 1
+    stream.write('\n]\n' if count else ']\n')
+    return count
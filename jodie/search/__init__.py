@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# jodie/search/__init__.py
+from jodie.search.index import (
+    ContactIndex,
+    JournaledIndex,
+    append_journal,
+    build_index,
+    open_store_index,
+    write_index
+)
+from jodie.search.fulltext import (
+    TextIndex,
+    open_store_text_index,
+    parse_query,
+    write_text_index
+)
+
+__all__ = (
+    "ContactIndex",
+    "JournaledIndex",
+    "TextIndex",
+    "append_journal",
+    "build_index",
+    "open_store_index",
+    "open_store_text_index",
+    "parse_query",
+    "write_index",
+    "write_text_index"
+)
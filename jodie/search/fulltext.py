@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# jodie/search/fulltext.py
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from jodie.search.index import DOC, WORD, JournaledIndex, _write_array, normalize
+
+MAGIC = b"JODIETX1"
+
+# magic, number of contacts, number of terms, position of the contact table, position of the term table,
+# position of the contact lengths, total length of all contacts in words
+HEADER = struct.Struct('<8sQQQQQQ')
+
+# Before each term: its length and the number of contacts it occurs in. Then the term, and two blocks:
+# the contacts' numbers, delta-encoded, and how often the term occurs in each.
+TERM = struct.Struct('<HI')
+
+# Before each block of integers: how they are stored, and the length of the block in bytes
+BLOCK = struct.Struct('<BI')
+
+# Blocks hold integers in the narrowest of these array types that fits them, zlib-compressed
+# if that is smaller. The low bits of a block's flags index TYPECODES.
+TYPECODES = 'BHI'
+COMPRESSED = 0x80
+
+# Blocks shorter than this are never worth compressing
+COMPRESS_BYTES = 64
+
+# Fields whose words are indexed
+TEXT_FIELDS = ('note', 'job_title', 'company')
+
+# Fields kept for each contact: enough to show it, and to check phrases against
+TEXT_DOC_FIELDS = ('identifier', 'first_name', 'last_name', 'email', 'job_title', 'company', 'note')
+
+# Terms are words; a contact's identifier is stored as a term starting with IDENTIFIER, which no word does
+IDENTIFIER = b'\x00'
+
+# BM25 parameters: how quickly repeated words stop counting, and how much long texts are discounted
+K1 = 1.2
+B = 0.75
+
+# A quoted phrase or a single word of a query
+QUERY_TOKEN = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def pack_ints(values: Sequence[int], delta: bool = False) -> bytes:
+    """
+    Encode integers as a block: a BLOCK header, then the integers in the narrowest array type that fits,
+    zlib-compressed when that saves space. With `delta`, sorted integers are stored as the differences
+    between neighbours, which are small and compress well.
+    """
+    if delta:
+        values = [value - previous for previous, value in zip([0, *values], values)]
+    largest = max(values, default=0)
+    code = next((code for code in TYPECODES if largest < 1 << 8 * array(code).itemsize), 'I')
+    numbers = array(code, values)
+    if sys.byteorder == 'big':
+        numbers.byteswap()
+    data, flags = numbers.tobytes(), TYPECODES.index(code)
+    if len(data) >= COMPRESS_BYTES:
+        compressed = zlib.compress(data)
+        if len(compressed) < len(data):
+            data, flags = compressed, flags | COMPRESSED
+    return BLOCK.pack(flags, len(data)) + data
+
+
+def unpack_ints(buffer: Any, position: int, delta: bool = False) -> Tuple[Sequence[int], int]:
+    """
+    Decode the block written by `pack_ints` at `position` of `buffer`.
+
+    Returns:
+        tuple: The integers, and the position after the block.
+    """
+    flags, length = BLOCK.unpack_from(buffer, position)
+    start = position + BLOCK.size
+    data = buffer[start:start + length]
+    if flags & COMPRESSED:
+        data = zlib.decompress(data)
+    numbers = array(TYPECODES[flags & ~COMPRESSED])
+    numbers.frombytes(data)
+    if sys.byteorder == 'big':
+        numbers.byteswap()
+    return (list(accumulate(numbers)) if delta else numbers), start + length
+
+
+def text_words(doc: Mapping[str, Any]) -> List[List[str]]:
+    """The normalized words of each text field of a contact."""
+    return [WORD.findall(normalize(doc.get(field) or '')) for field in TEXT_FIELDS]
+
+
+def parse_query(query: str) -> List[List[List[str]]]:
+    """
+    Parse a `jodie search` query into groups joined by OR, each a list of clauses that must all match.
+    A clause is a list of words that must appear in that order: a quoted phrase, or a single word.
+
+        parse_query('pycon "machine learning" OR berlin')
+        -> [[["pycon"], ["machine", "learning"]], [["berlin"]]]
+
+    "AND" between words is accepted and changes nothing. Words that split further, such as "o'neil",
+    are matched as a phrase.
+    """
+    groups: List[List[List[str]]] = [[]]
+    for match in QUERY_TOKEN.finditer(query):
+        phrase, word = match.groups()
+        if word == 'OR':
+            groups.append([])
+        elif word != 'AND':
+            words = WORD.findall(normalize(phrase if phrase is not None else word))
+            if words:
+                groups[-1].append(words)
+    return [group for group in groups if group]
+
+
+def has_phrase(words: List[List[str]], phrase: List[str]) -> bool:
+    """Whether `phrase` occurs in one of the fields split into `words` by `text_words`."""
+    size = len(phrase)
+    return any(field[i:i + size] == phrase for field in words for i in range(len(field) - size + 1))
+
+
+class TextIndex(JournaledIndex):
+    """
+    Full-text index over contacts' notes, job titles and companies, answering `jodie search`.
+
+    An inverted index in a memory-mapped file: a sorted table of words, each with the numbers of the
+    contacts it occurs in and how often, stored as compressed blocks of delta-encoded integers (see
+    `pack_ints`). Queries read only the words they name. Results are ranked with BM25.
+
+    Phrases are checked against the text of the contacts that contain all their words rather than
+    against stored word positions, which keeps the file small.
+    """
+    MAGIC = MAGIC
+    HEADER = HEADER
+    description = "text index"
+    _lengths_start = _total_length = 0
+    _stored_lengths: Optional[array] = None
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._postings: Dict[bytes, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+
+    def _load(self) -> None:
+        super()._load()
+        self._lengths_start, self._total_length = HEADER.unpack_from(self._map, 0)[5:]
+        self._stored_lengths = None
+
+    @staticmethod
+    def write(records: Iterable[Mapping[str, Any]], path: str) -> int:
+        return write_text_index(records, path)
+
+    def as_doc(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        return {field: record[field] for field in TEXT_DOC_FIELDS if record.get(field)}
+
+    def _add(self, number: int, doc: Dict[str, Any]) -> None:
+        words = [word for field in text_words(doc) for word in field]
+        self._lengths.append(len(words))
+        self._postings[IDENTIFIER + doc['identifier'].encode('utf-8')][number] = 1
+        for word, count in Counter(words).items():
+            self._postings[word.encode('utf-8')][number] = count
+
+    def _term_at(self, i: int) -> Tuple[bytes, int]:
+        """The term at position `i` of the sorted term table, and where its blocks start."""
+        position = struct.unpack_from('<Q', self._map, self._terms_start + i * 8)[0]
+        length = TERM.unpack_from(self._map, position)[0]
+        start = position + TERM.size
+        return self._map[start:start + length], start + length
+
+    def _stored(self, term: bytes) -> Dict[int, int]:
+        """The contacts of the file that contain `term`, and how often."""
+        low, high = 0, self._terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle)[0] < term:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._terms:
+            return {}
+        found, position = self._term_at(low)
+        if found != term:
+            return {}
+        numbers, position = unpack_ints(self._map, position, delta=True)
+        counts, _ = unpack_ints(self._map, position)
+        return dict(zip(numbers, counts))
+
+    def _lookup(self, identifier: str) -> Optional[int]:
+        return next(iter(self._stored(IDENTIFIER + identifier.encode('utf-8'))), None)
+
+    def postings(self, word: str) -> Dict[int, int]:
+        """
+        The contacts containing a normalized word, and how often.
+
+        Returns:
+            dict: Occurrences by contact number.
+        """
+        term = word.encode('utf-8')
+        found = self._stored(term) if self._map is not None else {}
+        found.update(self._postings.get(term, {}))
+        for number in self._dead.intersection(found):
+            del found[number]
+        return found
+
+    def lengths(self) -> Sequence[int]:
+        """The number of words indexed for each contact, by contact number."""
+        if self._stored_lengths is None:
+            self._stored_lengths = array('I')
+            if self._map is not None:
+                self._stored_lengths.frombytes(self._map[self._lengths_start:self._lengths_start + self._count * 4])
+                if sys.byteorder == 'big':
+                    self._stored_lengths.byteswap()
+        return self._stored_lengths + array('I', self._lengths)
+
+    def _average_length(self, lengths: Sequence[int]) -> float:
+        total = self._total_length + sum(self._lengths) - sum(lengths[number] for number in self._dead)
+        return total / len(self) if len(self) else 0.0
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find contacts whose notes, job title or company match `query`, best first by BM25.
+
+        Args:
+            query (str): Words that must all occur, "quoted phrases", and OR between alternatives,
+                e.g. 'pycon "machine learning" OR berlin'. Case and accents are ignored.
+            limit (int): Most contacts to return.
+
+        Returns:
+            list: The stored fields of each matching contact, with its "score".
+        """
+        groups = parse_query(query)
+        if not groups or limit < 1:
+            return []
+        postings = {word: self.postings(word)
+                    for group in groups for clause in group for word in clause}
+
+        # The contacts with all the words of each group, and the phrases they must then contain
+        candidates: List[Tuple[set, List[List[str]]]] = []
+        for group in groups:
+            # Intersect the rarest words first
+            words = sorted({word for clause in group for word in clause}, key=lambda word: len(postings[word]))
+            matched = set(postings[words[0]]).intersection(*(postings[word] for word in words[1:]))
+            candidates.append((matched, [clause for clause in group if len(clause) > 1]))
+        matches = set().union(*(matched for matched, _ in candidates))
+
+        lengths = self.lengths()
+        contacts, average = len(self), self._average_length(lengths)
+        scores: Dict[int, float] = dict.fromkeys(matches, 0.0)
+        # BM25: idf * count * (K1 + 1) / (count + K1 * (1 - B + B * length / average)), with the constants hoisted
+        fixed, per_word = (K1 * (1 - B), K1 * B / average) if average else (K1, 0.0)
+        for found in postings.values():
+            weight = (K1 + 1) * math.log(1 + (contacts - len(found) + 0.5) / (len(found) + 0.5))
+            for number in (matches.intersection(found) if len(found) > len(matches) else found):
+                if number in scores:
+                    count = found[number]
+                    scores[number] += weight * count / (count + fixed + per_word * lengths[number])
+
+        def ranking(number: int) -> Tuple[float, int]:
+            return -scores[number], number
+
+        if not any(phrases for _, phrases in candidates):
+            best = heapq.nsmallest(limit, scores, key=ranking)
+            return [{**self.doc(number), "score": round(scores[number], 4)} for number in best]
+
+        # Phrases are checked best first, so only as many contacts are read as it takes to fill `limit`
+        results = []
+        for number in sorted(scores, key=ranking):
+            doc = self.doc(number)
+            words = text_words(doc)
+            if any(number in matched and all(has_phrase(words, phrase) for phrase in phrases)
+                   for matched, phrases in candidates):
+                results.append({**doc, "score": round(scores[number], 4)})
+                if len(results) == limit:
+                    break
+        return results
+
+
+def write_text_index(records: Iterable[Mapping[str, Any]], path: str) -> int:
+    """
+    Write a `TextIndex` file for `records`, replacing `path` atomically. The journal is left alone.
+
+    Args:
+        records: Store records, each with an "identifier".
+        path (str): Where to write the index.
+
+    Returns:
+        int: The number of contacts indexed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    postings: Dict[bytes, Tuple[array, array]] = defaultdict(lambda: (array('I'), array('I')))
+    doc_offsets, lengths = array('Q'), array('I')
+    with open(temporary, 'wb') as f:
+        f.seek(HEADER.size)
+        position = HEADER.size
+        for number, record in enumerate(records):
+            doc = {field: record[field] for field in TEXT_DOC_FIELDS if record.get(field)}
+            data = json.dumps(doc, ensure_ascii=False).encode('utf-8')
+            doc_offsets.append(position)
+            f.write(DOC.pack(len(data)) + data)
+            position += DOC.size + len(data)
+            words = [word for field in text_words(doc) for word in field]
+            lengths.append(len(words))
+            counts = Counter(word.encode('utf-8') for word in words)
+            counts[IDENTIFIER + doc['identifier'].encode('utf-8')] = 1
+            for term, count in counts.items():
+                numbers, occurrences = postings[term]
+                numbers.append(number)
+                occurrences.append(count)
+        docs_start = position
+        _write_array(f, doc_offsets)
+        position += len(doc_offsets) * 8
+        lengths_start = position
+        total_length = sum(lengths)
+        _write_array(f, lengths)
+        position += len(lengths) * 4
+
+        term_offsets = array('Q')
+        for term in sorted(postings):
+            numbers, occurrences = postings.pop(term)
+            entry = TERM.pack(len(term), len(numbers)) + term + pack_ints(numbers, delta=True) + pack_ints(occurrences)
+            term_offsets.append(position)
+            f.write(entry)
+            position += len(entry)
+        terms_start = position
+        _write_array(f, term_offsets)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(doc_offsets), len(term_offsets), docs_start, terms_start,
+                            lengths_start, total_length))
+    os.replace(temporary, path)
+    return len(doc_offsets)
+
+
+def open_store_text_index(store: Any, rebuild: bool = False) -> TextIndex:
+    """
+    The `jodie search` index of a store: opened from the store's text index file, which is built first
+    if it does not exist yet or `rebuild` is set. Stores without an index file are indexed in memory.
+
+    Args:
+        store: A `ContactStore`.
+        rebuild (bool): Re-read every contact from the store, e.g. after edits made in Contacts.app.
+
+    Returns:
+        TextIndex: The open index.
+    """
+    return TextIndex.for_store(store, store.text_index_path, rebuild)
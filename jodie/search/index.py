@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+# jodie/search/index.py
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+MAGIC = b"JODIEIX1"
+
+# magic, number of contacts, number of terms, position of the contact table, position of the term table
+HEADER = struct.Struct('<8sQQQQ')
+
+# Before each contact's JSON: its length
+DOC = struct.Struct('<I')
+
+# Before each term: its length, how its contacts are stored, and how many numbers or bytes that takes
+TERM = struct.Struct('<HBI')
+
+# Contacts are stored as an array of uint32 numbers, or as a bitmap where that takes less than
+# BITMAP_RATIO bytes per contact: reading a bitmap is one call, while an array is converted in a loop
+NUMBERS, BITMAP = 0, 1
+BITMAP_RATIO = 32
+
+# Each term starts with a byte naming its field, so every field is its own sorted range: its own trie
+IDENTIFIER, FIRST_NAME, LAST_NAME, EMAIL_LOCAL, EMAIL_DOMAIN, COMPANY = (bytes([tag]) for tag in range(6))
+
+# A trie node with more terms than NODE_TERMS beneath it is also stored as a term of its own, listing
+# every contact under it, so no prefix lookup reads more. Its key is the prefix followed by NODE, which
+# no word contains, so it sorts straight after the prefix itself.
+NODE = b'\x00'
+NODE_TERMS = 16
+
+# Field names accepted in "field:prefix" query tokens
+FIELDS = {
+    "first": FIRST_NAME,
+    "last": LAST_NAME,
+    "email": EMAIL_LOCAL,
+    "domain": EMAIL_DOMAIN,
+    "company": COMPANY,
+}
+
+# How much a prefix match in each field counts; an exact term match counts double
+WEIGHTS = {FIRST_NAME: 3, LAST_NAME: 3, EMAIL_LOCAL: 2, EMAIL_DOMAIN: 1, COMPANY: 1}
+
+# Fields kept for each contact, so results can be shown without opening the store
+DOC_FIELDS = ('identifier', 'first_name', 'last_name', 'email', 'phone', 'job_title', 'company')
+
+# Fields written to journals: all that any index of jodie.search keeps
+JOURNAL_FIELDS = DOC_FIELDS + ('note',)
+
+# Journal size above which opening the index folds the journal into a new index file
+COMPACT_BYTES = 1024 * 1024
+
+WORD = re.compile(r"[^\W_]+")
+NONZERO = re.compile(rb"[^\x00]")
+
+# The contacts a term occurs in: a bitmap, or their numbers
+Contacts = Union[int, Iterable[int]]
+Matches = Union[int, Set[int]]
+
+
+def normalize(text: str) -> str:
+    """Casefold `text` and strip accents, so "Zoë" and "zoe" index and match alike."""
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def doc_terms(doc: Mapping[str, Any]) -> Set[bytes]:
+    """
+    The terms a contact is indexed under, each prefixed with its field's tag:
+    the words of the first name, last name and company, the email local part (whole and split
+    into words), and the email domain and its parent domains.
+    """
+    terms = {IDENTIFIER + doc['identifier'].encode('utf-8')}
+    for tag, field in ((FIRST_NAME, 'first_name'), (LAST_NAME, 'last_name'), (COMPANY, 'company')):
+        terms.update(tag + word.encode('utf-8') for word in WORD.findall(normalize(doc.get(field) or '')))
+    local, _, domain = normalize(doc.get('email') or '').strip().rpartition('@')
+    if local:
+        terms.add(EMAIL_LOCAL + local.encode('utf-8'))
+        terms.update(EMAIL_LOCAL + word.encode('utf-8') for word in WORD.findall(local))
+    while domain.count('.') >= 1:
+        terms.add(EMAIL_DOMAIN + domain.encode('utf-8'))
+        domain = domain.partition('.')[2]
+    return terms
+
+
+def to_bitmap(numbers: Iterable[int]) -> int:
+    """A set of contact numbers as an int with those bits set, on which set operations run at C speed."""
+    numbers = list(numbers)
+    if not numbers:
+        return 0
+    bits = bytearray(max(numbers) // 8 + 1)
+    for number in numbers:
+        bits[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _union(listed: List[Contacts], dense: bool) -> Matches:
+    """The union of several terms' contacts, as a bitmap if `dense`, otherwise as a set."""
+    if not dense:
+        return set().union(*listed)
+    bitmap, numbers = 0, []
+    for contacts in listed:
+        if isinstance(contacts, int):
+            bitmap |= contacts
+        else:
+            numbers.extend(contacts)
+    return bitmap | to_bitmap(numbers)
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """The contact numbers in a bitmap, in increasing order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for match in NONZERO.finditer(data):
+        byte, base = data[match.start()], match.start() * 8
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+def as_doc(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """The part of a store record that the index keeps."""
+    return {field: record[field] for field in DOC_FIELDS if record.get(field)}
+
+
+def query_terms(query: str) -> List[List[bytes]]:
+    """
+    Split a query into tokens, each a list of tagged prefixes of which any may match.
+    "jane acme" matches contacts with a word starting "jane" and one starting "acme" in any field;
+    "company:acme" only looks at company names, and "jane@acme" at email addresses.
+    """
+    tokens = []
+    for token in normalize(query).split():
+        field, _, text = token.rpartition(':')
+        tags = [FIELDS[field]] if field in FIELDS else list(WEIGHTS)
+        if field not in FIELDS:
+            text = token
+        if '@' in text:
+            local, _, domain = text.partition('@')
+            tokens.extend([EMAIL_LOCAL + word.encode('utf-8')] for word in WORD.findall(local))
+            if domain.strip('.'):
+                tokens.append([EMAIL_DOMAIN + domain.strip('.').encode('utf-8')])
+            continue
+        if tags == [EMAIL_DOMAIN]:
+            tokens.append([EMAIL_DOMAIN + text.strip('.').encode('utf-8')])
+            continue
+        # "o'neil" is two words, as it was when indexed
+        tokens.extend([tag + word.encode('utf-8') for tag in tags] for word in WORD.findall(text))
+    return tokens
+
+
+class JournaledIndex:
+    """
+    Base class of the indexes in jodie.search: a read-only file of contacts, numbered in the order they
+    were saved and memory-mapped, plus an in-memory overlay of the contacts saved since it was written.
+
+    Saves and deletes are appended to a journal next to the file (see `append_journal`) rather than
+    rewriting it. The journal is replayed into the overlay on open, and folded into a new file once it
+    is larger than COMPACT_BYTES. An index without a path lives in memory only.
+
+    Subclasses set MAGIC and HEADER, whose first fields are the magic, the number of contacts, the number
+    of terms and the positions of the contact and term tables, and implement `as_doc`, `_add`, `_lookup`
+    and `write`.
+    """
+    MAGIC: bytes
+    HEADER: struct.Struct
+    description = "index"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Args:
+            path (str, optional): The index file. The journal is `path + ".journal"`.
+        """
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._count = self._terms = self._docs_start = self._terms_start = 0
+        self._clear()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _clear(self) -> None:
+        """Empty the overlay."""
+        # Contacts saved since the file was written, numbered on from the file's contacts
+        self._overlay: List[Dict[str, Any]] = []
+        self._numbers: Dict[str, int] = {}
+        # Contacts that were deleted or replaced by a later save, as a set and as a bitmap
+        self._dead: Set[int] = set()
+        self._dead_bits = 0
+
+    def _load(self) -> None:
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._terms, self._docs_start, self._terms_start = \
+            self.HEADER.unpack_from(self._map, 0)[:5]
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{self.path!r} is not a jodie {self.description}.")
+
+    @classmethod
+    def open(cls, path: str) -> 'JournaledIndex':
+        """Open the index at `path` and replay its journal, compacting both into a new file if the journal is long."""
+        index = cls(path)
+        journal = f"{path}.journal"
+        if os.path.exists(journal) and os.path.getsize(journal) > COMPACT_BYTES:
+            # Set the journal aside first, so saves made while compacting go to a new one
+            replaying = f"{journal}.{os.getpid()}"
+            os.replace(journal, replaying)
+            index.replay(replaying)
+            index.compact()
+            os.remove(replaying)
+        index.replay(journal)
+        return index
+
+    @classmethod
+    def build(cls, records: Iterable[Mapping[str, Any]], path: str) -> 'JournaledIndex':
+        """
+        Index every contact of a store from scratch, e.g. `build(store.iter_all(), path)`.
+        Journal entries from before the build are dropped; saves made while it runs are kept.
+
+        Returns:
+            The new index, opened.
+        """
+        journal = f"{path}.journal"
+        previous = f"{journal}.{os.getpid()}"
+        if os.path.exists(journal):
+            os.replace(journal, previous)
+        # Stores journal their saves once either the index or its journal exists, so creating the journal
+        # first keeps saves made while a first build runs, before there is an index file
+        open(journal, 'a').close()
+        try:
+            cls.write(records, path)
+        except BaseException:
+            if not os.path.exists(path):
+                os.remove(journal)
+            raise
+        finally:
+            if os.path.exists(previous):
+                os.remove(previous)
+        return cls.open(path)
+
+    @classmethod
+    def for_store(cls, store: Any, path: Optional[str], rebuild: bool = False) -> 'JournaledIndex':
+        """
+        Open a store's index at `path`, building it first if it does not exist yet or `rebuild` is set.
+        Without a path, the store's contacts are indexed in memory.
+        """
+        if path is None:
+            index = cls()
+            index.update(store.iter_all())
+            return index
+        if rebuild or not os.path.exists(path):
+            return cls.build(store.iter_all(), path)
+        return cls.open(path)
+
+    @staticmethod
+    def write(records: Iterable[Mapping[str, Any]], path: str) -> int:
+        """Write an index file for `records`, replacing `path` atomically, and return how many were indexed."""
+        raise NotImplementedError
+
+    def as_doc(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        """The part of a store record that the index keeps."""
+        raise NotImplementedError
+
+    def _add(self, number: int, doc: Dict[str, Any]) -> None:
+        """Index an overlay contact's terms."""
+        raise NotImplementedError
+
+    def _lookup(self, identifier: str) -> Optional[int]:
+        """The number of a contact in the file."""
+        raise NotImplementedError
+
+    def replay(self, journal: str) -> None:
+        """Apply the saves and deletes recorded in a journal file to the overlay."""
+        if not os.path.exists(journal):
+            return
+        with open(journal, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                if 'deleted' in entry:
+                    self.remove([entry['deleted']])
+                else:
+                    self.update([entry])
+
+    def _number(self, identifier: str) -> Optional[int]:
+        """The current number of a contact, looked up in the overlay and then in the file."""
+        number = self._numbers.get(identifier)
+        if number is None and self._map is not None:
+            number = self._lookup(identifier)
+        return None if number in self._dead else number
+
+    def update(self, records: Iterable[Mapping[str, Any]]) -> None:
+        """Add contacts to the overlay, replacing earlier versions saved under the same identifier."""
+        for record in records:
+            doc = self.as_doc(record)
+            self.remove([doc['identifier']])
+            number = self._count + len(self._overlay)
+            self._overlay.append(doc)
+            self._numbers[doc['identifier']] = number
+            self._add(number, doc)
+
+    def remove(self, identifiers: Iterable[str]) -> None:
+        """Delete contacts from the index."""
+        for identifier in identifiers:
+            number = self._number(identifier)
+            if number is not None:
+                self._dead.add(number)
+                self._dead_bits |= 1 << number
+
+    def __len__(self) -> int:
+        return self._count + len(self._overlay) - len(self._dead)
+
+    def doc(self, number: int) -> Dict[str, Any]:
+        """The stored fields of contact `number`."""
+        if number >= self._count:
+            return self._overlay[number - self._count]
+        position = struct.unpack_from('<Q', self._map, self._docs_start + number * 8)[0]
+        length = DOC.unpack_from(self._map, position)[0]
+        return json.loads(self._map[position + DOC.size:position + DOC.size + length])
+
+    def iter_docs(self) -> Iterator[Dict[str, Any]]:
+        """Every indexed contact, in the order they were saved."""
+        for number in range(self._count + len(self._overlay)):
+            if number not in self._dead:
+                yield self.doc(number)
+
+    def compact(self) -> None:
+        """Rewrite the index file with the overlay folded in, and empty the overlay."""
+        self.write(self.iter_docs(), self.path)
+        self.close()
+        self._clear()
+        self._load()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._count = self._terms = 0
+
+    def __enter__(self) -> 'JournaledIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ContactIndex(JournaledIndex):
+    """
+    Typeahead index over a store's contacts, answering `jodie find`.
+
+    Each field is a trie laid out as a sorted run of terms in a memory-mapped file: the terms under a
+    prefix are one contiguous range, found with a binary search, and each term lists the numbers of
+    the contacts it occurs in. Opening the file reads only its header, and a query touches a few pages.
+    Ranking works on sets of contact numbers, so its cost depends little on how many contacts match.
+    """
+    MAGIC = MAGIC
+    HEADER = HEADER
+    description = "contact index"
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._postings: Dict[bytes, Set[int]] = defaultdict(set)
+        self._keys: Optional[List[bytes]] = []
+
+    @staticmethod
+    def write(records: Iterable[Mapping[str, Any]], path: str) -> int:
+        return write_index(records, path)
+
+    def as_doc(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        return as_doc(record)
+
+    def _add(self, number: int, doc: Dict[str, Any]) -> None:
+        for term in doc_terms(doc):
+            self._postings[term].add(number)
+        self._keys = None
+
+    def _lookup(self, identifier: str) -> Optional[int]:
+        for _, contacts in self._scan(IDENTIFIER + identifier.encode('utf-8'), exact=True):
+            return next(iter_bits(contacts)) if isinstance(contacts, int) else min(contacts)
+        return None
+
+    def _term_at(self, i: int) -> Tuple[bytes, int, int, int]:
+        """The term at position `i` of the sorted term table, and where and how its contacts are stored."""
+        mapped = self._map
+        position = struct.unpack_from('<Q', mapped, self._terms_start + i * 8)[0]
+        length, kind, count = TERM.unpack_from(mapped, position)
+        start = position + TERM.size
+        return mapped[start:start + length], start + length, kind, count
+
+    def _find_term(self, term: bytes) -> int:
+        """The position of the first term in the file not less than `term`."""
+        low, high = 0, self._terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle)[0] < term:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _contacts_at(self, start: int, kind: int, count: int) -> Contacts:
+        if kind == BITMAP:
+            return int.from_bytes(self._map[start:start + count], 'little')
+        numbers = array('I')
+        numbers.frombytes(self._map[start:start + count * 4])
+        if sys.byteorder == 'big':
+            numbers.byteswap()
+        return numbers
+
+    def _scan(self, prefix: bytes, exact: bool = False) -> Iterator[Tuple[bytes, Contacts]]:
+        """
+        Yield (term, contacts) for each term starting with `prefix`, from the file then the overlay,
+        where contacts is a bitmap or a collection of contact numbers. Where the file has a trie node for
+        `prefix`, it stands in for all the terms beneath it except `prefix` itself, and is yielded as (node, contacts).
+        """
+        if self._map is not None:
+            for i in range(self._find_term(prefix), self._terms):
+                term, *stored = self._term_at(i)
+                if not term.startswith(prefix) or (exact and term != prefix):
+                    break
+                if term.endswith(NODE):
+                    # Either the node of `prefix`, standing in for the rest, or of a longer prefix in range
+                    if term == prefix + NODE:
+                        yield term, self._contacts_at(*stored)
+                        break
+                    continue
+                yield term, self._contacts_at(*stored)
+
+        if self._keys is None:
+            self._keys = sorted(self._postings)
+        keys = self._keys
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix) or (exact and keys[i] != prefix):
+                return
+            yield keys[i], self._postings[keys[i]]
+
+    def _tiers(self, prefixes: List[bytes]) -> List[Tuple[int, Matches]]:
+        """
+        Group the contacts matching one query token by how well they match: (weight, contacts) pairs,
+        best first, each contact only in its best tier. Contacts are a set of numbers, or a bitmap
+        if any term matched is stored as one; bitmaps are quicker for many contacts, sets for a few.
+        """
+        matched: Dict[int, List[Contacts]] = defaultdict(list)
+        for prefix in prefixes:
+            weight = WEIGHTS[prefix[:1]]
+            for term, contacts in self._scan(prefix):
+                matched[weight * 2 if term == prefix else weight].append(contacts)
+        dense = any(isinstance(contacts, int) for listed in matched.values() for contacts in listed)
+        tiers, seen = [], self._dead_bits if dense else self._dead
+        for weight in sorted(matched, reverse=True):
+            contacts = _union(matched[weight], dense)
+            contacts = contacts & ~seen if dense else contacts - seen
+            if contacts:
+                tiers.append((weight, contacts))
+                seen = seen | contacts
+        return tiers
+
+    def find(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find contacts matching every token of `query` as a prefix, best matches first.
+
+        A contact's score is the sum over tokens of its best match: exact words beat prefixes, and names
+        beat email addresses, which beat domains and companies.
+
+        Args:
+            query (str): e.g. "jan", "jane acme", "company:acme" or "jane@acme.co".
+            limit (int): Most contacts to return.
+
+        Returns:
+            list: The stored fields of each matching contact.
+        """
+        tokens = query_terms(query)
+        if not tokens or limit < 1:
+            return []
+        tiers = [self._tiers(prefixes) for prefixes in tokens]
+        if not all(tiers):
+            return []
+        if any(isinstance(token[0][1], int) for token in tiers):
+            tiers = [[(weight, to_bitmap(contacts) if isinstance(contacts, set) else contacts)
+                      for weight, contacts in token] for token in tiers]
+
+        # Visit combinations of one tier per token from the highest total weight down until `limit`
+        # contacts are found. Tiers of one token are disjoint, so no contact is found twice.
+        results: List[int] = []
+        start = (0,) * len(tiers)
+        heap = [(-sum(token[0][0] for token in tiers), start)]
+        queued = {start}
+        while heap and len(results) < limit:
+            score, combination = heapq.heappop(heap)
+            matches = tiers[0][combination[0]][1]
+            for token, tier in enumerate(combination[1:], 1):
+                matches = matches & tiers[token][tier][1]
+            wanted = limit - len(results)
+            results.extend(islice(iter_bits(matches), wanted) if isinstance(matches, int)
+                           else heapq.nsmallest(wanted, matches))
+            for token in range(len(tiers)):
+                following = combination[:token] + (combination[token] + 1,) + combination[token + 1:]
+                if following[token] < len(tiers[token]) and following not in queued:
+                    queued.add(following)
+                    heapq.heappush(heap, (score + tiers[token][combination[token]][0]
+                                          - tiers[token][following[token]][0], following))
+        return [self.doc(number) for number in results]
+
+
+def _write_array(f, values: array) -> None:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    f.write(values.tobytes())
+
+
+def trie_nodes(postings: Mapping[bytes, array]) -> Dict[bytes, array]:
+    """
+    The busy nodes of the term trie: every prefix with more than NODE_TERMS terms beneath it,
+    keyed by the prefix and NODE, with the union of their contacts.
+    """
+    counts = Counter(term[:end] for term in postings if term[:1] != IDENTIFIER for end in range(2, len(term) + 1))
+    merged: Dict[bytes, Set[int]] = defaultdict(set)
+    for term, numbers in postings.items():
+        if term[:1] == IDENTIFIER:
+            continue
+        for end in range(2, len(term) + 1):
+            if counts[term[:end]] > NODE_TERMS:
+                merged[term[:end] + NODE].update(numbers)
+    return {node: array('I', sorted(numbers)) for node, numbers in merged.items()}
+
+
+def _write_term(f, term: bytes, numbers: array) -> int:
+    """Write a term and its sorted contact numbers, and return the number of bytes written."""
+    size = numbers[-1] // 8 + 1
+    if size < len(numbers) * BITMAP_RATIO:
+        data = to_bitmap(numbers).to_bytes(size, 'little')
+        f.write(TERM.pack(len(term), BITMAP, size) + term + data)
+        return TERM.size + len(term) + size
+    f.write(TERM.pack(len(term), NUMBERS, len(numbers)) + term)
+    _write_array(f, numbers)
+    return TERM.size + len(term) + len(numbers) * 4
+
+
+def write_index(records: Iterable[Mapping[str, Any]], path: str) -> int:
+    """
+    Write a `ContactIndex` file for `records`, replacing `path` atomically. The journal is left alone.
+
+    Args:
+        records: Store records, each with an "identifier".
+        path (str): Where to write the index.
+
+    Returns:
+        int: The number of contacts indexed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    postings: Dict[bytes, array] = defaultdict(lambda: array('I'))
+    doc_offsets = array('Q')
+    with open(temporary, 'wb') as f:
+        f.seek(HEADER.size)
+        position = HEADER.size
+        for number, record in enumerate(records):
+            doc = as_doc(record)
+            data = json.dumps(doc, ensure_ascii=False).encode('utf-8')
+            doc_offsets.append(position)
+            f.write(DOC.pack(len(data)) + data)
+            position += DOC.size + len(data)
+            for term in doc_terms(doc):
+                postings[term].append(number)
+        docs_start = position
+        _write_array(f, doc_offsets)
+        position += len(doc_offsets) * 8
+
+        postings.update(trie_nodes(postings))
+        term_offsets = array('Q')
+        for term in sorted(postings):
+            numbers = postings.pop(term)
+            term_offsets.append(position)
+            position += _write_term(f, term, numbers)
+        terms_start = position
+        _write_array(f, term_offsets)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(doc_offsets), len(term_offsets), docs_start, terms_start))
+    os.replace(temporary, path)
+    return len(doc_offsets)
+
+
+def build_index(records: Iterable[Mapping[str, Any]], path: str) -> ContactIndex:
+    """
+    Index every contact of a store from scratch, e.g. `build_index(store.iter_all(), path)`.
+    Journal entries from before the build are dropped; saves made while it runs are kept.
+
+    Returns:
+        ContactIndex: The new index, opened.
+    """
+    return ContactIndex.build(records, path)
+
+
+def open_store_index(store: Any, rebuild: bool = False) -> ContactIndex:
+    """
+    The `jodie find` index of a store: opened from the store's index file, which is built first if it
+    does not exist yet or `rebuild` is set. Stores without an index file are indexed in memory.
+
+    Args:
+        store: A `ContactStore`.
+        rebuild (bool): Re-read every contact from the store, e.g. after edits made in Contacts.app.
+
+    Returns:
+        ContactIndex: The open index.
+    """
+    return ContactIndex.for_store(store, store.index_path, rebuild)
+
+
+def append_journal(path: str, saved: Iterable[Mapping[str, Any]] = (), deleted: Iterable[str] = ()) -> None:
+    """
+    Record saved and deleted contacts in the journal of the index at `path`.
+    Each call is one append of whole lines, so concurrent writers do not interleave.
+    """
+    lines = [json.dumps({field: record[field] for field in JOURNAL_FIELDS if record.get(field)},
+                        ensure_ascii=False) + '\n' for record in saved]
+    lines.extend(json.dumps({"deleted": identifier}) + '\n' for identifier in deleted)
+    if lines:
+        with open(f"{path}.journal", 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# jodie/server/__init__.py
+from jodie.server.server import ContactServer, DEFAULT_SOCKET, serve
+
+__all__ = (
+    "ContactServer",
+    "DEFAULT_SOCKET",
+    "serve"
+)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# jodie/server/server.py
+import asyncio
+import json
+import os
+import signal
+from typing import Any, Optional
+
+from jodie.contact import ContactRecord, DedupStore, SaveQueue, get_store
+from jodie.contact.store import DATA_DIR
+from jodie.metrics import REGISTRY
+from jodie.parsers import TitleParser, contact_fields, parse_auto, split_text
+
+DEFAULT_SOCKET = os.path.join(DATA_DIR, 'jodie.sock')
+
+# Largest request line accepted from a client
+MAX_LINE = 1024 * 1024
+
+
+def parse_request_text(text: Any) -> dict:
+    """Run auto-detection on a request's "text": a list of arguments, or one string to split."""
+    arguments = split_text(text) if isinstance(text, str) else list(text)
+    return parse_auto(arguments)
+
+
+class ContactServer:
+    """
+    Long-running jodie process that answers newline-delimited JSON requests on a Unix socket.
+
+    Parsers and one open contact store stay warm between requests. Requests are one JSON object per line:
+
+        {"command": "parse", "text": "Jane Doe | CEO | jane@acme.com"}
+        {"command": "new", "fields": {"first_name": "Jane", "last_name": "Doe", "email": "jane@acme.com"}}
+        {"command": "new", "text": ["jane@acme.com", "Jane Doe", "CEO"]}
+        {"command": "ping"}
+        {"command": "metrics"}
+
+    and each gets one JSON line back with "ok" set to true or false. Saves from all clients go into
+    one `SaveQueue` and are committed together, up to `batch_size` contacts per commit, waiting at
+    most `linger` seconds for a batch to fill.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET, store: Optional[str] = None,
+                 batch_size: int = 500, linger: float = 0.05, on_duplicate: str = "create") -> None:
+        """
+        Args:
+            path (str): Unix socket path to listen on.
+            store (str, optional): Store spec for `get_store`.
+            batch_size (int): Maximum number of contacts per store commit.
+            linger (float): Seconds to wait for more saves before committing a partial batch.
+            on_duplicate (str): "skip", "merge" or "create", see `DedupStore`.
+        """
+        self.path = path
+        self.store_spec = store
+        self.on_duplicate = on_duplicate
+        self.saves = SaveQueue(self._open_store, batch_size=batch_size, linger=linger)
+
+    @property
+    def commits(self) -> int:
+        """Store commits made so far."""
+        return self.saves.commits
+
+    def _open_store(self):
+        store = get_store(self.store_spec)
+        if self.on_duplicate != "create":
+            store = DedupStore(store, on_duplicate=self.on_duplicate)
+        return store
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Open the store, warm up the parsers and start listening."""
+        await self.saves.start()
+        TitleParser.matcher()
+        parse_auto(["Jane Doe"])
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        return await asyncio.start_unix_server(self._handle_client, path=self.path, limit=MAX_LINE)
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled, then commit pending saves and close the store."""
+        server = await self.start()
+        task = asyncio.current_task()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            # SIGTERM, or the caller cancelled us
+            pass
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Commit anything still queued, close the store and remove the socket."""
+        await self.saves.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle(line)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # Client went away, or sent a line longer than MAX_LINE
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, line: bytes) -> dict:
+        """
+        Answer one request line.
+
+        Args:
+            line (bytes): A JSON object.
+
+        Returns:
+            dict: The response, with "ok" and either a result or "error".
+        """
+        try:
+            request = json.loads(line)
+            command = request.get("command")
+            if command == "parse":
+                return {"ok": True, "fields": parse_request_text(request["text"])}
+            if command == "new":
+                return await self._new(request)
+            if command == "ping":
+                return {"ok": True}
+            if command == "metrics":
+                return {"ok": True, "metrics": REGISTRY.snapshot()["metrics"]}
+            raise ValueError(f"Unknown command {command!r}.")
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    async def _new(self, request: dict) -> dict:
+        if "fields" in request:
+            fields = request["fields"]
+        else:
+            fields = contact_fields(parse_request_text(request["text"]))
+        contact = ContactRecord(**fields)
+        contact.validate()
+        identifier = await self.saves.save(contact)
+        return {"ok": True, "identifier": identifier, "contact": str(contact)}
+
+
+def serve(path: str = DEFAULT_SOCKET, store: Optional[str] = None, batch_size: int = 500,
+          on_duplicate: str = "create") -> None:
+    """Run a ContactServer until interrupted."""
+    server = ContactServer(path, store=store, batch_size=batch_size, on_duplicate=on_duplicate)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# jodie/trace/__init__.py
+from jodie.trace.trace import (
+    Profile,
+    Span,
+    Tracer,
+    disable,
+    enable,
+    enable_from_environment,
+    get_tracer,
+    span,
+    traced
+)
+
+enable_from_environment()
+
+__all__ = (
+    "Profile",
+    "Span",
+    "Tracer",
+    "disable",
+    "enable",
+    "enable_from_environment",
+    "get_tracer",
+    "span",
+    "traced"
+)
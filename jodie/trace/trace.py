@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# jodie/trace/trace.py
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict
+from functools import wraps
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Chrome-trace events kept per run; spans past this are still counted, just not drawn
+MAX_EVENTS = 1_000_000
+
+PERCENTILES = (50, 95, 99)
+
+# The active tracer. While it is None every span and traced function is a single global lookup.
+_tracer: Optional['Tracer'] = None
+
+
+class Tracer:
+    """
+    Collects the duration of every named span, and optionally a timeline for Chrome's trace viewer.
+    Durations are kept as nanoseconds in compact arrays, so millions of spans cost a few MB.
+    """
+
+    def __init__(self, timeline: bool = False) -> None:
+        """
+        Args:
+            timeline (bool): Also keep (start, duration, thread) of each span for `write_chrome_trace`.
+        """
+        self.durations: Dict[str, array] = defaultdict(lambda: array('q'))
+        self.events: Optional[List[Tuple[str, int, int, int]]] = None
+        if timeline:
+            import threading
+            self.events = []
+            self._thread_id = threading.get_ident
+        self.started = time.perf_counter_ns()
+
+    def add(self, name: str, start: int, end: int) -> None:
+        """Record one span, with start and end from `time.perf_counter_ns()`."""
+        self.durations[name].append(end - start)
+        if self.events is not None and len(self.events) < MAX_EVENTS:
+            self.events.append((name, start, end - start, self._thread_id()))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Summarize each span name.
+
+        Returns:
+            list: One dict per name, slowest total first, with count, total_ms, mean_us and p50_us / p95_us / p99_us.
+        """
+        rows = []
+        for name, durations in self.durations.items():
+            ordered = sorted(durations)
+            total = sum(ordered)
+            row = {"name": name, "count": len(ordered), "total_ms": total / 1e6,
+                   "mean_us": total / len(ordered) / 1e3}
+            for percentile in PERCENTILES:
+                # Nearest-rank percentile
+                rank = max(0, -(-percentile * len(ordered) // 100) - 1)
+                row[f"p{percentile}_us"] = ordered[rank] / 1e3
+            rows.append(row)
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def write_report(self, stream: IO[str]) -> None:
+        """Print a table of per-span counts, totals and latency percentiles."""
+        elapsed = (time.perf_counter_ns() - self.started) / 1e6
+        stream.write(f"{'span':<36} {'count':>9} {'total ms':>10} {'mean µs':>9} "
+                     f"{'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9}\n")
+        for row in self.stats():
+            stream.write(f"{row['name']:<36} {row['count']:>9,} {row['total_ms']:>10,.1f} {row['mean_us']:>9,.1f} "
+                         f"{row['p50_us']:>9,.1f} {row['p95_us']:>9,.1f} {row['p99_us']:>9,.1f}\n")
+        stream.write(f"{'wall time':<36} {'':>9} {elapsed:>10,.1f}\n")
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Save the timeline as Chrome trace JSON, for chrome://tracing or https://ui.perfetto.dev."""
+        import json
+
+        pid = os.getpid()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": [
+                {"name": name, "ph": "X", "ts": (start - self.started) / 1e3, "dur": duration / 1e3,
+                 "pid": pid, "tid": tid}
+                for name, start, duration, tid in self.events or ()
+            ], "displayTimeUnit": "ms"}, f)
+
+
+class Span:
+    """Times a `with` block into the active tracer."""
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.add(self.name, self.start, time.perf_counter_ns())
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """
+    Time a block of code while tracing is enabled:
+
+        with span("parse_auto.first_pass"):
+            ...
+    """
+    tracer = _tracer
+    return NO_SPAN if tracer is None else Span(tracer, name)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator that times every call of a function as a span named `name` while tracing is enabled."""
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.add(name, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+def enable(timeline: bool = False) -> Tracer:
+    """Start tracing, replacing any active tracer. Returns the new tracer."""
+    global _tracer
+    _tracer = Tracer(timeline=timeline)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stop tracing. Returns the tracer that was active, with everything it recorded."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+class Profile:
+    """
+    One profiled run, as started by `jodie --profile`: spans, and optionally cProfile.
+    Call `finish` at the end of the run to print the report and write the requested files.
+    """
+
+    def __init__(self, pstats: Optional[str] = None, chrome_trace: Optional[str] = None) -> None:
+        """
+        Args:
+            pstats (str, optional): Also run cProfile and save its stats here, for `python -m pstats`.
+            chrome_trace (str, optional): Save the span timeline here as Chrome trace JSON.
+        """
+        self.pstats = pstats
+        self.chrome_trace = chrome_trace
+        self.tracer = enable(timeline=bool(chrome_trace))
+        self.profiler = None
+        if pstats:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def finish(self, stream: Optional[IO[str]] = None) -> None:
+        """Stop profiling, print the report to `stream` (default: stderr) and write the requested files."""
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.pstats)
+        if get_tracer() is self.tracer:
+            disable()
+        self.tracer.write_report(stream or sys.stderr)
+        if self.chrome_trace:
+            self.tracer.write_chrome_trace(self.chrome_trace)
+
+
+def enable_from_environment() -> Optional[Profile]:
+    """
+    Start profiling if $JODIE_TRACE is set, e.g. JODIE_TRACE=1, or JODIE_TRACE=trace.json to also
+    save a Chrome trace. The report is printed to stderr when the process exits.
+    """
+    value = os.environ.get('JODIE_TRACE', '')
+    if value in ('', '0') or os.environ.get('JODIE_TRACE_PID', str(os.getpid())) != str(os.getpid()):
+        # Not set, or this is a worker process of a traced run; only the parent reports
+        return None
+    import atexit
+    os.environ['JODIE_TRACE_PID'] = str(os.getpid())
+    profile = Profile(chrome_trace=value if value.endswith('.json') else None)
+    atexit.register(profile.finish)
+    return profile
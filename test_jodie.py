@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 # test_jodie.py
 import jodie
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 from jodie.cli.__main__ import parse_auto  # Import parse_auto directly
 
@@ -50,6 +58,20 @@ def parse_args(which=1):
         }
 
 
+def write_archive(box, messages):
+    """Add (sender, reply-to, body) messages to a mailbox and close it."""
+    from email.message import EmailMessage
+    for sender, reply_to, body in messages:
+        message = EmailMessage()
+        message["From"] = sender
+        if reply_to:
+            message["Reply-To"] = reply_to
+        message["Subject"] = "Hello"
+        message.set_content(body)
+        box.add(message)
+    box.close()
+
+
 class TestJodie(unittest.TestCase):
     def test_parsing_order(self):
         """Test that fields are parsed in the correct order with proper precedence."""
@@ -104,6 +126,19 @@ class TestJodie(unittest.TestCase):
         self.assertIsNone(contact.job_title)
         self.assertIsNone(contact.company)
 
+    def test_contact_mirror(self):
+        """Test that Contact fields are read and written in Python until the contact is saved."""
+        contact = jodie.contact.Contact("Jane", "Doe", "Jane@Acme.com", "+1 (555) 123-4567",
+                                        websites="https://acme.com")
+        contact.add_website("https://linkedin.com/in/jdoe")
+        contact.job_title = "  CEO "
+        self.assertEqual(contact.work_website, "https://acme.com")
+        self.assertEqual(contact.linkedin, "https://linkedin.com/in/jdoe")
+        self.assertEqual(contact.tojson()["phone"], "+15551234567")
+        self.assertEqual(contact.tojson()["job_title"], "CEO")
+        self.assertIn("Websites: Work: https://acme.com, LinkedIn: https://linkedin.com/in/jdoe", str(contact))
+        self.assertNotIn("Contacts", sys.modules)
+
     def test_company_fallback(self):
         """Test company name fallback behavior."""
         # Test case where company name could be confused with other fields
@@ -142,6 +177,902 @@ class TestJodie(unittest.TestCase):
         self.assertEqual(fields["last_name"], "A. Smith")
         self.assertEqual(fields["company"], "Acme Technologies Inc")
 
+    def test_scanner_spans(self):
+        """Test that one scan finds typed spans with their offsets."""
+        text = "Jane Doe | VP Sales, Acme | +1 (555) 555-5555 | jane@acme.com | https://acme.com"
+        spans = jodie.parsers.SCANNER.scan(text)
+
+        self.assertEqual([span.kind for span in spans], ["name", "title", "name", "phone", "email", "url"])
+        for span in spans:
+            self.assertEqual(text[span.start:span.end], span.text)
+        self.assertEqual(jodie.parsers.PhoneParser.parse(text), "+1 (555) 555-5555")
+        self.assertIsNone(jodie.parsers.PhoneParser.parse("Suite 100, 2024"))
+
+    def test_title_dictionary(self):
+        """Test longest-title extraction and loading extra titles from a file."""
+        self.assertEqual(jodie.parsers.TitleParser.extract("Jane Doe, Senior Software Engineer at Acme"),
+                         "Senior Software Engineer")
+        self.assertIsNone(jodie.parsers.TitleParser.parse("Chief Happiness Wrangler"))
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "titles.txt")
+                with open(path, "w") as f:
+                    f.write("# custom titles\nhappiness wrangler\n")
+                jodie.parsers.TitleParser.load_titles(path)
+            self.assertEqual(jodie.parsers.TitleParser.parse("Chief Happiness Wrangler"),
+                             "Chief Happiness Wrangler")
+        finally:
+            # Rebuilt from the defaults on next use
+            jodie.parsers.TitleParser._matcher = None
+
+    def test_name_cache(self):
+        """Test that repeated names are parsed once and give the same split."""
+        jodie.parsers.clear_name_cache()
+        self.assertEqual(jodie.parsers.parse_name("Dr. Jane  Q. Doe"), ("Jane", "Q.", "Doe"))
+        self.assertEqual(jodie.parsers.NameParser.parse("Dr. Jane Q. Doe <jane@acme.com>"), ("Jane", "Q. Doe"))
+        fields = jodie.parsers.contact_fields(jodie.parsers.parse_auto(["Jane Q. Doe <jane@acme.com>"]))
+        self.assertEqual((fields["first_name"], fields["last_name"]), ("Jane", "Doe"))
+
+        info = jodie.parsers.name_cache_info()
+        # contact_fields reuses the name parse_auto parsed instead of looking it up again
+        self.assertEqual((info["misses"], info["hits"], info["hit_rate"]), (2, 1, 1 / 3))
+        fields = jodie.parsers.contact_fields(jodie.parsers.parse_auto(["Prof. Ann B. Lee Jr. <ann@acme.com>"]))
+        self.assertEqual((fields["first_name"], fields["last_name"]), ("Ann", "Lee"))
+        self.assertEqual(jodie.parsers.name_cache_info()["misses"] + jodie.parsers.name_cache_info()["hits"], 4)
+
+    def test_company_index(self):
+        """Test building the domain index and inferring the company from the email domain."""
+        from jodie.parsers import companies
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path, index_path = os.path.join(tmp, "companies.csv"), os.path.join(tmp, "companies.idx")
+            with open(csv_path, "w") as f:
+                f.write("Company,Website\nAcme Ltd,https://www.acme.co.uk/\nInitech,initech.com\n"
+                        "Acme Duplicate,acme.co.uk\nGoogle,gmail.com\n")
+            pairs = companies.read_company_csv(csv_path)
+            self.assertEqual(companies.build_company_index(pairs, index_path, run_size=2), 3)
+            try:
+                index = companies.load_company_index(index_path)
+                self.assertEqual(index.lookup("jane@eng.acme.co.uk"), "Acme Ltd")
+                self.assertIsNone(index.lookup("jane@co.uk"))
+                fields = parse_auto(["Jane Doe", "jane@initech.com", "Some Leftover Text"])
+                self.assertEqual(fields["company"], "Initech")
+                # A webmail address is not a sign of working at the company that runs it
+                fields = parse_auto(["Jane Doe", "jane@gmail.com", "Initrode"])
+                self.assertEqual(fields["company"], "Initrode")
+            finally:
+                index.close()
+                companies._index, companies._index_loaded = None, False
+
+    def test_unreadable_company_index(self):
+        """Test that an empty or corrupt company index is skipped with a warning instead of failing parses."""
+        import io
+        from unittest import mock
+        from jodie.parsers import companies
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for content in (b"", b"not an index at all, just some text"):
+                path = os.path.join(tmp, "companies.idx")
+                with open(path, "wb") as f:
+                    f.write(content)
+                stderr = io.StringIO()
+                try:
+                    with mock.patch.dict(os.environ, {"JODIE_COMPANY_INDEX": path}), \
+                            mock.patch.object(sys, "stderr", stderr):
+                        companies._index, companies._index_loaded = None, False
+                        self.assertEqual(parse_auto(["Jane Doe", "jane@initech.com"])["email"], "jane@initech.com")
+                        parse_auto(["John Doe", "john@initech.com"])
+                finally:
+                    companies._index, companies._index_loaded = None, False
+                self.assertEqual(stderr.getvalue().count("Warning"), 1)
+
+    def test_parse_lines_keeps_order(self):
+        """Test that parsing a file across worker processes keeps the input order."""
+        lines = [f"User{i} Doe <user{i}@acme.com>\n" for i in range(50)]
+        expected = [json.dumps(jodie.parsers.parse_text(line.strip())) for line in lines]
+        self.assertEqual(list(jodie.parsers.parse_lines(lines, jobs=1)), expected)
+        self.assertEqual(list(jodie.parsers.parse_lines(iter(lines), jobs=2, chunk_size=3)), expected)
+
+    def test_pipeline_streams(self):
+        """Test that iter_records yields each record before reading the next line."""
+        import io
+        consumed = []
+
+        def lines():
+            for line in ["Jane Doe <jane@acme.com>\n", "https://github.com/jdoe\n"]:
+                consumed.append(line)
+                yield line
+
+        records = jodie.pipeline.iter_records(lines())
+        self.assertEqual(next(records)["email"], "jane@acme.com")
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(next(records)["websites"], ["https://github.com/jdoe"])
+
+        stream = io.StringIO()
+        self.assertEqual(jodie.pipeline.write_json_array(jodie.pipeline.iter_json(["Jane Doe", "Bob Roe"]), stream), 2)
+        self.assertEqual([record["first_name"] for record in json.loads(stream.getvalue())], ["Jane", "Bob"])
+
+    def test_pipeline_row_streams(self):
+        """Test that CSV and NDJSON records can be read from open streams and lists of lines."""
+        import io
+        csv_stream = io.StringIO('name,email,note\nJane Doe,jane@acme.com,"two\nlines"\n')
+        self.assertEqual(list(jodie.pipeline.iter_records(csv_stream, fmt="csv")), [{
+            "first_name": "Jane", "last_name": "Doe", "email": "jane@acme.com", "note": "two\nlines",
+        }])
+        lines = ['{"first_name": "Bob", "email": "bob@acme.com"}\n', "\n"]
+        self.assertEqual(list(jodie.pipeline.iter_records(lines, fmt="ndjson")),
+                         [{"first_name": "Bob", "email": "bob@acme.com"}])
+        with self.assertRaises(ValueError):
+            list(jodie.io.iter_rows(io.StringIO("")))
+
+    def test_phone_detection(self):
+        """Test that an argument that is only a phone number fills the phone field."""
+        fields = parse_auto(["jane@acme.com", "+1 555 555 5555", "Jane Doe"])
+
+        self.assertEqual(fields["phone"], "+1 555 555 5555")
+        self.assertEqual(fields["first_name"], "Jane")
+        self.assertEqual(fields["last_name"], "Doe")
+
+
+class TestRecords(unittest.TestCase):
+    def test_record_fields(self):
+        """Test that ContactRecord cleans and labels fields like Contact, without PyObjC."""
+        record = jodie.contact.ContactRecord(
+            first_name="", last_name="   ", email=" Test@Example.com", job_title="", company=None)
+        self.assertIsNone(record.first_name)
+        self.assertIsNone(record.last_name)
+        self.assertEqual(record.email, "test@example.com")
+        self.assertIsNone(record.job_title)
+        self.assertRaises(ValueError, record.validate)
+
+        record = jodie.contact.ContactRecord(
+            "Jane", "Doe", "jane@acme.com", company="Acme",
+            websites=["https://Acme.com", "https://linkedin.com/in/jdoe", {"label": "Blog", "url": "https://jane.blog"}])
+        self.assertEqual([site.label for site in record.websites], ["Work", "LinkedIn", "Blog"])
+        self.assertEqual(record.get_website("Work"), "https://acme.com")
+        self.assertNotIn("objc", sys.modules)
+
+    def test_record_round_trip(self):
+        """Test that records survive tojson() and saving to a store."""
+        record = jodie.contact.ContactRecord("Jane", "Doe", "jane@acme.com", websites="https://github.com/jdoe")
+        self.assertEqual(jodie.contact.ContactRecord.from_dict(record.tojson()), record)
+        self.assertFalse(hasattr(record, "__dict__"))
+
+        store = jodie.contact.MemoryStore()
+        record.save(store=store)
+        self.assertEqual(store.get(record.identifier)["websites"], [{"label": "GitHub", "url": "https://github.com/jdoe"}])
+
+
+class TestDuplicates(unittest.TestCase):
+    JANE = {"first_name": "Jane", "last_name": "Doe", "email": "jane@acme.com"}
+
+    def test_skip_and_merge(self):
+        """Test that duplicates by email, phone or name are skipped or merged."""
+        memory = jodie.contact.MemoryStore()
+        (jane,) = memory.save_many([dict(self.JANE, phone="+1 (555) 555-5555")])
+
+        store = jodie.contact.DedupStore(memory, on_duplicate="skip")
+        identifiers = store.save_many([
+            dict(self.JANE, email="JANE@acme.com "),
+            {"first_name": "J", "last_name": "D", "email": "jd@home.com", "phone": "15555555555"},
+            {"first_name": "jane", "last_name": "doe.", "email": "other@acme.com"},
+            {"first_name": "Bob", "last_name": "Roe", "email": "bob@acme.com"},
+            {"first_name": "Bobby", "last_name": "Roe", "email": "bob@acme.com"},
+        ])
+        self.assertEqual(identifiers[:3], [jane] * 3)
+        self.assertEqual(identifiers[3], identifiers[4])
+        self.assertEqual((store.created, store.skipped), (1, 4))
+        self.assertEqual(len(memory.records), 2)
+
+        store = jodie.contact.DedupStore(memory, on_duplicate="merge")
+        store.save_many([dict(self.JANE, job_title="CEO",
+                              websites=[{"label": "Work", "url": "https://acme.com"}])])
+        self.assertEqual(memory.get(jane)["job_title"], "CEO")
+        self.assertEqual(memory.get(jane)["phone"], "+1 (555) 555-5555")
+        self.assertEqual(len(memory.records), 2)
+
+    def test_index_scale(self):
+        """Test duplicate lookups against 100k indexed contacts."""
+        index = jodie.contact.DuplicateIndex.from_records(
+            {"identifier": str(i), "first_name": f"First{i}", "last_name": f"Last{i}",
+             "email": f"person{i}@example.com"} for i in range(100000))
+
+        self.assertEqual(index.find({"email": "Person99999@example.com"}), "99999")
+        self.assertEqual(index.find({"first_name": "first5", "last_name": "LAST5"}), "5")
+        self.assertIsNone(index.find({"email": "nobody@example.com"}))
+
+    def test_fuzzy_clusters(self):
+        """Test that find_duplicates clusters near-duplicates within blocks."""
+        from jodie.contact.fuzzy import soundex
+
+        self.assertEqual([soundex(name) for name in ("Smith", "Smyth", "Ashcraft", "Tymczak")],
+                         ["S530", "S530", "A261", "T522"])
+        records = [
+            {"identifier": "a", "first_name": "Jon", "last_name": "Smith", "email": "jon@acme.com"},
+            {"identifier": "b", "first_name": "Jonathan", "last_name": "Smith",
+             "email": "jonathan.smith@acme.com", "phone": "555-123-4567"},
+            {"identifier": "c", "first_name": "Jane", "last_name": "Smith", "email": "jane@acme.com"},
+            {"identifier": "d", "first_name": "J", "last_name": "Smyth", "email": "js@gmail.com",
+             "phone": "(555) 123 4567"},
+            {"identifier": "e", "first_name": "Bob", "last_name": "Roe", "email": "bob@roe.com"},
+        ]
+        for jobs in (1, 2):
+            result = jodie.contact.find_duplicates(records, jobs=jobs)
+            self.assertEqual(result.clusters, [[0, 1, 3]])
+            self.assertEqual(result.compared, 6)
+
+        (proposal,) = jodie.contact.merge_proposals(records, result)
+        self.assertEqual(proposal["identifiers"], ["a", "b", "d"])
+        self.assertEqual(proposal["merged"]["phone"], "555-123-4567")
+
+
+class TestDomains(unittest.TestCase):
+    def test_suffix_matching(self):
+        """Test that hosts match known domains and their subdomains only."""
+        label = jodie.contact.get_label_for_website
+        self.assertEqual(label("https://m.linkedin.com/in/jane"), "LinkedIn")
+        self.assertEqual(label("https://us02web.zoom.us/j/123"), "Calendar")
+        self.assertEqual(label("https://notlinkedin.com"), jodie.contact.contact.HOMEPAGE_LABEL)
+        self.assertEqual(label("https://www.acme.co.uk/about", "jane@mail.acme.co.uk"), "Work")
+
+        self.assertEqual(jodie.contact.get_label_for_email("jane@mail.acme.co.uk"), "work")
+        self.assertEqual(jodie.contact.get_label_for_email("jane@cs.stanford.edu"), "home")
+        self.assertEqual(jodie.contact.get_label_for_email("jane@gmail.com"), "home")
+
+    def test_label_after_update(self):
+        """Test that email labels follow domains added after a lookup."""
+        domains = jodie.contact.domains.EMAIL_DOMAINS
+        self.assertEqual(jodie.contact.get_label_for_email("x@foo.example"), "work")
+        domains.update({"foo.example": "disposable"})
+        try:
+            self.assertEqual(jodie.contact.get_label_for_email("x@foo.example"), "home")
+        finally:
+            del domains.domains["foo.example"]
+            domains.lookup.cache_clear()
+
+    def test_large_domain_list(self):
+        """Test loading a large external domain list."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "disposable.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(f"throwaway{i}.example" for i in range(100000)))
+            classifier = jodie.contact.DomainClassifier()
+            self.assertEqual(classifier.load(path, "disposable"), 100000)
+
+        self.assertEqual(classifier.lookup("mx.throwaway99999.example"), "disposable")
+        self.assertIsNone(classifier.lookup("throwaway100000.example"))
+
+
+class TestImport(unittest.TestCase):
+    def test_row_to_fields(self):
+        """Test that CRM-style columns map onto Contact keyword arguments."""
+        fields = jodie.io.row_to_fields({
+            "Full Name": "Sarah Smith",
+            "E-mail": "sarah@acme.com",
+            "Organization": "Acme Inc",
+            "Website": "https://acme.com, https://github.com/sarah",
+            "Favorite Color": "blue"
+        })
+
+        self.assertEqual(fields["first_name"], "Sarah")
+        self.assertEqual(fields["last_name"], "Smith")
+        self.assertEqual(fields["email"], "sarah@acme.com")
+        self.assertEqual(fields["company"], "Acme Inc")
+        self.assertEqual(fields["websites"], ["https://acme.com", "https://github.com/sarah"])
+        self.assertNotIn("favorite_color", fields)
+
+    def test_iter_rows(self):
+        """Test streaming rows from CSV and NDJSON files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "leads.csv")
+            with open(csv_path, "w") as f:
+                f.write("first_name,last_name,email\nJohn,Doe,john@acme.com\nJane,Roe,jane@acme.com\n")
+            ndjson_path = os.path.join(tmp, "leads.ndjson")
+            with open(ndjson_path, "w") as f:
+                f.write('{"first_name": "John", "phone": 5555555555}\n\n{"title": "CEO"}\n')
+
+            self.assertEqual([row["email"] for row in jodie.io.iter_rows(csv_path)],
+                             ["john@acme.com", "jane@acme.com"])
+            self.assertEqual(list(jodie.io.iter_rows(ndjson_path)),
+                             [{"first_name": "John", "phone": "5555555555"}, {"job_title": "CEO"}])
+            with self.assertRaises(ValueError):
+                list(jodie.io.iter_rows(os.path.join(tmp, "leads.xlsx")))
+
+    def test_vcard_round_trip(self):
+        """Test that vCards survive export and import, including folded lines, escapes and labels."""
+        record = {
+            "first_name": "Jane", "last_name": "O'Neil; Jr", "email": "jane@acme.com",
+            "phone": "+15551234567", "job_title": "VP, Sales", "company": "Acme Inc",
+            "websites": [{"label": "LinkedIn", "url": "https://linkedin.com/in/jane"}],
+            "note": "Met at the conference\n" + "x" * 100, "created_date": "2024-01-02",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "contacts.vcf")
+            self.assertEqual(jodie.io.write_records([record, record], path, version="4.0"), 2)
+            with open(path, "rb") as f:
+                lines = f.read().split(b"\r\n")
+            self.assertTrue(all(len(line) <= 75 for line in lines))
+            self.assertIn(b"VERSION:4.0", lines)
+
+            rows = list(jodie.io.iter_rows(path))
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(jodie.contact.ContactRecord(**rows[0]).tojson(), record)
+
+            # Contacts.app style: vCard 3.0, folded with a tab, grouped URL label and no N property
+            with open(path, "w", newline="") as f:
+                f.write("BEGIN:VCARD\r\nVERSION:3.0\r\nFN:John Doe\r\nEMAIL;type=INTERNET;type=WORK;type=pref:jo\r\n"
+                        "\thn@acme.com\r\nitem1.URL;type=pref:https://github.com/jdoe\r\n"
+                        "item1.X-ABLabel:GitHub\r\nURL;TYPE=work:https://acme.com\r\nEND:VCARD\r\n")
+            self.assertEqual(list(jodie.io.iter_rows(path)), [{
+                "first_name": "John", "last_name": "Doe", "email": "john@acme.com",
+                "websites": [{"label": "GitHub", "url": "https://github.com/jdoe"},
+                             {"label": "Work", "url": "https://acme.com"}],
+            }])
+
+    def test_export_formats(self):
+        """Test that CSV and NDJSON exports stream across chunks and read back in."""
+        records = [{
+            "identifier": f"id{i}", "first_name": "Jane", "last_name": f"O'Neil {i}", "email": f"jane{i}@acme.com",
+            "phone": None, "job_title": "VP, Sales", "company": "Acme Inc",
+            "websites": [{"label": "LinkedIn", "url": f"https://linkedin.com/in/jane{i}"}] if i % 2 else None,
+            "note": 'Said "hi"\nat the door' if i % 3 else None, "created_date": "2024-01-02",
+        } for i in range(jodie.io.writers.CHUNK_SIZE + 5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "contacts.ndjson")
+            self.assertEqual(jodie.io.write_records(iter(records), path, version="4.0"), len(records))
+            with open(path) as f:
+                self.assertEqual([json.loads(line) for line in f], records)
+
+            path = os.path.join(tmp, "contacts.csv")
+            self.assertEqual(jodie.io.write_records(iter(records), path), len(records))
+            rows = list(jodie.io.iter_rows(path))
+            self.assertEqual(len(rows), len(records))
+            self.assertEqual(rows[1]["note"], records[1]["note"])
+            self.assertEqual(rows[1]["websites"], ["https://linkedin.com/in/jane1"])
+            self.assertEqual(rows[-1]["last_name"], records[-1]["last_name"])
+
+            if importlib.util.find_spec("pyarrow") is None:
+                with self.assertRaises(ValueError):
+                    jodie.io.write_records(records, os.path.join(tmp, "contacts.parquet"))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_export(self):
+        """Test that Parquet exports keep every column, websites as (label, url) structs, across row groups."""
+        import pyarrow.parquet
+        from unittest import mock
+
+        records = [{
+            "identifier": f"id{i}", "first_name": "Jane", "last_name": f"Doe {i}", "email": f"jane{i}@acme.com",
+            "phone": "+15551234567" if i % 2 else None, "job_title": "CEO", "company": "Acme Inc",
+            "websites": [{"label": "LinkedIn", "url": f"https://linkedin.com/in/jane{i}"},
+                         {"label": None, "url": "https://acme.com"}] if i % 3 else None,
+            "note": f"Note {i}" if i % 2 else None, "created_date": "2024-01-02",
+        } for i in range(7)]
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(jodie.io.writers, "ROW_GROUP_SIZE", 3):
+            path = os.path.join(tmp, "contacts.parquet")
+            self.assertEqual(jodie.io.write_records(iter(records), path), len(records))
+            parquet = pyarrow.parquet.ParquetFile(path)
+            self.assertEqual(parquet.metadata.num_row_groups, 3)
+            self.assertEqual(parquet.schema_arrow.names, list(jodie.io.writers.EXPORT_COLUMNS))
+            self.assertEqual(parquet.read().to_pylist(), records)
+
+
+class TestHarvest(unittest.TestCase):
+    MESSAGES = [
+        ("Jane Doe <jane@acme.com>", None,
+         "Sounds good, see you then.\n\nBest,\nJane Doe\nVP Sales | Acme Inc\n+1 (555) 123-4567\nhttps://acme.com\n\n"
+         "On Mon, Jan 1, 2024 at 9:00 AM Bob <bob@example.com> wrote:\n> Are we still on?\n> Bob\n"),
+        ("Acme <no-reply@acme.com>", "John Smith <john@example.com>", "Your order shipped.\n"),
+        ("notifications@example.com", None, "Weekly digest\n"),
+        ("Jane Doe <jane@acme.com>", None, "Thanks!\n-- \nJane\nLinkedIn: https://linkedin.com/in/janedoe\n"),
+    ]
+
+    def test_find_signature(self):
+        """Test that signatures are found after closings and "-- " but not in quoted text."""
+        self.assertEqual(jodie.harvest.find_signature(self.MESSAGES[0][2]),
+                         ["Jane Doe", "VP Sales | Acme Inc", "+1 (555) 123-4567", "https://acme.com"])
+        self.assertEqual(jodie.harvest.find_signature(self.MESSAGES[3][2]),
+                         ["Jane", "LinkedIn: https://linkedin.com/in/janedoe"])
+        self.assertEqual(jodie.harvest.find_signature("Let's talk tomorrow.\n\nSent from my iPhone\n"), [])
+
+    def test_harvest_archives(self):
+        """Test harvesting the same messages from an mbox file and a Maildir."""
+        import mailbox
+        with tempfile.TemporaryDirectory() as tmp:
+            write_archive(mailbox.mbox(os.path.join(tmp, "archive.mbox")), self.MESSAGES)
+            write_archive(mailbox.Maildir(os.path.join(tmp, "Maildir")), self.MESSAGES)
+
+            for path in ("archive.mbox", "Maildir"):
+                results = list(jodie.harvest.harvest(os.path.join(tmp, path), jobs=1))
+                self.assertEqual(len(results), 4)
+                self.assertIsNone(results[2])
+                people = jodie.harvest.collapse(results)
+                self.assertEqual([person["email"] for person in people], ["jane@acme.com", "john@example.com"])
+                jane = people[0]
+                self.assertEqual((jane["first_name"], jane["last_name"]), ("Jane", "Doe"))
+                self.assertEqual((jane["job_title"], jane["company"], jane["phone"]),
+                                 ("VP Sales", "Acme Inc", "+1 (555) 123-4567"))
+                self.assertEqual([site["label"] for site in jane["websites"]], ["Work", "LinkedIn"])
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_checkpoint(self):
+        """Test that a checkpoint skips messages and rows processed by earlier runs."""
+        import mailbox
+        with tempfile.TemporaryDirectory() as tmp:
+            state = os.path.join(tmp, "state")
+            checkpoint = jodie.io.Checkpoint(state)
+            self.assertTrue(all(checkpoint.add(f"key-{i}") for i in range(1000)))
+            self.assertFalse(checkpoint.add("key-1"))
+            checkpoint.save()
+            checkpoint.close()
+
+            checkpoint = jodie.io.Checkpoint(state)
+            self.assertEqual(len(checkpoint), 1000)
+            self.assertIn("key-999", checkpoint)
+            self.assertEqual(sum(f"other-{i}" in checkpoint for i in range(1000)), 0)
+
+            path = os.path.join(tmp, "archive.mbox")
+            write_archive(mailbox.mbox(path), TestHarvest.MESSAGES)
+            self.assertEqual(len(list(jodie.harvest.iter_new_messages(path, checkpoint))), 4)
+            checkpoint.save()
+            self.assertEqual(list(jodie.harvest.iter_new_messages(path, checkpoint)), [])
+
+            write_archive(mailbox.mbox(path), [("Bob Lee <bob@example.com>", None, "Hi!\n")])
+            self.assertEqual(checkpoint.resume_offset(path), checkpoint.file_state(path).offset)
+            self.assertEqual(len(list(jodie.harvest.iter_new_messages(path, checkpoint))), 1)
+
+            csv_path = os.path.join(tmp, "leads.csv")
+            with open(csv_path, "w") as f:
+                f.write("first_name,last_name,email\nJohn,Doe,john@acme.com\n")
+            self.assertEqual(len(list(jodie.io.iter_new_rows(csv_path, None, checkpoint))), 1)
+            with open(csv_path, "a") as f:
+                f.write("Jane,Roe,jane@acme.com\n")
+            self.assertEqual([row["email"] for row in jodie.io.iter_new_rows(csv_path, None, checkpoint)],
+                             ["jane@acme.com"])
+            checkpoint.close()
+
+
+class TestStores(unittest.TestCase):
+    RECORD = {
+        "first_name": "Sarah",
+        "last_name": "Smith",
+        "email": "sarah@acme.com",
+        "websites": [{"label": "LinkedIn", "url": "https://linkedin.com/in/sarah"}],
+        "created_date": "2024-01-01"
+    }
+
+    def check_store(self, store):
+        identifiers = store.save_many([self.RECORD, dict(self.RECORD, first_name="Jane")])
+        self.assertEqual(len(identifiers), 2)
+
+        record = store.get(identifiers[0])
+        self.assertEqual(record["first_name"], "Sarah")
+        self.assertEqual(record["websites"], self.RECORD["websites"])
+        self.assertEqual([r["first_name"] for r in store.iter_all()], ["Sarah", "Jane"])
+
+        self.assertTrue(store.delete(identifiers[0]))
+        self.assertFalse(store.delete(identifiers[0]))
+        self.assertIsNone(store.get(identifiers[0]))
+
+        with self.assertRaises(ValueError):
+            store.save_many([{"first_name": "No", "last_name": "Email"}])
+
+    def test_memory_store(self):
+        self.check_store(jodie.contact.MemoryStore())
+
+    def test_sqlite_store(self):
+        store = jodie.contact.get_store("sqlite::memory:")
+        self.assertIsInstance(store, jodie.contact.SQLiteStore)
+        self.check_store(store)
+        self.assertEqual(store.save_all([self.RECORD] * 5, batch_size=2), 5)
+        store.close()
+
+    def test_contacts_store_unavailable(self):
+        """Test that the Contacts.app store fails with a ValueError where PyObjC is missing."""
+        try:
+            import Contacts  # noqa: F401
+        except ImportError:
+            with self.assertRaisesRegex(ValueError, "--store sqlite"):
+                jodie.contact.get_store("contacts")
+        else:
+            self.skipTest("PyObjC is installed")
+
+    def test_contacts_store_streams(self):
+        """Test that the Contacts.app store fetches a bounded number of contacts ahead of its reader."""
+        import threading
+        import types
+        from unittest import mock
+        produced = []
+        finished = threading.Event()
+
+        class Request:
+            @classmethod
+            def alloc(cls):
+                return cls()
+
+            def initWithKeysToFetch_(self, keys):
+                return self
+
+        class Book:
+            def enumerateContactsWithFetchRequest_error_usingBlock_(self, request, error, block):
+                for i in range(5000):
+                    produced.append(i)
+                    # PyObjC passes the BOOL *stop output argument back as the block's return value
+                    if block(i, None):
+                        break
+                finished.set()
+                return True, None
+
+        store = object.__new__(jodie.contact.ContactsAppStore)
+        store.store = Book()
+        contacts = types.SimpleNamespace(CNContactFetchRequest=Request)
+        with mock.patch.dict(sys.modules, {"Contacts": contacts}), \
+                mock.patch.object(jodie.contact.ContactsAppStore, "_to_record", staticmethod(lambda i: {"n": i})):
+            records = store.iter_all()
+            self.assertEqual(next(records), {"n": 0})
+            time.sleep(0.2)
+            self.assertLessEqual(len(produced), store.FETCH_QUEUE_SIZE + 2)
+            self.assertEqual(sum(1 for _ in records), 4999)
+            finished.clear()
+            del produced[:]
+            records = store.iter_all()
+            next(records)
+            records.close()
+            self.assertTrue(finished.wait(5))
+            self.assertLess(len(produced), 5000)
+
+
+class TestSaveQueue(unittest.TestCase):
+    def test_batches_retries_and_failures(self):
+        """Test that saves are batched, locked databases retried and bad contacts failed on their own."""
+        import sqlite3
+        from jodie.contact import MemoryStore, SaveQueue
+
+        class FlakyStore(MemoryStore):
+            def __init__(self):
+                super().__init__()
+                self.failures = 2
+
+            def save_many(self, contacts):
+                if self.failures:
+                    self.failures -= 1
+                    raise sqlite3.OperationalError("database is locked")
+                if any(contact["email"] == "bad@acme.com" for contact in contacts):
+                    raise RuntimeError("rejected")
+                if any(contact["email"] == "gone@acme.com" for contact in contacts):
+                    raise sqlite3.OperationalError("no such table: contacts")
+                return super().save_many(contacts)
+
+        def record(i, email=None):
+            return {"first_name": "Jane", "last_name": f"Doe{i}", "email": email or f"jane{i}@acme.com"}
+
+        async def run():
+            queue = SaveQueue(FlakyStore, batch_size=10, linger=0.01, max_pending=30, backoff=0.001)
+            async with queue:
+                futures = [await queue.put(record(i)) for i in range(24)]
+                futures.append(await queue.put(record(24, "bad@acme.com")))
+                futures.append(await queue.put({"first_name": "No", "email": "x@acme.com"}))
+                futures.append(await queue.put(record(26, "gone@acme.com")))
+                identifier = await queue.save(record(25))
+            full = await SaveQueue("memory", max_pending=1).start()
+            full.put_nowait(record(0))
+            with self.assertRaises(asyncio.QueueFull):
+                full.put_nowait(record(1))
+            await full.close()
+            return queue, futures, identifier
+
+        queue, futures, identifier = asyncio.run(run())
+        self.assertTrue(identifier)
+        self.assertTrue(all(future.result() for future in futures[:24]))
+        self.assertIsInstance(futures[24].exception(), RuntimeError)
+        self.assertIsInstance(futures[25].exception(), ValueError)
+        self.assertIsInstance(futures[26].exception(), sqlite3.OperationalError)
+        self.assertEqual((queue.saved, queue.failed, queue.retried), (25, 3, 2))
+        # The producer fills the queue before the worker runs: two full batches, then the last
+        # batch of seven is split on the bad and gone contacts, and its five good ones commit one by one
+        self.assertEqual(queue.commits, 7)
+
+
+class TestServer(unittest.TestCase):
+    def test_parse_over_socket(self):
+        """Test newline-delimited JSON requests against a running ContactServer."""
+        from jodie.server import ContactServer
+
+        async def run(path):
+            server = ContactServer(path, store="memory")
+            listener = await server.start()
+            reader, writer = await asyncio.open_unix_connection(path)
+            responses = []
+            for request in ({"command": "ping"},
+                            {"command": "parse", "text": "Sarah Smith | CEO | sarah@acme.com"},
+                            {"command": "bogus"}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            listener.close()
+            await server.stop()
+            return responses
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ping, parsed, bogus = asyncio.run(run(os.path.join(tmp, "jodie.sock")))
+
+        self.assertTrue(ping["ok"])
+        self.assertEqual(parsed["fields"]["email"], "sarah@acme.com")
+        self.assertEqual(parsed["fields"]["job_title"], "CEO")
+        self.assertEqual(parsed["fields"]["first_name"], "Sarah")
+        self.assertFalse(bogus["ok"])
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_seeded_corpus(self):
+        """Test that the benchmark corpus is the same for the same seed."""
+        from benchmarks.corpus import corpus
+
+        self.assertEqual(corpus("signature", 20, seed=1), corpus("signature", 20, seed=1))
+        self.assertNotEqual(corpus("mailbox", 20, seed=1), corpus("mailbox", 20, seed=2))
+        for mailbox in corpus("mailbox", 50):
+            self.assertIsNotNone(jodie.parsers.EmailParser.parse(mailbox))
+
+    def test_regression_check(self):
+        """Test that slower or larger results are reported against a baseline."""
+        from benchmarks.results import compare
+
+        def results(ops, peak):
+            return {"scale": "1k", "seed": 42,
+                    "benchmarks": {"parse": {"ops_per_sec": ops, "peak_kib": peak}, "skip": {"skipped": "no"}}}
+
+        self.assertEqual(compare(results(1000, 500), results(950, 540)), [])
+        self.assertEqual(len(compare(results(1000, 500), results(800, 500))), 1)
+        self.assertEqual(len(compare(results(1000, 500), results(1000, 800))), 1)
+
+    def test_suite_runs(self):
+        """Test that a benchmark runs end to end on a tiny corpus."""
+        from benchmarks.corpus import corpus
+        from benchmarks.suite import BENCHMARKS, clear_caches, run
+
+        for name in ("parse_auto/mailbox", "get_label_for_website/urls"):
+            result = run(name, corpus(BENCHMARKS[name][0], 20), repeat=2, memory_sample=5)
+            self.assertEqual(result["items"], 20)
+            self.assertGreater(result["ops_per_sec"], 0)
+
+        # Every timed pass starts with an empty name cache
+        clear_caches()
+        self.assertEqual(jodie.parsers.name_cache_info()["size"], 0)
+
+
+class TestTrace(unittest.TestCase):
+    def tearDown(self):
+        jodie.trace.disable()
+
+    def test_spans(self):
+        """Test that parser and save spans are recorded while tracing, and nothing after."""
+        tracer = jodie.trace.enable(timeline=True)
+        jodie.parsers.parse_text("Jane Doe | VP Sales | jane@acme.com | https://acme.com")
+        jodie.contact.ContactRecord(first_name="Jane", last_name="Doe", email="jane@acme.com").save(
+            jodie.contact.MemoryStore())
+        self.assertIs(jodie.trace.disable(), tracer)
+        jodie.parsers.parse_text("John Roe | CTO | john@acme.com")
+
+        stats = {row["name"]: row for row in tracer.stats()}
+        self.assertEqual(stats["parse_auto"]["count"], 1)
+        for name in ("NameParser.parse", "TitleParser.parse", "ContactRecord.save", "MemoryStore.save_many"):
+            self.assertIn(name, stats)
+        self.assertLessEqual(stats["parse_auto"]["p50_us"], stats["parse_auto"]["p99_us"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracer.write_chrome_trace(path)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), sum(row["count"] for row in stats.values()))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+
+class TestMetrics(unittest.TestCase):
+    def test_threads_and_text_format(self):
+        """Test that counts from many threads add up and histograms export cumulative buckets."""
+        import io
+        import threading
+
+        registry = jodie.metrics.Registry()
+        saves = registry.counter("test_saves_total", "Saves.", ["store"])
+        latency = registry.histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+        def work():
+            for _ in range(10000):
+                saves.inc("memory")
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+        self.assertEqual(saves.collect(), {("memory",): 40000})
+
+        text = io.StringIO()
+        registry.write_text(text)
+        lines = text.getvalue().splitlines()
+        self.assertIn('test_saves_total{store="memory"} 40000', lines)
+        self.assertIn('test_latency_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('test_latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("test_latency_seconds_count 4", lines)
+
+        drained = registry.drain()
+        self.assertEqual(saves.collect(), {})
+        registry.merge(drained)
+        registry.merge(drained)
+        self.assertEqual(saves.collect(), {("memory",): 80000})
+
+    def test_worker_processes(self):
+        """Test that metrics counted in map_chunks workers reach the parent's registry."""
+        parsed = jodie.metrics.REGISTRY.metrics["jodie_records_parsed_total"]
+        before = parsed.collect().get((), 0)
+        lines = [f"Person {i} | CEO | person{i}@acme.com" for i in range(40)]
+        list(jodie.parsers.parse_lines(lines, jobs=2, chunk_size=10))
+        self.assertEqual(parsed.collect()[()], before + 40)
+
+
+class TestFind(unittest.TestCase):
+    RECORDS = [
+        {"first_name": "Jane", "last_name": "Doe", "email": "jane.doe@acme.com", "company": "Acme Corp"},
+        {"first_name": "Zoë", "last_name": "O'Neil", "email": "zoe@oneil.ie"},
+        {"first_name": "Janet", "last_name": "Roe", "email": "janet@example.org"},
+    ]
+
+    def names(self, index, query):
+        return [doc["first_name"] for doc in index.find(query)]
+
+    def test_find(self):
+        """Test prefix queries, ranking and field filters."""
+        index = jodie.search.ContactIndex()
+        index.update(dict(record, identifier=str(i)) for i, record in enumerate(self.RECORDS))
+        self.assertEqual(self.names(index, "jan"), ["Jane", "Janet"])
+        self.assertEqual(self.names(index, "janet"), ["Janet"])
+        self.assertEqual(self.names(index, "doe jane"), ["Jane"])
+        self.assertEqual(self.names(index, "zoe o'neil"), ["Zoë"])
+        self.assertEqual(self.names(index, "company:acme"), ["Jane"])
+        self.assertEqual(self.names(index, "jane@acme"), ["Jane"])
+        self.assertEqual(self.names(index, "domain:example.org"), ["Janet"])
+        self.assertEqual(self.names(index, "jan xyz"), [])
+        # Whole words rank above prefixes: "jane" is Jane's first name but only starts Janet's
+        self.assertEqual(self.names(index, "jane"), ["Jane", "Janet"])
+        index.remove(["0"])
+        self.assertEqual(self.names(index, "jan"), ["Janet"])
+
+    def test_store_index(self):
+        """Test that the persisted index follows saves and deletes made through the store."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = jodie.contact.get_store(f"sqlite:{os.path.join(directory, 'contacts.db')}")
+            identifiers = store.save_many(self.RECORDS[:2])
+            self.assertFalse(os.path.exists(store.index_path))
+            with jodie.search.open_store_index(store) as index:
+                self.assertEqual(self.names(index, "jan"), ["Jane"])
+
+            store.save_many(self.RECORDS[2:])
+            store.delete(identifiers[0])
+            self.assertTrue(os.path.exists(f"{store.index_path}.journal"))
+            with jodie.search.open_store_index(store) as index:
+                self.assertEqual(self.names(index, "jan"), ["Janet"])
+                self.assertEqual(len(index), 2)
+                index.compact()
+                self.assertEqual(self.names(index, "j"), ["Janet"])
+
+            with jodie.search.open_store_index(store, rebuild=True) as index:
+                self.assertEqual(sorted(doc["first_name"] for doc in index.iter_docs()), ["Janet", "Zoë"])
+            self.assertEqual(os.path.getsize(f"{store.index_path}.journal"), 0)
+            store.close()
+
+    def test_save_during_first_build(self):
+        """Test that a save made while an index is first built, before its file exists, is kept."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = jodie.contact.get_store(f"sqlite:{os.path.join(directory, 'contacts.db')}")
+            store.save_many(self.RECORDS[:1])
+
+            def records():
+                for record in list(store.iter_all()):
+                    self.assertFalse(os.path.exists(store.index_path))
+                    store.save_many(self.RECORDS[2:])
+                    yield record
+
+            with jodie.search.ContactIndex.build(records(), store.index_path) as index:
+                self.assertEqual(self.names(index, "jan"), ["Jane", "Janet"])
+            store.close()
+
+
+class TestSearch(unittest.TestCase):
+    RECORDS = [
+        {"identifier": "a", "first_name": "Jane", "note": "Met at PyCon Berlin, talked about machine learning"},
+        {"identifier": "b", "first_name": "Bob", "note": "Runs a machine shop, learning Python", "job_title": "Owner"},
+        {"identifier": "c", "first_name": "Zoë", "note": "Berlin meetup, via O'Neil"},
+    ]
+
+    def identifiers(self, index, query):
+        return [doc["identifier"] for doc in index.search(query)]
+
+    def test_pack_ints(self):
+        """Test that integer blocks round-trip, compressed or not."""
+        from jodie.search.fulltext import pack_ints, unpack_ints
+        for values in ([], [7], list(range(0, 300000, 3)), [1, 70000, 70001]):
+            data = pack_ints(values, delta=True)
+            self.assertEqual(list(unpack_ints(data, 0, delta=True)[0]), values)
+            self.assertEqual(unpack_ints(data, 0)[1], len(data))
+        self.assertLess(len(pack_ints(list(range(0, 300000, 3)), delta=True)), 1000)
+
+    def test_queries(self):
+        """Test AND, OR and phrase queries and BM25 ranking."""
+        index = jodie.search.TextIndex()
+        index.update(self.RECORDS)
+        self.assertEqual(sorted(self.identifiers(index, "machine learning")), ["a", "b"])
+        self.assertEqual(self.identifiers(index, '"machine learning"'), ["a"])
+        self.assertEqual(self.identifiers(index, "pycon AND berlin"), ["a"])
+        self.assertEqual(sorted(self.identifiers(index, "pycon OR meetup")), ["a", "c"])
+        self.assertEqual(self.identifiers(index, "o'neil"), ["c"])
+        self.assertEqual(self.identifiers(index, "owner"), ["b"])
+        self.assertEqual(self.identifiers(index, "nowhere"), [])
+        # The shorter note, where "berlin" is more of the text, ranks first
+        self.assertEqual(self.identifiers(index, "berlin"), ["c", "a"])
+
+    def test_store_index(self):
+        """Test that the persisted index follows saves and deletes made through the store."""
+        records = [dict(record, last_name="Doe", email=f"{record['identifier']}@example.com")
+                   for record in self.RECORDS]
+        with tempfile.TemporaryDirectory() as directory:
+            store = jodie.contact.get_store(f"sqlite:{os.path.join(directory, 'contacts.db')}")
+            identifiers = store.save_many(records[:2])
+            with jodie.search.open_store_text_index(store) as index:
+                self.assertEqual(len(index.search("berlin")), 1)
+
+            store.save_many(records[2:])
+            store.delete(identifiers[0])
+            with jodie.search.open_store_text_index(store) as index:
+                self.assertEqual([doc["first_name"] for doc in index.search("berlin")], ["Zoë"])
+                index.compact()
+                self.assertEqual(sorted(doc["first_name"] for doc in index.search("machine OR meetup")), ["Bob", "Zoë"])
+            store.close()
+
+
+class TestImportTime(unittest.TestCase):
+    # Budget for importing the CLI module, measured with `python -X importtime`
+    BUDGET_MS = 50
+    # Heavy modules the CLI must not load until a command needs them
+    DEFERRED_MODULES = ("objc", "Contacts", "Foundation", "nameparser", "sqlite3")
+
+    def import_times(self, module):
+        """Return {module name: cumulative import time in microseconds} for `import module`."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+        return times
+
+    def test_cli_import_time(self):
+        """Test that the CLI imports within budget and without loading heavy dependencies."""
+        runs = [self.import_times("jodie.cli.__main__") for _ in range(3)]
+
+        for module in self.DEFERRED_MODULES:
+            self.assertNotIn(module, runs[0], f"{module} was imported eagerly")
+
+        best_ms = min(times["jodie.cli.__main__"] for times in runs) / 1000
+        self.assertLess(best_ms, self.BUDGET_MS,
+                        f"Importing the CLI took {best_ms:.1f}ms, budget is {self.BUDGET_MS}ms")
+
+    def test_contact_import_defers_queue(self):
+        """Test that importing jodie.contact leaves SaveQueue and asyncio until they are used."""
+        self.assertNotIn("asyncio", self.import_times("jodie.contact"))
+        from jodie.contact import SaveQueue
+        self.assertEqual(SaveQueue.__module__, "jodie.contact.queue")
+
 
 if __name__ == "__main__":
     unittest.main()